@@ -0,0 +1,355 @@
+"""
+Bytecode for ChefScript and the compiler that produces it from the AST
+returned by Lowering.lower().
+
+A Code object is a flat list of (opcode, argument) pairs that
+VirtualMachine.execute() runs on a value stack.  Conditions, arithmetic,
+assignments, serve and control flow (taste/elif/mix, flip, for, simmer,
+keepmix) become individual instructions and jumps.  Statements that do the
+same work wherever they appear (declarations, make) are a single instruction
+carrying the node.  A call is a single instruction too; each of its arguments
+is a Code object of its own, which the machine runs before the call's body.
+The index of a recipe element and the operand of len() are compiled inline,
+ahead of the instruction that uses their value.
+
+Every block and expression keeps the evaluation order of the tree walker, so
+compiled programs give the same output, errors and exceptions.
+"""
+import Lowering
+from Operators import operator_site
+
+# Values
+CONST = 0           # push argument
+LOAD_VAR = 1        # push the value of the Var node in argument
+BINARY = 2          # pop right, left; push argument(left, right), an Operators.operator_site()
+COMPARE = 3         # pop right, left; push argument(left, right)
+OR = 4              # jump to argument, leaving the value on the stack, when it is truthy; else pop it
+AND = 5             # jump to argument, leaving the value on the stack, when it is falsy; else pop it
+CHAIN = 6           # expression chain step: (operator site, end)
+INDEX = 7           # pop an index; push that element of the recipe of the Index node in argument
+LEN = 8             # pop a value and push its length, or report the error of the Len node in argument
+CALL = 9            # push the return value of the Call node in argument
+RAISE = 10          # raise the Fail node in argument
+
+# Jumps
+JUMP = 11
+JUMP_IF_FALSE = 12  # pop a value and jump when it is falsy
+JUMP_IF_TRUE = 13   # pop a value and jump when it is truthy
+JUMP_IF_NONE = 14   # jump, leaving the value on the stack, when it is None
+
+# Statements
+LOAD_TARGET = 15    # push the symbol the Assign node in argument writes to
+STORE = 16          # pop value, symbol; apply the (operator, line) assignment
+INC_DEC = 17
+ENTER_BLOCK = 18    # clear the (start, stop) frame slots of a loop or taste block
+FOR_INIT = 19
+FOR_STEP = 20       # (For node, loop start, loop exit)
+FLIP_CASE = 21      # (ref, is_pinch, literal, next case)
+DECLARE = 22
+DECLARE_ARRAY = 23
+SERVE = 24          # pop the text of a serve statement and write it when it is not empty
+MAKE = 25
+CALL_STATEMENT = 26
+TICK = 27           # count a step of the execution budget; argument is the line
+
+# Serve parts: the text so far stays on the stack below the part being worked out
+DEFINED = 28        # (node, target): when node's name is undefined, report it, push None and jump
+SERVE_PART = 29     # push the text of a serve part that has no expression to evaluate
+SERVE_INDEX = 30    # pop an index; push the text of that element of the ServeIndex's recipe, or None
+SERVE_CALL = 31     # push the return value of a call inside serve
+SERVE_VALUE = 32    # replace a value by its text in a serve; values that are false give ""
+SERVE_JOIN = 33     # pop a part's text and add it to the text so far; None drops both and jumps
+
+STORE_ELEMENT = 34  # pop value, index; apply the ElementAssign node in argument
+
+OPNAMES = {value: name for name, value in list(globals().items())
+           if name.isupper() and isinstance(value, int)}
+
+
+class Code:
+    __slots__ = ('instructions',)
+
+    def __init__(self, instructions):
+        self.instructions = instructions
+
+    def __repr__(self):
+        return f"Code({len(self.instructions)} instructions)"
+
+
+def disassemble(code):
+    """Returns a readable listing of code, one instruction per line."""
+    lines = []
+    for position, (op, argument) in enumerate(code.instructions):
+        if isinstance(argument, (int, float, str, tuple)) or argument is None:
+            text = repr(argument)
+        else:
+            text = type(argument).__name__
+        lines.append(f"{position:4} {OPNAMES[op]:<15} {text}")
+    return "\n".join(lines)
+
+
+class Compiler:
+    def __init__(self, apply_operator):
+        # The generic path of the operator sites, SemanticAnalyzer._apply_operator
+        self.apply_operator = apply_operator
+        self.statements = {
+            Lowering.VarDecl: self.compile_declaration,
+            Lowering.ArrayDecl: self.compile_declaration,
+            Lowering.Assign: self.compile_assign,
+            Lowering.ElementAssign: self.compile_element_assign,
+            Lowering.IncDec: self.compile_inc_dec,
+            Lowering.CallStatement: self.compile_call_statement,
+            Lowering.Serve: self.compile_serve,
+            Lowering.Make: self.compile_make,
+            Lowering.If: self.compile_if,
+            Lowering.Flip: self.compile_flip,
+            Lowering.For: self.compile_for,
+            Lowering.While: self.compile_while,
+            Lowering.DoWhile: self.compile_do_while,
+        }
+        self.expressions = {
+            Lowering.Const: self.compile_const,
+            Lowering.Var: self.compile_var,
+            Lowering.Index: self.compile_index,
+            Lowering.Call: self.compile_call,
+            Lowering.Len: self.compile_len,
+            Lowering.Arith: self.compile_arith,
+            Lowering.ExprChain: self.compile_expr_chain,
+            Lowering.Or: self.compile_or,
+            Lowering.And: self.compile_and,
+            Lowering.Compare: self.compile_compare,
+            Lowering.Fail: self.compile_fail,
+        }
+
+    def program(self, program):
+        """Returns a Program whose blocks and function parts are Code objects."""
+        functions = []
+        for function in program.functions:
+            local_decls, body = function.parts[:2]
+            parts = [self.block(local_decls), self.block(body)]
+            parts += [self.expression(return_expr) for return_expr in function.parts[2:]]
+            functions.append(Lowering.FunctionDef(function.name, function.return_type, function.params, parts,
+                                             function.slot, function.size, function.param_slots, function.pure))
+        return Lowering.Program(self.block(program.global_decls), functions, self.block(program.local_decls),
+                           self.block(program.body), program.exit_code, program.exit_line,
+                           program.size, program.dish_size)
+
+    def block(self, statements):
+        out = []
+        self.emit_block(out, statements)
+        return Code(out)
+
+    def expression(self, node):
+        out = []
+        self.emit_expression(out, node)
+        return Code(out)
+
+    def arguments(self, args):
+        return [self.expression(arg) for arg in args]
+
+    def emit_block(self, out, statements):
+        handlers = self.statements
+        for statement in statements:
+            handlers[statement.__class__](out, statement)
+
+    def emit_expression(self, out, node):
+        self.expressions[node.__class__](out, node)
+
+    #-----------------------------------------------------------------
+    # Statements
+    #-----------------------------------------------------------------
+    def compile_declaration(self, out, node):
+        out.append((DECLARE if isinstance(node, Lowering.VarDecl) else DECLARE_ARRAY, node))
+
+    def compile_assign(self, out, node):
+        out.append((LOAD_TARGET, node))
+        self.emit_expression(out, node.value)
+        out.append((STORE, (node.op, node.line)))
+
+    def compile_element_assign(self, out, node):
+        self.emit_expression(out, node.index)
+        self.emit_expression(out, node.value)
+        out.append((STORE_ELEMENT, node))
+
+    def compile_inc_dec(self, out, node):
+        out.append((INC_DEC, node))
+
+    def compile_call_statement(self, out, node):
+        out.append((CALL_STATEMENT, Lowering.CallStatement(node.name, self.arguments(node.args), node.line, node.ref)))
+
+    def compile_serve(self, out, node):
+        # A part with no text ends the serve without writing anything
+        out.append((CONST, ""))
+        joins = []
+        for part in node.parts:
+            if isinstance(part, Lowering.ServeIndex):
+                test = len(out)
+                out.append(None)
+                self.emit_expression(out, part.index)
+                out.append((SERVE_INDEX, part))
+                out[test] = (DEFINED, (part, len(out)))
+            elif isinstance(part, Lowering.ServeCall):
+                test = len(out)
+                out.append(None)
+                out.append((SERVE_CALL, Lowering.Call(part.name, self.arguments(part.args), part.args_line, part.ref)))
+                out.append((SERVE_VALUE, None))
+                out[test] = (DEFINED, (part, len(out)))
+            elif isinstance(part, Lowering.ServeLen) and not part.error:
+                self.emit_expression(out, part.argument)
+                out.append((LEN, part))
+                out.append((SERVE_VALUE, None))
+            else:
+                out.append((SERVE_PART, part))
+            joins.append(len(out))
+            out.append(None)
+        out.append((SERVE, None))
+        for position in joins:
+            out[position] = (SERVE_JOIN, len(out))
+
+    def compile_make(self, out, node):
+        out.append((MAKE, node))
+
+    def emit_scoped(self, out, body, slots):
+        if slots is not None:
+            out.append((ENTER_BLOCK, slots))
+        self.emit_block(out, body)
+
+    def compile_if(self, out, node):
+        exits = []
+        for position, (condition, body) in enumerate(node.branches):
+            self.emit_expression(out, condition)
+            test = len(out)
+            out.append(None)
+            self.emit_scoped(out, body, node.scopes[position])
+            exits.append(len(out))
+            out.append(None)
+            out[test] = (JUMP_IF_FALSE, len(out))
+        if node.orelse is not None:
+            self.emit_scoped(out, node.orelse, node.scopes[-1])
+        for position in exits:
+            out[position] = (JUMP, len(out))
+
+    def compile_flip(self, out, node):
+        exits = []
+        for is_pinch, literal, body in node.cases:
+            test = len(out)
+            out.append(None)
+            self.emit_block(out, body)
+            exits.append(len(out))
+            out.append(None)
+            out[test] = (FLIP_CASE, (node.ref, is_pinch, literal, len(out)))
+        if node.default is not None:
+            self.emit_block(out, node.default)
+        for position in exits:
+            out[position] = (JUMP, len(out))
+
+    def compile_for(self, out, node):
+        self.emit_scoped(out, (), node.scope)
+        out.append((FOR_INIT, node))
+        start = len(out)
+        self.emit_expression(out, node.condition)
+        test = len(out)
+        out.append(None)
+        self.emit_block(out, node.body)
+        out.append((TICK, node.line))
+        out.append((FOR_STEP, (node, start, len(out) + 1)))
+        out[test] = (JUMP_IF_FALSE, len(out))
+
+    def compile_while(self, out, node):
+        self.emit_scoped(out, (), node.scope)
+        start = len(out)
+        self.emit_expression(out, node.condition)
+        test = len(out)
+        out.append(None)
+        self.emit_block(out, node.body)
+        out.append((TICK, node.line))
+        out.append((JUMP, start))
+        out[test] = (JUMP_IF_FALSE, len(out))
+
+    def compile_do_while(self, out, node):
+        self.emit_scoped(out, (), node.scope)
+        start = len(out)
+        self.emit_block(out, node.body)
+        out.append((TICK, node.line))
+        self.emit_expression(out, node.condition)
+        out.append((JUMP_IF_TRUE, start))
+
+    #-----------------------------------------------------------------
+    # Expressions
+    #-----------------------------------------------------------------
+    def compile_const(self, out, node):
+        out.append((CONST, node.value))
+
+    def compile_var(self, out, node):
+        out.append((LOAD_VAR, node))
+
+    def compile_index(self, out, node):
+        # The index is only evaluated once the recipe is known to exist
+        test = len(out)
+        out.append(None)
+        self.emit_expression(out, node.index)
+        out.append((INDEX, node))
+        out[test] = (DEFINED, (node, len(out)))
+
+    def compile_call(self, out, node):
+        out.append((CALL, Lowering.Call(node.name, self.arguments(node.args), node.line, node.ref)))
+
+    def compile_len(self, out, node):
+        if not node.error:
+            self.emit_expression(out, node.argument)
+        out.append((LEN, node))
+
+    def compile_arith(self, out, node):
+        self.emit_expression(out, node.first)
+        for op, operand in node.rest:
+            self.emit_expression(out, operand)
+            out.append((BINARY, operator_site(op, self.apply_operator)))
+
+    def compile_expr_chain(self, out, node):
+        # A None operand ends the chain with the value so far
+        self.emit_expression(out, node.first)
+        test = len(out)
+        out.append(None)
+        steps = []
+        for op, operand in node.rest:
+            self.emit_expression(out, operand)
+            steps.append((len(out), op))
+            out.append(None)
+        end = len(out)
+        out[test] = (JUMP_IF_NONE, end)
+        for position, op in steps:
+            out[position] = (CHAIN, (operator_site(op, self.apply_operator), end))
+
+    def compile_or(self, out, node):
+        # Each operand jumps past the rest when it decides the result
+        self.emit_expression(out, node.first)
+        tests = []
+        for operand in node.rest:
+            tests.append(len(out))
+            out.append(None)
+            self.emit_expression(out, operand)
+        for position in tests:
+            out[position] = (OR, len(out))
+
+    def compile_and(self, out, node):
+        self.emit_expression(out, node.left)
+        test = len(out)
+        out.append(None)
+        self.emit_expression(out, node.right)
+        out[test] = (AND, len(out))
+
+    def compile_compare(self, out, node):
+        self.emit_expression(out, node.left)
+        self.emit_expression(out, node.right)
+        out.append((COMPARE, node.func))
+
+    def compile_fail(self, out, node):
+        out.append((RAISE, node))
+
+
+def compile_program(program, apply_operator):
+    """Compiles the Program returned by Lowering.lower() and bound by Resolver.resolve().
+
+    apply_operator is the generic path of arithmetic that has no fast operation.
+    """
+    return Compiler(apply_operator).program(program)
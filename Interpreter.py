@@ -0,0 +1,590 @@
+"""
+Executes the AST produced by Lowering.lower().
+
+The interpreter reports into the SemanticAnalyzer that owns it (the same
+error list and output sink).  Symbols live in the frames laid out by
+Resolver.resolve(): frames[0] is the program scope and frames[1] the frame of
+the running function, or of dish().  Every name use carries a ref to the slots
+it may be found in, so a lookup indexes at most a few list entries.
+"""
+import Lowering
+from Operators import operator_site
+from SemanticAnalyzer import (FunctionSignature, ParameterSymbol, SemanticError, Symbol, index_bound,
+                              recipe_elements, validate_input)
+from Tracing import get_logger
+
+log = get_logger("interpreter")
+
+_BOOL_TEXT = {"True": "yum", "False": "bleh"}
+
+
+def _serve_text(value):
+    """Formats a serve operand the way the tree walker does."""
+    text = str(value).replace('"', '').replace("-", "~")
+    return _BOOL_TEXT.get(text, text)
+
+
+def _step(value, delta):
+    """++/-- on a symbol value; the tree walker adds or subtracts 1 rather than adding -1."""
+    return (value or 0) + 1 if delta > 0 else (value or 0) - 1
+
+
+class FunctionSymbol(Symbol):
+    """A declared function, with the layout of the frame each call gets."""
+
+    def __init__(self, function):
+        super().__init__(function.name, "function", {"return_type": function.return_type}, function.params)
+        self.set_value(list(function.parts))
+        self.signature = FunctionSignature(function.name, function.return_type, function.params, function.parts,
+                                           function.param_slots, function.size, function.pure)
+
+
+class Interpreter:
+    def __init__(self, analyzer):
+        self.analyzer = analyzer
+        self.errors = analyzer.errors
+        self.output = analyzer.output
+        self.input_provider = analyzer.input_provider
+        self.apply_operator = analyzer._apply_operator
+        self.tick = analyzer.budget.tick
+        # Replaced item by item, never rebound: generated code holds on to it
+        self.frames = [[], []]
+
+        self.statements = {
+            Lowering.VarDecl: self.exec_var_decl,
+            Lowering.ArrayDecl: self.exec_array_decl,
+            Lowering.Assign: self.exec_assign,
+            Lowering.ElementAssign: self.exec_element_assign,
+            Lowering.IncDec: self.exec_inc_dec,
+            Lowering.CallStatement: self.exec_call_statement,
+            Lowering.Serve: self.exec_serve,
+            Lowering.Make: self.exec_make,
+            Lowering.If: self.exec_if,
+            Lowering.Flip: self.exec_flip,
+            Lowering.For: self.exec_for,
+            Lowering.While: self.exec_while,
+            Lowering.DoWhile: self.exec_do_while,
+        }
+        self.expressions = {
+            Lowering.Const: self.eval_const,
+            Lowering.Var: self.eval_var,
+            Lowering.Index: self.eval_index,
+            Lowering.Call: self.eval_call,
+            Lowering.Len: self.eval_len,
+            Lowering.Arith: self.eval_arith,
+            Lowering.ExprChain: self.eval_expr_chain,
+            Lowering.Or: self.eval_or,
+            Lowering.And: self.eval_and,
+            Lowering.Compare: self.eval_compare,
+            Lowering.Fail: self.eval_fail,
+        }
+        self.serve_parts = {
+            Lowering.ServeText: self.serve_text,
+            Lowering.ServeVar: self.serve_var,
+            Lowering.ServeIndex: self.serve_index,
+            Lowering.ServeCall: self.serve_call,
+            Lowering.ServeLen: self.serve_len,
+        }
+
+    def run(self, program):
+        self.frames[:] = [[None] * program.size, [None] * program.dish_size]
+        if program.global_decls:
+            self.run_block(program.global_decls)
+        program_frame = self.frames[0]
+        for function in program.functions:
+            slot = function.slot[1]
+            if program_frame[slot] is not None:
+                name = function.name
+                raise SemanticError("DUPLICATE_DECLARATION", f"Duplicate declaration of function '{name}'",
+                                    identifier=name)
+            program_frame[slot] = FunctionSymbol(function)
+        self.run_block(program.local_decls)
+        self.run_block(program.body)
+
+        exit_code = int(program.exit_code)
+        if exit_code not in [0, 1]:
+            self.errors.append(SemanticError(
+                code="INVALID_TERMINATION_CODE",
+                message="Program must be terminated using only these [1, 0]!",
+                line=program.exit_line
+            ))
+        else:
+            self.analyzer.termination_code = exit_code
+
+    #-----------------------------------------------------------------
+    # Frames and symbols
+    #-----------------------------------------------------------------
+    def load(self, ref):
+        """The symbol a ref points to, or None when the name is undefined."""
+        frames = self.frames
+        for depth, slot in ref:
+            symbol = frames[depth][slot]
+            if symbol is not None:
+                return symbol
+        return None
+
+    def report(self, code, message, line=None, identifier=None):
+        self.errors.append(SemanticError(code=code, message=message, line=line, identifier=identifier))
+
+    #-----------------------------------------------------------------
+    # Statements
+    #-----------------------------------------------------------------
+    def run_block(self, statements):
+        handlers = self.statements
+        for statement in statements:
+            handlers[statement.__class__](statement)
+
+    def exec_var_decl(self, node):
+        var_type = node.var_type
+        frames = self.frames
+        for (name, has_init, value, type_error), (depth, slot) in zip(node.items, node.slots):
+            symbol = Symbol(name, var_type)
+            frames[depth][slot] = symbol
+            if has_init:
+                if value is not None:
+                    symbol.set_value(value)
+                if type_error:
+                    self.report(*type_error)
+
+    def exec_array_decl(self, node):
+        for error in node.errors:
+            self.report(*error)
+        if node.declared:
+            symbol = Symbol(node.name, "recipe", dict(node.attributes))
+            if node.values:
+                symbol.set_value(node.values[:])
+            depth, slot = node.slot
+            self.frames[depth][slot] = symbol
+
+    def assign_target(self, node):
+        """The symbol an assignment writes to, created as a pinch when it is missing."""
+        symbol = self.load(node.ref)
+        if symbol is None:
+            symbol = Symbol(node.name, "pinch")
+            depth, slot = node.slot
+            self.frames[depth][slot] = symbol
+        return symbol
+
+    def exec_assign(self, node):
+        symbol = self.assign_target(node)
+        self.assign(symbol, node.op, self.evaluate(node.value), node.line)
+
+    def assign(self, symbol, op, value, line):
+        """Applies "=", "+=", ... to symbol once the right-hand side is evaluated."""
+        if value is None:
+            log.debug("Expression evaluation returned None for %s", symbol.name)
+            return
+        if op == "=":
+            symbol.set_value(value)
+        elif op == "+=":
+            if symbol.type == 'pasta':
+                symbol.set_value(str(symbol.value or "") + str(value))
+            else:
+                symbol.set_value((symbol.value or 0) + value)
+        elif op == "-=":
+            symbol.set_value((symbol.value or 0) - value)
+        elif op == "*=":
+            symbol.set_value((symbol.value or 0) * value)
+        elif op == "/=":
+            if value == 0:
+                self.report("DIVISION_BY_ZERO", "Division by zero in assignment", line)
+            else:
+                symbol.set_value((symbol.value or 0) / value)
+        elif op == "%=":
+            if value == 0:
+                self.report("DIVISION_BY_ZERO", "Modulo by zero in assignment", line)
+            else:
+                symbol.set_value((symbol.value or 0) % value)
+
+    def exec_element_assign(self, node):
+        index = self.evaluate(node.index)
+        self.store_element(node, index, self.evaluate(node.value))
+
+    def store_element(self, node, index, value):
+        """Applies name[index] op value once the index and the value are evaluated."""
+        self.analyzer.assign_element(self.load(node.ref), node.name, index, node.op, value, node.line)
+
+    def exec_inc_dec(self, node):
+        symbol = self.load(node.ref)
+        if symbol is None:
+            self.report("UNDEFINED_VARIABLE", f"VARIABLE '{node.name}' is UNDEFINED!", node.line)
+            return
+        symbol.set_value(_step(symbol.value, node.delta))
+
+    def exec_call_statement(self, node):
+        self.call_function(node.ref, node.args, node.line, is_void=True)
+
+    def exec_serve(self, node):
+        result = ""
+        handlers = self.serve_parts
+        for part in node.parts:
+            text = handlers[part.__class__](part)
+            if text is None:
+                return
+            result += text
+        if result:
+            self.output.write(result)
+
+    def exec_make(self, node):
+        symbol = self.load(node.ref)
+        val = self.input_provider.read(symbol.name, node.line)
+        val = validate_input(val)
+        if (symbol.type == 'pinch' and not isinstance(val, int) or
+                symbol.type == 'pasta' and not isinstance(val, str) or
+                symbol.type == 'skim' and not isinstance(val, float) or
+                val is None):
+            self.report("INVALID_VALUE", f"{val} is not allowed to be passed to {symbol.type} type", node.line)
+            return
+        symbol.value = val
+        self.output.write("input: " + str(val).replace("-", "~"))
+
+    def enter_block(self, slots):
+        """Clears the (start, stop) slots a loop or taste block owns, so that it starts with no names of its own.
+
+        Blocks that own no slots are not entered at all.
+        """
+        start, stop = slots
+        self.frames[1][start:stop] = [None] * (stop - start)
+
+    def exec_if(self, node):
+        for position, (condition, body) in enumerate(node.branches):
+            if self.evaluate(condition):
+                slots = node.scopes[position]
+                if slots is not None:
+                    self.enter_block(slots)
+                self.run_block(body)
+                return
+        if node.orelse is not None:
+            if node.scopes[-1] is not None:
+                self.enter_block(node.scopes[-1])
+            self.run_block(node.orelse)
+
+    def flip_matches(self, ref, is_pinch, literal):
+        symbol = self.load(ref)
+        if is_pinch:
+            case_val = int(literal)
+            return int(symbol.get_value()) == case_val
+        return str(symbol.get_value()) == str(literal)
+
+    def exec_flip(self, node):
+        for is_pinch, literal, body in node.cases:
+            if self.flip_matches(node.ref, is_pinch, literal):
+                self.run_block(body)
+                return
+        if node.default is not None:
+            self.run_block(node.default)
+
+    def exec_for(self, node):
+        if node.scope is not None:
+            self.enter_block(node.scope)
+        self._run_for(node)
+
+    def init_for(self, node):
+        """Declares or looks up the loop variable and gives it its initial value."""
+        if node.declare:
+            symbol = Symbol(node.name, node.declare)
+            depth, slot = node.ref[0]
+            self.frames[depth][slot] = symbol
+        else:
+            symbol = self.load(node.ref)
+        if node.init_name is not None:
+            value = self.load(node.init_ref)
+        else:
+            value = node.init_value
+        if value is not None:
+            symbol.set_value(value)
+
+    def _run_for(self, node):
+        self.init_for(node)
+        evaluate = self.evaluate
+        condition = node.condition
+        body = node.body
+        tick = self.tick
+        while evaluate(condition):
+            self.run_block(body)
+            tick(node.line)
+            if not self.step_for(node):
+                return
+
+    def step_for(self, node):
+        """Runs the step of a for loop; returns False when its variable is undefined."""
+        if node.step is None:
+            raise IndexError(Lowering._INDEX_ERROR)
+        name, delta = node.step
+        symbol = self.load(node.step_ref)
+        if symbol is None:
+            self.report("UNDEFINED_VARIABLE", f"VARIABLE '{name}' is UNDEFINED!", node.line)
+            return False
+        symbol.set_value(_step(symbol.value, delta))
+        return True
+
+    def exec_while(self, node):
+        if node.scope is not None:
+            self.enter_block(node.scope)
+        evaluate = self.evaluate
+        tick = self.tick
+        while evaluate(node.condition):
+            self.run_block(node.body)
+            tick(node.line)
+
+    def exec_do_while(self, node):
+        if node.scope is not None:
+            self.enter_block(node.scope)
+        self.run_block(node.body)
+        self.tick(node.line)
+        evaluate = self.evaluate
+        tick = self.tick
+        while evaluate(node.condition):
+            self.run_block(node.body)
+            tick(node.line)
+
+    #-----------------------------------------------------------------
+    # Serve parts
+    #-----------------------------------------------------------------
+    def serve_text(self, part):
+        return part.text
+
+    def check_defined(self, node):
+        """Reports node's name when it is undefined; returns whether it is defined."""
+        if self.load(node.ref) is not None:
+            return True
+        self.report("UNDEFINED_IDENTIFIER", f"Identifier [{node.name}] does not exist!", node.line, node.name)
+        return False
+
+    def serve_var(self, part):
+        if part.checked and not self.check_defined(part):
+            return None
+        symbol = self.load(part.ref)
+        text = str(symbol.value if symbol is not None else "").replace("-", "~")
+        return _BOOL_TEXT.get(text, text)
+
+    def serve_index(self, part):
+        if not self.check_defined(part):
+            return None
+        return self.serve_element(part, self.evaluate(part.index))
+
+    def serve_element(self, part, index):
+        """The text of element index of the recipe a serve part names, or None when it is out of bounds."""
+        listed_value, index_value = self._index(part, index)
+        if listed_value is None:
+            return None
+        return _serve_text(listed_value[index_value])
+
+    def serve_call(self, part):
+        if not self.check_defined(part):
+            return None
+        return_val = self.call_function(part.ref, part.args, part.args_line)
+        return _serve_text(return_val) if return_val else ""
+
+    def serve_len(self, part):
+        if part.error:
+            code, message, identifier = part.error
+            self.report(code, message, part.line, identifier)
+            return None
+        return_val = len(self.evaluate(part.argument))
+        return _serve_text(return_val) if return_val else ""
+
+    #-----------------------------------------------------------------
+    # Calls
+    #-----------------------------------------------------------------
+    def _bind_arguments(self, symbol, args, recipes):
+        """Evaluates the arguments in the caller's scope and binds them, by position, in a new frame.
+
+        Returns the frame and the unmatched (params, args) counts.
+        """
+        signature, frame = self.new_frame(symbol)
+        evaluate = self.evaluate
+        bind_argument = self.bind_argument
+        for binding, arg in zip(signature.bindings, args):
+            bind_argument(frame, binding, evaluate(arg), recipes)
+        count = min(signature.arity, len(args))
+        return frame, signature.arity - count, len(args) - count
+
+    def new_frame(self, symbol):
+        """The signature of the function symbol names and an empty frame for a call to it."""
+        signature = symbol.signature
+        if signature is None:
+            raise AttributeError("'NoneType' object has no attribute 'children'")
+        return signature, [None] * signature.frame_size
+
+    def bind_argument(self, frame, binding, data_val, recipes):
+        slot, data_type, data_name = binding
+        attributes = None
+        if recipes and isinstance(data_val, Lowering.RECIPE_STORAGE):
+            attributes = {'dimensions': len(data_val), 'element_type': data_type}
+            data_type = "recipe"
+        frame[slot] = ParameterSymbol(data_name, data_type, data_val, attributes)
+
+    def _run_function(self, signature, frame, is_void):
+        # A hungry function has no return expression: calling one in an
+        # expression raises IndexError before its body runs
+        return_expr = signature.return_expr
+        if not is_void and return_expr is None:
+            raise IndexError("list index out of range")
+        self.tick()
+        # A pure function called with the same arguments returns the cached
+        # value and reports the errors its first run reported
+        memo = signature.memo
+        key = None
+        if memo is not None and not is_void:
+            key = memo.key([frame[slot] for slot, _, _ in signature.bindings])
+            cached = memo.get(key) if key is not None else None
+            if cached is not None:
+                self.errors.extend(cached[1])
+                return cached[0]
+            first_error = len(self.errors)
+        frames = self.frames
+        caller = frames[1]
+        frames[1] = frame
+        self.run_block(signature.decls)
+        self.run_block(signature.body)
+        return_val = None
+        if not is_void:
+            return_val = self.evaluate(return_expr)
+        frames[1] = caller
+        if key is not None:
+            memo.store(key, return_val, self.errors[first_error:])
+        return return_val
+
+    def call_function(self, ref, args, line, is_void=False):
+        """Call statements and calls inside serve (SemanticAnalyzer.get_function_return)."""
+        symbol = self.load(ref)
+        if not is_void and symbol.attributes.get("return_type", "none") == 'void':
+            self.report("VOID_FUNCTION", "Void functions does not return a value!", line)
+            return None
+
+        frame, missing, extra = self._bind_arguments(symbol, args, recipes=True)
+        if missing:
+            self.report("MISSING_ARGUMENTS", "Doesn't meet the required number of arguments!", line)
+            return None
+        if extra:
+            self.report("TOO_MANY_ARGUMENTS", "Too many arguments provided to function call!", line)
+            return None
+        return self._run_function(symbol.signature, frame, is_void)
+
+    def eval_call(self, node):
+        """Calls inside expressions, which report argument errors and carry on."""
+        symbol = self.load(node.ref)
+        if symbol is None:
+            self.report("UNDEFINED_IDENTIFIER", f"Identifier [{node.name}] does not exist!", node.line, node.name)
+            return None
+        if symbol.attributes.get("return_type", "none") == 'void':
+            self.report("VOID_FUNCTION", "Void functions does not return a value!", node.line)
+
+        frame, missing, extra = self._bind_arguments(symbol, node.args, recipes=False)
+        if missing:
+            self.report("MISSING_ARGUMENTS", "Doesn't meet the required number of arguments!", node.line)
+        if extra:
+            self.report("TOO_MANY_ARGUMENTS", "Too many arguments provided to function call!", node.line)
+        return self._run_function(symbol.signature, frame, False)
+
+    #-----------------------------------------------------------------
+    # Expressions
+    #-----------------------------------------------------------------
+    def evaluate(self, node):
+        return self.expressions[node.__class__](node)
+
+    def eval_const(self, node):
+        return node.value
+
+    def eval_var(self, node):
+        frames = self.frames
+        for depth, slot in node.ref:
+            symbol = frames[depth][slot]
+            if symbol is not None:
+                return symbol.value
+        if node.name != "len":
+            self.report("UNDEFINED_IDENTIFIER", f"Identifier [{node.name}] does not exist!", node.line, node.name)
+        return None
+
+    def _index(self, node, index):
+        """Returns (elements, index) for name[index], or (None, None) when out of bounds."""
+        index_value = int(index)
+        symbol = self.load(node.ref)
+        listed_value = recipe_elements(symbol.get_value())
+        bound = index_bound(symbol, listed_value)
+        if not 0 <= index_value < bound:
+            self.report("ARRAY_OUT_OF_BOUNDS",
+                        f"Accessed an index outside the allowed range. index[{index_value}]:range[{bound - 1}]",
+                        node.line, node.name)
+            return None, None
+        return listed_value, index_value
+
+    def eval_index(self, node):
+        # The index is only evaluated once the recipe is known to exist
+        if not self.check_defined(node):
+            return None
+        return self.index_element(node, self.evaluate(node.index))
+
+    def index_element(self, node, index):
+        """The value of element index of the recipe node names, or None when it is out of bounds."""
+        name = node.name
+        listed_value, index_value = self._index(node, index)
+        if listed_value is None:
+            return None
+        symbol = self.load(node.ref)
+        final_val = listed_value[index_value]
+        element_type = symbol.attributes.get("element_type", "None")
+        if element_type == 'pinch':
+            return int(final_val)
+        if element_type == 'skim':
+            return float(final_val)
+        if element_type == 'pasta' or symbol.type == "pasta":
+            return str(final_val).replace('"', "")
+        self.report("UNKNOWN_RECIPE_TYPE", f"Undefined element_type[{element_type}] {symbol}", node.line, name)
+        return None
+
+    def eval_len(self, node):
+        if node.error:
+            code, message, identifier = node.error
+            self.report(code, message, node.line, identifier)
+            return None
+        return len(self.evaluate(node.argument))
+
+    def operator_sites(self, node):
+        """The operator_site() of each operator of an Arith or ExprChain, made on its first run."""
+        sites = node.sites
+        if sites is None:
+            apply_operator = self.apply_operator
+            sites = node.sites = tuple(operator_site(op, apply_operator) for op, _ in node.rest)
+        return sites
+
+    def eval_arith(self, node):
+        evaluate = self.evaluate
+        value = evaluate(node.first)
+        for (_, operand), apply in zip(node.rest, node.sites or self.operator_sites(node)):
+            value = apply(value, evaluate(operand))
+        return value
+
+    def eval_expr_chain(self, node):
+        evaluate = self.evaluate
+        value = evaluate(node.first)
+        if value is None:
+            return None
+        for (_, operand), apply in zip(node.rest, node.sites or self.operator_sites(node)):
+            right = evaluate(operand)
+            if value is None or right is None:
+                return value
+            value = apply(value, right)
+        return value
+
+    def eval_or(self, node):
+        # Operands are evaluated up to the first true one
+        evaluate = self.evaluate
+        value = evaluate(node.first)
+        for operand in node.rest:
+            if value:
+                return value
+            value = evaluate(operand)
+        return value
+
+    def eval_and(self, node):
+        left = self.evaluate(node.left)
+        return left and self.evaluate(node.right)
+
+    def eval_compare(self, node):
+        left = self.evaluate(node.left)
+        return node.func(left, self.evaluate(node.right))
+
+    def eval_fail(self, node):
+        raise node.exc_type(node.message)
@@ -1,5 +1,377 @@
+import re
+import sys
+from array import array
+
+# Keywords of the language and the delimiter set (an attribute of
+# LexicalAnalyzer) that has to follow each of them.  "dinein" accepts any
+# whitespace and "takeout" may also end the program.
+KEYWORD_DELIMITERS = {
+    "bleh": "bool_delim", "bool": "dt_delim", "case": "space_delim",
+    "chef": "space_delim", "chop": "semicolon_delim", "default": "colon_delim",
+    "dinein": "isspace", "dish": "oparan_delim", "elif": "delim0",
+    "flip": "delim0", "for": "delim0", "full": "dt_delim",
+    "hungry": "space_delim", "keepmix": "delim2", "make": "delim0",
+    "mix": "delim2", "pasta": "dt_delim", "pinch": "dt_delim",
+    "recipe": "dt_delim", "serve": "delim0", "simmer": "delim0",
+    "skim": "dt_delim", "spit": "space_delim", "takeout": "whitespace_or_end",
+    "taste": "delim0", "yum": "bool_delim",
+}
+
+# Operators and punctuation with the delimiter set that has to follow them.
+# "&" and "?" are only valid as the first half of "&&" and "??".
+SYMBOL_DELIMITERS = {
+    "-": "delim3", "--": "delim4", "-=": "delim5",
+    ",": "delim6",
+    "!": "delim7", "!!": "delim3", "!=": "delim8",
+    "??": "delim3",
+    "(": "delim12", ")": "delim13", "[": "delim14", "]": "delim15",
+    "{": "delim16", "}": "delim17",
+    "*": "delim3", "*=": "delim5",
+    "/": "delim3", "/=": "delim5",
+    "&&": "delim3",
+    "%": "delim3", "%=": "delim5",
+    "+": "delim1", "++": "delim4", "+=": "delim5",
+    "<": "delim3", "<=": "delim5",
+    "=": "delim8", "==": "delim8",
+    ">": "delim3", ">=": "delim3",
+    ";": "whitespace_or_end", ":": "whitespace_or_end",
+}
+
+MAX_IDENTIFIER_LENGTH = 32
+MAX_INTEGER_DIGITS = 9
+MAX_FRACTION_DIGITS = 9
+
+# ASCII characters an identifier may continue with.
+IDENTIFIER_RUN = re.compile("[0-9A-Z_a-z]*")
+
+# Actions of the table-driven engine.  Every row of the transition table
+# maps a character (None at the end of the input) to an (action, argument)
+# pair.
+BEGIN, SHIFT, RUN, WORD, ACCEPT, IDENT, ERROR, SKIP, NEWLINE, EMIT_CONSUME, SHIFT_EMIT, UNEXPECTED = range(12)
+
+INVALID_DELIMITER = "Line {line}: '{lexeme}' Invalid Delimiter ' {c!r} '."
+INVALID_IDENTIFIER_DELIMITER = "Line {line}: Identifier '{lexeme}' Invalid Delimiter ' {c!r} '."
+INVALID_ID_DELIMITER = "Line {line}: Id '{lexeme}' Invalid Delimiter ' {c!r} '."
+INVALID_SYMBOL_DELIMITER = "Line {line}: Symbol '{lexeme}' Invalid Delimiter ' {c!r} '."
+
+
+def is_identifier_char(c):
+    return c is not None and (c.isalpha() or c.isdigit() or c == '_')
+
+
+class Token:
+    """A token of the source program.
+
+    kind is the grammar terminal: "id" for every identifier, otherwise the
+    keyword, symbol or literal type.  Identifiers keep their running number
+    so type still reads "identifier17".  Indexing and iteration give the
+    old (lexeme, type, line) tuple.
+    """
+
+    __slots__ = ('lexeme', 'kind', 'line', 'number')
+
+    def __init__(self, lexeme, kind, line, number=None):
+        self.lexeme = lexeme
+        self.kind = kind
+        self.line = line
+        self.number = number
+
+    @classmethod
+    def from_tuple(cls, token):
+        lexeme, token_type, line = token
+        if token_type.startswith("identifier"):
+            number = token_type[len("identifier"):]
+            return cls(lexeme, "id", line, int(number) if number else None)
+        return cls(lexeme, sys.intern(token_type), line)
+
+    @property
+    def type(self):
+        if self.kind != "id":
+            return self.kind
+        return "identifier" if self.number is None else f"identifier{self.number}"
+
+    def __getitem__(self, index):
+        return (self.lexeme, self.type, self.line)[index]
+
+    def __iter__(self):
+        return iter((self.lexeme, self.type, self.line))
+
+    def __len__(self):
+        return 3
+
+    def __eq__(self, other):
+        if isinstance(other, (Token, tuple)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return repr(tuple(self))
+
+
+# Token kinds whose lexeme is always the kind itself.
+FIXED_KINDS = frozenset(KEYWORD_DELIMITERS) | frozenset(SYMBOL_DELIMITERS)
+
+TOKEN_KINDS = sorted(FIXED_KINDS) + ["id", "pinchliterals", "skimliterals", "pastaliterals", "singlecomment", "multicomment"]
+TOKEN_KIND_IDS = {kind: index for index, kind in enumerate(TOKEN_KINDS)}
+
+
+class TokenBuffer:
+    """Tokens of one source stored as parallel arrays.
+
+    Kinds are small integers into TOKEN_KINDS, lexemes are (start, end)
+    offsets into the source and identifier numbers are 0 when absent.
+    Indexing and iteration hand out Token objects.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.kinds = array('H')
+        self.lines = array('I')
+        self.starts = array('I')
+        self.ends = array('I')
+        self.numbers = array('I')
+
+    def append(self, kind, start, end, line, number=0):
+        self.extend([(kind, start, end, line, number)])
+
+    def extend(self, spans):
+        """Appends (kind, start, end, line, number) spans, e.g. from LexicalAnalyzer.scan_table()."""
+        kind_ids = TOKEN_KIND_IDS
+        add_kind = self.kinds.append
+        add_line = self.lines.append
+        add_start = self.starts.append
+        add_end = self.ends.append
+        add_number = self.numbers.append
+        for kind, start, end, line, number in spans:
+            kind_id = kind_ids.get(kind)
+            if kind_id is None:
+                kind_id = kind_ids[kind] = len(TOKEN_KINDS)
+                TOKEN_KINDS.append(kind)
+            add_kind(kind_id)
+            add_line(line)
+            add_start(start)
+            add_end(end)
+            add_number(number)
+
+    def token(self, index):
+        kind = TOKEN_KINDS[self.kinds[index]]
+        if kind in FIXED_KINDS:
+            return Token(kind, kind, self.lines[index])
+        return Token(self.source[self.starts[index]:self.ends[index]], kind, self.lines[index], self.numbers[index] or None)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.token(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("token index out of range")
+        return self.token(index)
+
+    def __iter__(self):
+        for index in range(len(self.kinds)):
+            yield self.token(index)
+
+    def __eq__(self, other):
+        try:
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class TransitionTable:
+    """Transition table compiled from the keyword and symbol specs above.
+
+    States are plain integers, 0 being the start state.  Rows are
+    precomputed for ASCII, the curly quotes and the end of input; any other
+    character is resolved from the state's ordered rules on first use.
+    """
+
+    def __init__(self, lexer):
+        self.lexer = lexer
+        self.rules = []
+        self.names = []
+        self.runs = {}
+        self.word_states = {}
+        self.start = self.new_state("start")
+        self.identifier = self.new_state("identifier")
+        self.build()
+        keys = [chr(i) for i in range(128)] + ['“', '”', None]
+        self.rows = [{c: self.resolve_rules(state, c) for c in keys} for state in range(len(self.rules))]
+        for state in list(self.runs):
+            chars = [c for c in keys if c is not None and self.rows[state][c] == (RUN, state)]
+            self.runs[state] = re.compile("[" + "".join(re.escape(c) for c in chars) + "]*")
+
+    def new_state(self, name):
+        self.rules.append([])
+        self.names.append(name)
+        return len(self.rules) - 1
+
+    def delimiters(self, name):
+        if name == "isspace":
+            return lambda c: c is not None and (c in self.lexer.newline_delim or c.isspace())
+        if name == "whitespace_or_end":
+            return self.lexer.whitespace | {None}
+        return getattr(self.lexer, name)
+
+    def build(self):
+        lexer = self.lexer
+        start = self.start
+        start_rules = [(set(lexer.dt_delim), (SKIP, None)), (set(lexer.newline_delim), (NEWLINE, None))]
+
+        # Words: the maximal identifier run is scanned in one go and looked
+        # up in word_states.  The state it lands in only has to check the
+        # delimiter that follows the word.
+        start_rules.append((lexer.alpha_small, (WORD, None)))
+        for keyword, delimiters in KEYWORD_DELIMITERS.items():
+            state = self.new_state(keyword)
+            self.rules[state] = [
+                (self.delimiters(delimiters), (ACCEPT, keyword)),
+                (None, (ERROR, INVALID_DELIMITER)),
+            ]
+            self.word_states[keyword] = state
+
+        # A lone keyword initial is an identifier without a number, the
+        # longer keyword prefixes are not identifiers at all.
+        initial = self.new_state("keyword initial")
+        self.rules[initial] = [
+            (lexer.id_delim, (IDENT, None)),
+            (None, (ERROR, INVALID_DELIMITER)),
+        ]
+        prefix_state = self.new_state("keyword prefix")
+        self.rules[prefix_state] = [(None, (ERROR, INVALID_DELIMITER))]
+        for keyword in KEYWORD_DELIMITERS:
+            self.word_states[keyword[0]] = initial
+            for size in range(2, len(keyword)):
+                self.word_states[keyword[:size]] = prefix_state
+
+        letter = self.new_state("identifier start")
+        self.rules[letter] = [
+            (lexer.id_delim, (IDENT, True)),
+            (None, (ERROR, INVALID_IDENTIFIER_DELIMITER)),
+        ]
+        for c in lexer.alpha_small:
+            self.word_states.setdefault(c, letter)
+        self.rules[self.identifier] = [
+            (lexer.id_delim, (IDENT, True)),
+            (None, (ERROR, INVALID_ID_DELIMITER)),
+        ]
+
+        # Operators and punctuation.
+        symbols = {"": start}
+        for symbol in SYMBOL_DELIMITERS:
+            for size in range(1, len(symbol) + 1):
+                prefix = symbol[:size]
+                if prefix not in symbols:
+                    symbols[prefix] = self.new_state(prefix)
+                    parent = symbols[prefix[:-1]]
+                    if parent == start:
+                        start_rules.append(({prefix}, (BEGIN, symbols[prefix])))
+                    else:
+                        self.rules[parent].append(({prefix[-1]}, (SHIFT, symbols[prefix])))
+        for prefix, state in symbols.items():
+            if state == start:
+                continue
+            if prefix in SYMBOL_DELIMITERS:
+                self.rules[state].insert(0, (self.delimiters(SYMBOL_DELIMITERS[prefix]), (ACCEPT, prefix)))
+            if prefix in (";", ":"):
+                self.rules[state].append((None, (ERROR, INVALID_SYMBOL_DELIMITER)))
+
+        # Comments: "//" up to the end of the line, "/-" up to "-/".
+        line_comment = self.new_state("//")
+        self.rules[symbols["/"]].append(({'/'}, (SHIFT, line_comment)))
+        self.rules[line_comment] = [
+            ({'\n', None}, (EMIT_CONSUME, "singlecomment")),
+            (None, (RUN, line_comment)),
+        ]
+        self.runs[line_comment] = None
+        block_comment = self.new_state("/-")
+        block_comment_end = self.new_state("/- -")
+        self.rules[symbols["/"]].append(({'-'}, (SHIFT, block_comment)))
+        self.rules[block_comment] = [
+            (lexer.asciicmnt, (RUN, block_comment)),
+            ({'-'}, (SHIFT, block_comment_end)),
+        ]
+        self.runs[block_comment] = None
+        self.rules[block_comment_end] = [({'/'}, (SHIFT_EMIT, "multicomment"))]
+
+        for prefix, state in symbols.items():
+            if state != start and prefix not in (";", ":"):
+                self.rules[state].append((None, (ERROR, INVALID_DELIMITER)))
+
+        # String literals.
+        string = self.new_state("string")
+        string_end = self.new_state("string end")
+        start_rules.append(({'"'}, (BEGIN, string)))
+        self.rules[string] = [
+            (lexer.asciistr, (RUN, string)),
+            ({'"'}, (SHIFT, string_end)),
+            (None, (ERROR, INVALID_DELIMITER)),
+        ]
+        self.runs[string] = None
+        self.rules[string_end] = [
+            (lexer.pasta_delim, (ACCEPT, "pastaliterals")),
+            (None, (ERROR, INVALID_DELIMITER)),
+        ]
+
+        # Number literals: "~" for negatives, at most nine digits on either
+        # side of the decimal point.
+        negative = self.new_state("~")
+        start_rules.append(({'~'}, (BEGIN, negative)))
+        integer = [self.new_state(f"integer {i}") for i in range(1, MAX_INTEGER_DIGITS + 1)]
+        start_rules.append((lexer.all_num, (BEGIN, integer[0])))
+        point = self.new_state(".")
+        fraction = [self.new_state(f"fraction {i}") for i in range(1, MAX_FRACTION_DIGITS + 1)]
+        self.rules[negative] = [(lexer.all_num, (SHIFT, integer[0])), (None, (ERROR, INVALID_DELIMITER))]
+        for i, state in enumerate(integer):
+            if i + 1 < len(integer):
+                self.rules[state].append((lexer.all_num, (SHIFT, integer[i + 1])))
+            self.rules[state] += [
+                ({'.'}, (SHIFT, point)),
+                (lexer.num_delim, (ACCEPT, "pinchliterals")),
+                (None, (ERROR, INVALID_DELIMITER)),
+            ]
+        self.rules[point] = [(lexer.all_num, (SHIFT, fraction[0])), (None, (ERROR, INVALID_DELIMITER))]
+        for i, state in enumerate(fraction):
+            if i + 1 < len(fraction):
+                self.rules[state].append((lexer.all_num, (SHIFT, fraction[i + 1])))
+            self.rules[state] += [
+                (lexer.num_delim, (ACCEPT, "skimliterals")),
+                (None, (ERROR, INVALID_DELIMITER)),
+            ]
+
+        start_rules.append((None, (UNEXPECTED, None)))
+        self.rules[start] = start_rules
+
+    def resolve_rules(self, state, c):
+        for matcher, action in self.rules[state]:
+            if matcher is None or (matcher(c) if callable(matcher) else c in matcher):
+                return action
+        return (ERROR, INVALID_DELIMITER)
+
+    def resolve(self, state, c):
+        action = self.resolve_rules(state, c)
+        self.rows[state][c] = action
+        return action
+
+
 class LexicalAnalyzer:
-    def __init__(self):
+    table = None
+
+    def __init__(self, engine="table"):
+        # "table" runs the automaton from a compiled TransitionTable,
+        # "dfa" runs the original hand written state machine in
+        # tokenize_dfa().
+        self.engine = engine
         self.whitespace = {' ', '\t', '\n'}
         self.alpha_big = set("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
         self.alpha_small = set("abcdefghijklmnopqrstuvwxyz")
@@ -63,6 +435,31 @@ class LexicalAnalyzer:
                 self.index -= 1
 
     def tokenize(self, code):
+        """Returns the tokens of code as a TokenBuffer (a list of Tokens for the "dfa" engine)."""
+        if self.engine == "dfa":
+            return list(self.iter_tokens(code))
+        tokens = TokenBuffer(code)
+        tokens.extend(self.scan_table(code))
+        return tokens
+
+    def iter_tokens(self, code):
+        """Yields Token objects as they are recognized."""
+        if self.engine == "dfa":
+            for token in self.tokenize_dfa(code):
+                yield Token.from_tuple(token)
+            return
+
+        names = {}
+        for kind, start, end, line, number in self.scan_table(code):
+            if kind in FIXED_KINDS:
+                yield Token(kind, kind, line)
+            elif kind == "id":
+                name = code[start:end]
+                yield Token(names.setdefault(name, name), kind, line, number or None)
+            else:
+                yield Token(code[start:end], kind, line)
+
+    def tokenize_dfa(self, code):
         self.code = code
         tokens = []
         self.index = 0
@@ -2617,6 +3014,95 @@ class LexicalAnalyzer:
                     
         return tokens
 
+    def transition_table(self):
+        if LexicalAnalyzer.table is None:
+            LexicalAnalyzer.table = TransitionTable(LexicalAnalyzer())
+        return LexicalAnalyzer.table
+
+    def scan_table(self, code):
+        """Yields (kind, start, end, line, number) for each token of code."""
+        table = self.transition_table()
+        rows = table.rows
+        runs = table.runs
+        resolve = table.resolve
+        word_states = table.word_states
+        identifier = table.identifier
+        id_run = IDENTIFIER_RUN
+        errors = self.errors
+        self.code = code
+        n = len(code)
+        i = 0
+        start = 0
+        state = 0
+        line = 1
+        self.identifier_count = 0
+
+        while True:
+            c = code[i] if i < n else None
+
+            if c is None and state == 0:
+                break
+
+            action = rows[state].get(c)
+            if action is None:
+                action = resolve(state, c)
+            op, arg = action
+
+            if op == RUN:
+                i = runs[arg].match(code, i + 1).end()
+            elif op == WORD:
+                start = i
+                i = id_run.match(code, i + 1).end()
+                while i < n and code[i] >= '\x80' and is_identifier_char(code[i]):
+                    i = id_run.match(code, i + 1).end()
+                if i - start > MAX_IDENTIFIER_LENGTH:
+                    i = start + MAX_IDENTIFIER_LENGTH + 1
+                    errors.append(f"Line {line}: id '{code[start:i]}' exceeds {MAX_IDENTIFIER_LENGTH} characters.")
+                else:
+                    state = word_states.get(code[start:i], identifier)
+            elif op == SHIFT:
+                i += 1
+                state = arg
+            elif op == BEGIN:
+                start = i
+                i += 1
+                state = arg
+            elif op == ACCEPT:
+                yield (arg, start, i, line, 0)
+                state = 0
+            elif op == IDENT:
+                # A lone keyword initial is an identifier without a number.
+                if arg:
+                    self.identifier_count += 1
+                    yield ("id", start, i, line, self.identifier_count)
+                else:
+                    yield ("id", start, i, line, 0)
+                state = 0
+            elif op == SKIP:
+                i += 1
+            elif op == NEWLINE:
+                i += 1
+                line += 1
+            elif op == ERROR:
+                errors.append(arg.format(line=line, lexeme=code[start:i], c=c))
+                if c is not None:
+                    i += 1
+                state = 0
+            elif op == EMIT_CONSUME:
+                yield (arg, start, i, line, 0)
+                if c is not None:
+                    i += 1
+                state = 0
+            elif op == SHIFT_EMIT:
+                i += 1
+                yield (arg, start, i, line, 0)
+                state = 0
+            else:
+                errors.append(f"Line {line}: Unexpected Character '{c}'.")
+                i += 1
+
+        self.index = i
+
 
     def display_tokens(self, tokens):
             print(f"{'Lexeme'.ljust(40)}{'Token'.ljust(20)}")
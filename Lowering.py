@@ -0,0 +1,954 @@
+"""
+Lowering of the LL(1) parse tree into the compact AST run by Interpreter.
+
+The parse tree is a concrete syntax tree: every statement and expression is
+spelled out as positional children and right-recursive "_tail" chains.  The
+tree walker in SemanticAnalyzer navigates that shape on every evaluation,
+including inside loop bodies.  lower() does the navigation once and returns
+flat node classes (binary chains, calls, loops, assignments) that the
+interpreter executes directly.
+
+Lowering decides everything that only depends on the shape of the tree the
+same way the tree walker does, including its quirks, so both engines give the
+same output, errors and exceptions:
+
+  - only the first global declaration is declared;
+  - "a < b < c" only looks at "a < b";
+  - "&&" and "??" stop at the operand that decides the result;
+  - "!" and "!!" are not applied to a condition, and a relational that starts
+    with "!(" raises IndexError when it is evaluated;
+  - negative literals inside expressions evaluate to None, while declarations
+    and for-loop initialisers read them as negative numbers;
+  - "--i" as a for-loop step raises IndexError after the first iteration.
+
+Literals are decoded once, into Const nodes, and operator chains whose
+operands are all constants are folded into a single Const, as are "&&" and
+"??" conditions that a constant first operand decides.  Only what cannot
+fail is folded: an operand that is not a number, a division or modulo by zero
+and a comparison that would raise are left for run time, so they are
+reported exactly as before, each time they run.
+
+The nodes that use a name have slots for the frame positions Resolver.py
+binds them to; lower() leaves those empty.
+"""
+import operator
+from array import array
+
+_COMPARISONS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+_INDEX_ERROR = "list index out of range"
+
+# Returned by the folding helpers for operations that are left for run time
+_NOT_FOLDED = object()
+
+# What the value of a recipe may be: see recipe_storage()
+RECIPE_STORAGE = (list, array)
+
+
+def recipe_storage(element_type, lexemes):
+    """
+    The elements of a recipe, decoded once from their lexemes: an array('q')
+    of ints for pinch, an array('d') of floats for skim and a list of str for
+    pasta.  A recipe with an element that is not a literal of its type, or of
+    any other element type, keeps the lexemes, which are converted (and fail)
+    when they are read, as before.
+    """
+    if element_type == "pasta":
+        return [text.replace('"', "") for text in lexemes]
+    if element_type not in ("pinch", "skim"):
+        return list(lexemes)
+    convert = int if element_type == "pinch" else float
+    try:
+        values = [convert(text.replace("~", "-")) for text in lexemes]
+    except ValueError:
+        return list(lexemes)
+    try:
+        return array("q" if element_type == "pinch" else "d", values)
+    except OverflowError:
+        return values
+
+
+#---------------------------------------------------------------------
+# AST nodes
+#---------------------------------------------------------------------
+class Program:
+    __slots__ = ('global_decls', 'functions', 'local_decls', 'body', 'exit_code', 'exit_line', 'size', 'dish_size')
+
+    def __init__(self, global_decls, functions, local_decls, body, exit_code, exit_line, size=0, dish_size=0):
+        self.global_decls = global_decls
+        self.functions = functions
+        self.local_decls = local_decls
+        self.body = body
+        self.exit_code = exit_code  # raw lexeme after the final "spit"
+        self.exit_line = exit_line
+        self.size = size            # slots of the program frame, set by Resolver
+        self.dish_size = dish_size  # slots of the frame dish() runs in
+
+
+class FunctionDef:
+    __slots__ = ('name', 'return_type', 'params', 'parts', 'slot', 'size', 'param_slots', 'pure')
+
+    def __init__(self, name, return_type, params, parts, slot=None, size=0, param_slots=None, pure=False):
+        self.name = name
+        self.return_type = return_type  # "void" for hungry functions
+        self.params = params            # tuple of (data_type, name)
+        self.parts = parts              # [local_decls, body] + [return_expr] for full functions
+        self.slot = slot                # (depth, slot) of the function symbol
+        self.size = size                # slots of a call frame
+        self.param_slots = param_slots  # frame slot of each parameter
+        self.pure = pure                # set by Resolver, see Purity.py
+
+
+# Statements
+
+class VarDecl:
+    __slots__ = ('var_type', 'items', 'slots')
+
+    def __init__(self, var_type, items, slots=None):
+        self.var_type = var_type
+        self.items = items  # tuple of (name, has_init, value, type_error)
+        self.slots = slots  # (depth, slot) of each item
+
+
+class ArrayDecl:
+    __slots__ = ('name', 'attributes', 'values', 'errors', 'declared', 'slot')
+
+    def __init__(self, name, attributes, values, errors, declared, slot=None):
+        self.name = name
+        self.attributes = attributes
+        self.values = values      # the elements, from recipe_storage(), copied by each declaration
+        self.errors = errors      # tuple of (code, message, line, identifier)
+        self.declared = declared  # False when the declaration itself failed
+        self.slot = slot
+
+
+class Assign:
+    __slots__ = ('name', 'op', 'value', 'line', 'ref', 'slot')
+
+    def __init__(self, name, op, value, line, ref=None, slot=None):
+        self.name = name
+        self.op = op
+        self.value = value
+        self.line = line
+        self.ref = ref
+        self.slot = slot  # where a missing target is created, or None when it always exists
+
+
+class ElementAssign:
+    """name[index] op value: the index and the value are evaluated before the element is stored."""
+    __slots__ = ('name', 'index', 'op', 'value', 'line', 'ref')
+
+    def __init__(self, name, index, op, value, line, ref=None):
+        self.name = name
+        self.index = index
+        self.op = op
+        self.value = value
+        self.line = line
+        self.ref = ref
+
+
+class IncDec:
+    __slots__ = ('name', 'delta', 'line', 'ref')
+
+    def __init__(self, name, delta, line, ref=None):
+        self.name = name
+        self.delta = delta
+        self.line = line
+        self.ref = ref
+
+
+class CallStatement:
+    __slots__ = ('name', 'args', 'line', 'ref')
+
+    def __init__(self, name, args, line, ref=None):
+        self.name = name
+        self.args = args
+        self.line = line
+        self.ref = ref
+
+
+class Serve:
+    __slots__ = ('parts', 'line')
+
+    def __init__(self, parts, line):
+        self.parts = parts
+        self.line = line
+
+
+class Make:
+    __slots__ = ('name', 'line', 'ref')
+
+    def __init__(self, name, line, ref=None):
+        self.name = name
+        self.line = line
+        self.ref = ref
+
+
+class If:
+    __slots__ = ('branches', 'orelse', 'scopes')
+
+    def __init__(self, branches, orelse, scopes=None):
+        self.branches = branches  # tuple of (condition, body)
+        self.orelse = orelse      # body of "mix", or None
+        self.scopes = scopes      # slot range of each branch body, then of "mix"
+
+
+class Flip:
+    __slots__ = ('name', 'cases', 'default', 'ref')
+
+    def __init__(self, name, cases, default, ref=None):
+        self.name = name
+        self.cases = cases      # tuple of (is_pinch, raw_literal, body)
+        self.default = default  # body of "default", or None
+        self.ref = ref
+
+
+class For:
+    __slots__ = ('declare', 'name', 'init_name', 'init_value', 'condition', 'body', 'step', 'line',
+                 'ref', 'init_ref', 'step_ref', 'scope')
+
+    def __init__(self, declare, name, init_name, init_value, condition, body, step, line,
+                 ref=None, init_ref=None, step_ref=None, scope=None):
+        self.declare = declare        # "pinch" when the loop declares its variable
+        self.name = name
+        self.init_name = init_name    # set when initialised from another identifier
+        self.init_value = init_value
+        self.condition = condition
+        self.body = body
+        self.step = step              # (name, delta), or None for a prefix step
+        self.line = line
+        self.ref = ref
+        self.init_ref = init_ref
+        self.step_ref = step_ref
+        self.scope = scope
+
+
+class While:
+    __slots__ = ('condition', 'body', 'line', 'scope')
+
+    def __init__(self, condition, body, line, scope=None):
+        self.condition = condition
+        self.body = body
+        self.line = line
+        self.scope = scope
+
+
+class DoWhile:
+    __slots__ = ('body', 'condition', 'line', 'scope')
+
+    def __init__(self, body, condition, line, scope=None):
+        self.body = body
+        self.condition = condition
+        self.line = line
+        self.scope = scope
+
+
+# Serve parts: each one produces text, or None to abandon the serve
+
+class ServeText:
+    __slots__ = ('text',)
+
+    def __init__(self, text):
+        self.text = text
+
+
+class ServeVar:
+    __slots__ = ('name', 'checked', 'line', 'ref')
+
+    def __init__(self, name, checked, line, ref=None):
+        self.name = name
+        self.checked = checked  # False for a bare "len" at the start of a serve
+        self.line = line
+        self.ref = ref
+
+
+class ServeIndex:
+    __slots__ = ('name', 'index', 'line', 'ref')
+
+    def __init__(self, name, index, line, ref=None):
+        self.name = name
+        self.index = index
+        self.line = line
+        self.ref = ref
+
+
+class ServeCall:
+    __slots__ = ('name', 'args', 'args_line', 'line', 'ref')
+
+    def __init__(self, name, args, args_line, line, ref=None):
+        self.name = name
+        self.args = args
+        self.args_line = args_line
+        self.line = line
+        self.ref = ref
+
+
+class ServeLen:
+    __slots__ = ('argument', 'error', 'line')
+
+    def __init__(self, argument, error, line):
+        self.argument = argument
+        self.error = error  # (code, message, identifier) when the call is malformed
+        self.line = line
+
+
+# Expressions
+
+class Const:
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class Var:
+    __slots__ = ('name', 'line', 'ref')
+
+    def __init__(self, name, line, ref=None):
+        self.name = name
+        self.line = line
+        self.ref = ref
+
+
+class Index:
+    __slots__ = ('name', 'index', 'line', 'ref')
+
+    def __init__(self, name, index, line, ref=None):
+        self.name = name
+        self.index = index
+        self.line = line
+        self.ref = ref
+
+
+class Call:
+    __slots__ = ('name', 'args', 'line', 'ref')
+
+    def __init__(self, name, args, line, ref=None):
+        self.name = name
+        self.args = args
+        self.line = line
+        self.ref = ref
+
+
+class Len:
+    """len(x), or the error reported for a malformed use of "len"."""
+    __slots__ = ('argument', 'error', 'line')
+
+    def __init__(self, argument, error, line):
+        self.argument = argument
+        self.error = error
+        self.line = line
+
+
+class Arith:
+    """Left-to-right chain of + - * / % over arithmetic operands."""
+    __slots__ = ('first', 'rest', 'sites')
+
+    def __init__(self, first, rest):
+        self.first = first
+        self.rest = rest  # tuple of (operator, operand)
+        self.sites = None  # Operators.operator_site() of each operator, made by the Interpreter running it
+
+
+class ExprChain:
+    """Operator chain of a return expression; stops at the first None operand."""
+    __slots__ = ('first', 'rest', 'sites')
+
+    def __init__(self, first, rest):
+        self.first = first
+        self.rest = rest
+        self.sites = None
+
+
+class Or:
+    __slots__ = ('first', 'rest')
+
+    def __init__(self, first, rest):
+        self.first = first
+        self.rest = rest
+
+
+class And:
+    __slots__ = ('left', 'right')
+
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+
+
+class Compare:
+    __slots__ = ('left', 'op', 'right', 'func')
+
+    def __init__(self, left, op, right):
+        self.left = left
+        self.op = op
+        self.right = right
+        self.func = _COMPARISONS[op]
+
+
+class Fail:
+    """Raises the exception the tree walker runs into at this point."""
+    __slots__ = ('exc_type', 'message')
+
+    def __init__(self, exc_type, message):
+        self.exc_type = exc_type
+        self.message = message
+
+
+#---------------------------------------------------------------------
+# Lowering
+#---------------------------------------------------------------------
+def lower(parse_tree):
+    """Lowers a <program> parse tree into a Program."""
+    node = parse_tree
+    # The parser's root wraps the expanded <program> node
+    while len(node.children) == 1:
+        node = node.children[0]
+    children = node.children
+    global_decls = []
+    global_dec = children[1]
+    if global_dec.children:
+        global_decls.append(lower_declaration(global_dec.children[0]))
+    return Program(
+        global_decls,
+        lower_functions(children[2]),
+        lower_local_decs(children[9]),
+        lower_block(children[10]),
+        children[12].value,
+        children[11].line_number,
+    )
+
+
+def lower_functions(node):
+    functions = []
+    while node.children:
+        children = node.children
+        if children[0].value == "full":
+            return_type = children[1].children[0].value
+            name = children[2].value
+            params = lower_parameters(children[4])
+            parts = [lower_local_decs(children[7]), lower_block(children[8]),
+                     lower_expression(children[9].children[1])]
+            node = children[12]
+        else:
+            return_type = "void"
+            name = children[1].value
+            params = lower_parameters(children[3])
+            parts = [lower_local_decs(children[6]), lower_block(children[7])]
+            node = children[9]
+        functions.append(FunctionDef(name, return_type, params, parts))
+    return functions
+
+
+def lower_parameters(node):
+    params = []
+    while node.children:
+        children = node.children
+        if children[0].value == ',':
+            params.append((children[1].children[0].value, children[2].value))
+            node = children[3]
+        else:
+            params.append((children[0].children[0].value, children[1].value))
+            node = children[2]
+    return tuple(params)
+
+
+def lower_arguments(node):
+    args = []
+    while node.children:
+        children = node.children
+        if children[0].value == ',':
+            args.append(lower_arith(children[1]))
+            node = children[2]
+        else:
+            args.append(lower_arith(children[0]))
+            node = children[1]
+    return tuple(args)
+
+
+def _has_comma(node):
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        if node.node_type == ',':
+            return True
+        pending.extend(node.children)
+    return False
+
+
+# Declarations
+
+def lower_local_decs(node):
+    decls = []
+    while node.children:
+        decls.append(lower_declaration(node.children[0]))
+        node = node.children[1]
+    return decls
+
+
+def lower_declaration(node):
+    if node.children[0].value == 'recipe':
+        return lower_array_declaration(node)
+    return lower_var_declaration(node)
+
+
+def _literal_value(node):
+    """Value of a <literals> node as read by declarations."""
+    literal = node.children[0]
+    node_type = literal.node_type
+    try:
+        if node_type == "pinchliterals":
+            return int(literal.value.replace("~", "-"))
+        if node_type == "skimliterals":
+            return float(literal.value.replace("~", "-"))
+    except ValueError:
+        return None
+    if node_type == "pastaliterals":
+        return literal.value.strip('"')
+    return literal.children[0].node_type == "yum"
+
+
+def _literal_type(node):
+    node_type = node.children[0].node_type
+    if node_type.endswith("literals"):
+        return node_type[:-len("literals")]
+    return "bool"
+
+
+def _init_item(name, var_type, literal_node, line):
+    expr_type = _literal_type(literal_node)
+    type_error = None
+    if expr_type != var_type:
+        literal_type = expr_type + "literals" if expr_type in ["pinch", "skim", "pasta"] else expr_type
+        target_literal_type = var_type + "literals" if var_type in ["pinch", "skim", "pasta"] else var_type
+        type_error = ("TYPE_MISMATCH",
+                      f"Type mismatch in initialization of '{name}': cannot assign '{literal_type}' to '{target_literal_type}'",
+                      line, name)
+    return (name, True, _literal_value(literal_node), type_error)
+
+
+def lower_var_declaration(node):
+    var_type = node.children[0].children[0].value
+    id_node = node.children[1]
+    line = id_node.line_number
+    items = []
+    name = id_node.value
+    dec_or_init = node.children[2]
+    while True:
+        if dec_or_init.children and dec_or_init.children[0].value == "=":
+            items.append(_init_item(name, var_type, dec_or_init.children[1], line))
+            next_dec = dec_or_init.children[2]
+        else:
+            items.append((name, False, None, None))
+            next_dec = dec_or_init.children[0] if dec_or_init.children else dec_or_init
+        if not next_dec.children:
+            break
+        name = next_dec.children[1].value
+        dec_or_init = next_dec.children[2]
+    return VarDecl(var_type, tuple(items))
+
+
+def lower_array_declaration(node):
+    children = node.children
+    var_type = children[1].children[0].value
+    id_node = children[2]
+    name = id_node.value
+    line = id_node.line_number
+    errors = []
+    try:
+        dimension = int(children[4].value)
+    except ValueError:
+        dimension = None
+        errors.append(("INVALID_ARRAY_SIZE", f"Invalid array size for '{name}'", line, name))
+    attributes = {'dimensions': dimension, 'element_type': var_type}
+    values = []
+    declared = True
+    try:
+        elements = children[6]
+        literal = elements.children[2].children[0]
+        if not set(var_type).issubset(literal.node_type):
+            errors.append(("TYPE_MISMATCH", f"Expected value '{var_type}' received value '{literal.node_type}'", line, name))
+        values.append(literal.value)
+        tail = elements.children[3]
+        while tail.children:
+            literal = tail.children[1].children[0]
+            if not set(var_type).issubset(literal.node_type):
+                errors.append(("TYPE_MISMATCH", f"Expected value '{var_type}' received value '{literal.node_type}'", line, name))
+                break
+            values.append(literal.value)
+            tail = tail.children[2]
+        count = len(values)
+        if count < dimension and count != 0:
+            errors.append(("MISSING_ELEMENTS", f"Expected element count '{dimension}' received count '{count}'", line, name))
+        if count > dimension:
+            errors.append(("TOO_MUCH_ELEMENTS", f"Expected element count '{dimension}' received count '{count}'", line, name))
+    except Exception as e:
+        errors.append(("INVALID_ARRAY_DECLARATION", f"Invalid array declaration: {str(e)}", line, name))
+        declared = False
+    return ArrayDecl(name, attributes, recipe_storage(var_type, values), tuple(errors), declared)
+
+
+# Statements
+
+def lower_block(node):
+    statements = []
+    while node.children:
+        statement = lower_statement(node.children[0])
+        if statement is not None:
+            statements.append(statement)
+        node = node.children[1]
+    return statements
+
+
+def lower_statement(node):
+    children = node.children
+    first = children[0]
+    node_type = first.node_type
+    if node_type == "id":
+        tail = children[1].children
+        if tail[0].value == "(":
+            return CallStatement(first.value, lower_arguments(tail[1]), tail[1].line_number)
+        if tail[0].value == "<assignment_operator>":
+            condition = tail[1]
+            return Assign(first.value, tail[0].children[0].value, lower_condition(condition), condition.line_number)
+        if tail[0].value == "<unary_op>":
+            return IncDec(first.value, 1 if tail[0].children[0].value == "++" else -1, node.line_number)
+        return ElementAssign(first.value, lower_arith(tail[1].children[0]), tail[3].children[0].value,
+                             lower_arith(tail[4]), node.line_number)
+    if node_type == "<unary_op>":
+        return IncDec(children[1].value, 1 if first.children[0].value == "++" else -1, node.line_number)
+    if node_type == "<conditional_statement>":
+        return lower_conditional(first)
+    if node_type == "<looping_statement>":
+        return lower_loop(first)
+    if node_type == "serve":
+        return lower_serve(node)
+    return Make(children[2].value, first.line_number)
+
+
+def lower_conditional(node):
+    children = node.children
+    if children[0].node_type == "taste":
+        branches = [(lower_condition(children[2]), lower_block(children[5]))]
+        orelse = None
+        tail = children[7]
+        while tail.children:
+            if tail.children[0].node_type == "elif":
+                branches.append((lower_condition(tail.children[2]), lower_block(tail.children[5])))
+                tail = tail.children[7]
+            else:
+                orelse = lower_block(tail.children[2])
+                break
+        return If(tuple(branches), orelse)
+
+    literal = children[6].children[0]
+    cases = [(literal.node_type == 'pinchliterals', literal.value, lower_block(children[8]))]
+    default = None
+    tail = children[11]
+    while tail.children:
+        if tail.children[0].node_type == "case":
+            literal = tail.children[1].children[0]
+            cases.append((literal.node_type == 'pinchliterals', literal.value, lower_block(tail.children[3])))
+            tail = tail.children[6]
+        else:
+            default = lower_block(tail.children[2])
+            break
+    return Flip(children[2].value, tuple(cases), default)
+
+
+def lower_loop(node):
+    children = node.children
+    keyword = children[0].node_type
+    if keyword == "simmer":
+        return While(lower_condition(children[2]), lower_block(children[5]), node.line_number)
+    if keyword == "keepmix":
+        return DoWhile(lower_block(children[2]), lower_condition(children[6]), node.line_number)
+
+    init = children[5].children[0]
+    init_name, init_value = None, None
+    if init.node_type == "id":
+        init_name = init.value
+    else:
+        try:
+            init_value = int(init.value.replace("~", "-"))
+        except ValueError:
+            pass
+    step = children[9].children
+    if step[0].node_type == "id":
+        step = (step[0].value, 1 if step[1].children[0].value == "++" else -1)
+    else:
+        step = None
+    declare = children[2].children[0].value if children[2].children else None
+    return For(declare, children[3].value, init_name, init_value,
+               lower_condition(children[7]), lower_block(children[12]), step, node.line_number)
+
+
+def lower_serve(node):
+    line = node.children[0].line_number
+    parts = []
+    _lower_serve_value(node.children[2], parts, line, first=True)
+    tail = node.children[3]
+    while tail.children:
+        _lower_serve_value(tail.children[1], parts, line, first=False)
+        tail = tail.children[2]
+    return Serve(tuple(parts), line)
+
+
+def _lower_serve_value(node, parts, line, first):
+    value = node.children[0]
+    if value.node_type != "id":
+        literal = value.children[0]
+        if literal.node_type == "pastaliterals":
+            parts.append(ServeText(literal.value.strip('"')))
+        return
+    name = value.value
+    tail = node.children[1].children
+    if not tail:
+        parts.append(ServeVar(name, not (first and name == "len"), line))
+    elif first and name == "len":
+        argument, error = _lower_len(tail)
+        parts.append(ServeLen(argument, error, line))
+    elif tail[0].value == "[":
+        parts.append(ServeIndex(name, lower_arith(tail[1].children[0]), line))
+    else:
+        parts.append(ServeCall(name, lower_arguments(tail[1]), tail[1].line_number, line))
+
+
+# Conditions
+
+def lower_condition(node):
+    logical_or = node.children[0]
+    first = lower_and(logical_or.children[0])
+    rest = []
+    tail = logical_or.children[1]
+    while tail.children:
+        rest.append(lower_and(tail.children[1]))
+        tail = tail.children[2]
+    if not rest:
+        return first
+    # A true constant decides the result before any other operand is evaluated
+    if isinstance(first, Const) and first.value:
+        return first
+    if isinstance(first, Const) and all(isinstance(operand, Const) for operand in rest):
+        value = first.value
+        for operand in rest:
+            value = value or operand.value
+        return Const(value)
+    return Or(first, tuple(rest))
+
+
+def lower_and(node):
+    """"a && b && c" as And(And(a, b), c), which stops at the first false operand."""
+    left = lower_equality(node.children[0])
+    tail = node.children[1]
+    while tail.children:
+        # A false constant decides the result before any other operand is evaluated
+        if isinstance(left, Const) and not left.value:
+            return left
+        right = lower_equality(tail.children[1])
+        if isinstance(left, Const) and isinstance(right, Const):
+            left = Const(left.value and right.value)
+        else:
+            left = And(left, right)
+        tail = tail.children[2]
+    return left
+
+
+def lower_equality(node):
+    left = lower_relational(node.children[0])
+    tail = node.children[1]
+    if tail.children:
+        return fold_compare(left, tail.children[0].value, lower_relational(tail.children[1]))
+    return left
+
+
+def lower_relational(node):
+    first = node.children[0].children[0]
+    if first.value in ("!", "!!"):
+        return Fail(IndexError, _INDEX_ERROR)
+    left = _lower_primary_operand(first)
+    tail = node.children[1]
+    if tail.children:
+        return fold_compare(left, tail.children[0].value, lower_primary(tail.children[1]))
+    return left
+
+
+def lower_primary(node):
+    first = node.children[0]
+    if first.value in ("!", "!!"):
+        return lower_condition(node.children[2])
+    return _lower_primary_operand(first)
+
+
+def _lower_primary_operand(first):
+    if first.value == "yum":
+        return Const(True)
+    if first.value == "bleh":
+        return Const(False)
+    return lower_arith(first)
+
+
+# Expressions
+
+def lower_arith(node):
+    first = lower_term(node.children[0])
+    rest = []
+    tail = node.children[1]
+    while tail.children:
+        rest.append((tail.children[0].children[0].value, lower_term(tail.children[1])))
+        tail = tail.children[2]
+    return fold_arith(first, rest)
+
+
+def lower_term(node):
+    first = lower_factor(node.children[0])
+    rest = []
+    tail = node.children[1]
+    while tail.children:
+        rest.append((tail.children[0].children[0].value, lower_factor(tail.children[1])))
+        tail = tail.children[2]
+    return fold_arith(first, rest)
+
+
+def lower_factor(node):
+    if node.children[0].value == "(":
+        return lower_arith(node.children[1])
+    return lower_value(node.children[0])
+
+
+def lower_value(node):
+    """Lowers <value>, <value2> and <value3>."""
+    first = node.children[0]
+    line = node.line_number
+    if first.node_type != "id":
+        return Const(_expression_literal(first.children[0]))
+    name = first.value
+    tail = node.children[1].children
+    if not tail:
+        return Var(name, line)
+    if name == "len":
+        argument, error = _lower_len(tail)
+        return Len(argument, error, line)
+    if tail[0].value == "(":
+        return Call(name, lower_arguments(tail[1]), line)
+    return Index(name, lower_arith(tail[1].children[0]), line)
+
+
+def _lower_len(tail):
+    """Argument of len(...), or the error the tree walker reports for it."""
+    if tail[0].value == "[":
+        return None, ("NOT_A_RECIPE", "Identifier [len] is a function!", "len")
+    if not tail[1].children:
+        return None, ("MISSING_ARGUMENTS", "Doesn't meet the required number of arguments for [len]!", None)
+    if _has_comma(tail[1]):
+        return None, ("TOO_MANY_ARGUMENTS", "Too many arguments provided to function call [len]!", None)
+    return lower_arith(tail[1].children[0]), None
+
+
+def _expression_literal(literal):
+    """Value of a literal inside an expression; "~" is not read as a sign here."""
+    node_type = literal.node_type
+    try:
+        if node_type == "pinchliterals":
+            return int(literal.value)
+        if node_type == "skimliterals":
+            return float(literal.value)
+    except ValueError:
+        return None
+    if node_type == "pastaliterals":
+        return literal.value.strip('"')
+    return None
+
+
+def lower_expression(node):
+    """Lowers the <expression> of a return statement."""
+    first = lower_operand(node.children[0])
+    rest = []
+    tail = node.children[1]
+    while tail.children:
+        rest.append((tail.children[0].children[0].value, lower_operand(tail.children[1])))
+        tail = tail.children[2]
+    if not rest:
+        return first
+    return fold_expr_chain(first, rest)
+
+
+def lower_operand(node):
+    first = node.children[0]
+    if first.value == "(":
+        return lower_expression(node.children[1])
+    if first.value in ("!", "!!"):
+        return Const(None)
+    return lower_value(first)
+
+
+# Constant folding
+
+def _fold_operation(op, left, right):
+    """left op right for two numbers, computed as SemanticAnalyzer._apply_operator does."""
+    if type(left) not in (int, float) or type(right) not in (int, float):
+        return _NOT_FOLDED
+    if op in ("/", "%") and right == 0:
+        return _NOT_FOLDED
+    try:
+        if op == "+":
+            return left + right
+        if op == "-":
+            return left - right
+        if op == "*":
+            return left * right
+        if op == "/":
+            return left // right if type(left) is int and type(right) is int else left / right
+        if op == "%":
+            return left % right
+    except OverflowError:
+        pass
+    return _NOT_FOLDED
+
+
+def fold_arith(first, rest):
+    """Arith over first and rest, with its leading run of constant operations folded."""
+    position = 0
+    if isinstance(first, Const):
+        while position < len(rest) and isinstance(rest[position][1], Const):
+            op, operand = rest[position]
+            value = _fold_operation(op, first.value, operand.value)
+            if value is _NOT_FOLDED:
+                break
+            first = Const(value)
+            position += 1
+    rest = tuple(rest[position:])
+    return Arith(first, rest) if rest else first
+
+
+def fold_expr_chain(first, rest):
+    """ExprChain over first and rest, or a Const when every operand is a constant."""
+    if not isinstance(first, Const) or not all(isinstance(operand, Const) for _, operand in rest):
+        return ExprChain(first, tuple(rest))
+    value = first.value
+    for op, operand in rest:
+        # Interpreter.eval_expr_chain stops at the first None
+        if value is None or operand.value is None:
+            break
+        value = _fold_operation(op, value, operand.value)
+        if value is _NOT_FOLDED:
+            return ExprChain(first, tuple(rest))
+    return Const(value)
+
+
+def fold_compare(left, op, right):
+    """Compare of left and right, or a Const when both are constants that compare."""
+    node = Compare(left, op, right)
+    if isinstance(left, Const) and isinstance(right, Const):
+        try:
+            return Const(node.func(left.value, right.value))
+        except TypeError:
+            pass
+    return node
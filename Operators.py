@@ -0,0 +1,65 @@
+"""
+Type-specialized arithmetic for the operators of + - * / %.
+
+SemanticAnalyzer._apply_operator is the generic path: it checks the operand
+types, reports invalid operands and picks the operation by comparing the
+operator text.  For the operand types programs mostly use (int with int,
+float or int with float, and str + str) the result only depends on the
+operator and the two types, so FAST_OPERATIONS maps (operator, left type,
+right type) straight to the function that computes it.  Division and modulo
+by zero give None, as _apply_operator does, and "/" on two ints is integer
+division.
+
+operator_site() gives each place an operator is used a callable of its own.
+Its first call with types that have a fast operation specializes it to those
+types; later calls run that operation while a guard finds the same types,
+and go to the generic path when it does not.
+"""
+import operator
+
+
+def _divide_ints(left, right):
+    return left // right if right else None
+
+
+def _divide(left, right):
+    return left / right if right else None
+
+
+def _modulo(left, right):
+    return left % right if right else None
+
+
+# (operator, left type, right type) -> operation; bool is left to the generic path
+FAST_OPERATIONS = {("+", str, str): operator.add}
+for _left, _right in ((int, int), (float, float), (int, float), (float, int)):
+    FAST_OPERATIONS.update({
+        ("+", _left, _right): operator.add,
+        ("-", _left, _right): operator.sub,
+        ("*", _left, _right): operator.mul,
+        ("/", _left, _right): _divide_ints if _left is int and _right is int else _divide,
+        ("%", _left, _right): _modulo,
+    })
+del _left, _right
+
+
+def operator_site(op, generic):
+    """
+    A callable computing left op right for one use of op.  generic is the
+    path for types with no fast operation; it is called as generic(op, left,
+    right).
+    """
+    left_type = right_type = fast = None
+
+    def apply(left, right):
+        nonlocal left_type, right_type, fast
+        if left.__class__ is left_type and right.__class__ is right_type:
+            return fast(left, right)
+        if fast is None:
+            fast = FAST_OPERATIONS.get((op, left.__class__, right.__class__))
+            if fast is not None:
+                left_type, right_type = left.__class__, right.__class__
+                return fast(left, right)
+        return generic(op, left, right)
+
+    return apply
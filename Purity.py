@@ -0,0 +1,235 @@
+"""
+Purity analysis of the functions in a Program bound by Resolver.resolve(),
+and the memo that caches the results of pure full functions.
+
+A function is pure when a call can do nothing but compute its return value:
+- it has no serve or make;
+- every name it reads or writes is in its own frame, so it neither reads
+  nor writes the program scope;
+- every function it calls is pure as well.
+
+The return value of a pure full function then depends only on its arguments.
+Errors its body reports, such as invalid operands, are part of what a call
+does, so the memo keeps them with the value and a cached call reports them
+again.
+"""
+from collections import OrderedDict
+
+import Lowering
+
+# Entries each pure function keeps before the least recently used is dropped
+MEMO_SIZE = 4096
+
+# Argument and return values a memo entry may hold; recipes are mutable lists
+_SCALARS = (int, float, str, bool, type(None))
+
+
+class _Impure(Exception):
+    """Raised by PurityChecker as soon as a function is known to be impure."""
+
+
+class PurityChecker:
+    def __init__(self, function_slots):
+        self.function_slots = function_slots  # (depth, slot) of each function -> name
+        self.callees = set()
+        self.statements = {
+            Lowering.VarDecl: self.check_nothing,
+            Lowering.ArrayDecl: self.check_nothing,
+            Lowering.Assign: self.check_assign,
+            Lowering.ElementAssign: self.check_element_assign,
+            Lowering.IncDec: self.check_named,
+            Lowering.CallStatement: self.check_call,
+            Lowering.Serve: self.impure,
+            Lowering.Make: self.impure,
+            Lowering.If: self.check_if,
+            Lowering.Flip: self.check_flip,
+            Lowering.For: self.check_for,
+            Lowering.While: self.check_loop,
+            Lowering.DoWhile: self.check_loop,
+        }
+        self.expressions = {
+            Lowering.Const: self.check_nothing,
+            Lowering.Var: self.check_named,
+            Lowering.Index: self.check_index,
+            Lowering.Call: self.check_call,
+            Lowering.Len: self.check_len,
+            Lowering.Arith: self.check_operands,
+            Lowering.ExprChain: self.check_operands,
+            Lowering.Or: self.check_or,
+            Lowering.And: self.check_pair,
+            Lowering.Compare: self.check_pair,
+            Lowering.Fail: self.check_nothing,
+        }
+
+    def function(self, function):
+        """The names of the functions a pure function calls, or None when it is impure."""
+        self.callees = set()
+        try:
+            self.block(function.parts[0])
+            self.block(function.parts[1])
+            for return_expr in function.parts[2:]:
+                self.expression(return_expr)
+        except _Impure:
+            return None
+        return self.callees
+
+    def block(self, statements):
+        handlers = self.statements
+        for statement in statements:
+            handlers[statement.__class__](statement)
+
+    def expression(self, node):
+        self.expressions[node.__class__](node)
+
+    def local(self, ref):
+        # Depth 0 is the program scope
+        for depth, _ in ref:
+            if depth == 0:
+                raise _Impure
+
+    #-----------------------------------------------------------------
+    # Statements
+    #-----------------------------------------------------------------
+    def check_nothing(self, node):
+        pass
+
+    def impure(self, node):
+        raise _Impure
+
+    def check_assign(self, node):
+        self.local(node.ref)
+        self.expression(node.value)
+
+    def check_element_assign(self, node):
+        # A recipe parameter shares the caller's storage, but its calls are never cached
+        self.local(node.ref)
+        self.expression(node.index)
+        self.expression(node.value)
+
+    def check_named(self, node):
+        self.local(node.ref)
+
+    def check_call(self, node):
+        # Only a call that always reaches a function can be pure
+        name = self.function_slots.get(node.ref[0]) if len(node.ref) == 1 else None
+        if name is None:
+            raise _Impure
+        self.callees.add(name)
+        for arg in node.args:
+            self.expression(arg)
+
+    def check_if(self, node):
+        for condition, body in node.branches:
+            self.expression(condition)
+            self.block(body)
+        if node.orelse is not None:
+            self.block(node.orelse)
+
+    def check_flip(self, node):
+        self.local(node.ref)
+        for _, _, body in node.cases:
+            self.block(body)
+        if node.default is not None:
+            self.block(node.default)
+
+    def check_for(self, node):
+        self.local(node.ref)
+        if node.init_name is not None:
+            self.local(node.init_ref)
+        if node.step is not None:
+            self.local(node.step_ref)
+        self.expression(node.condition)
+        self.block(node.body)
+
+    def check_loop(self, node):
+        self.expression(node.condition)
+        self.block(node.body)
+
+    #-----------------------------------------------------------------
+    # Expressions
+    #-----------------------------------------------------------------
+    def check_index(self, node):
+        self.local(node.ref)
+        self.expression(node.index)
+
+    def check_len(self, node):
+        if node.argument is not None:
+            self.expression(node.argument)
+
+    def check_operands(self, node):
+        self.expression(node.first)
+        for _, operand in node.rest:
+            self.expression(operand)
+
+    def check_or(self, node):
+        self.expression(node.first)
+        for operand in node.rest:
+            self.expression(operand)
+
+    def check_pair(self, node):
+        self.expression(node.left)
+        self.expression(node.right)
+
+
+def pure_functions(program):
+    """The names of the pure functions of a resolved Program."""
+    checker = PurityChecker({function.slot: function.name for function in program.functions})
+    callees = {}
+    for function in program.functions:
+        calls = checker.function(function)
+        if calls is not None:
+            callees[function.name] = calls
+    # Drop the functions that call an impure one until none is left to drop
+    changed = True
+    while changed:
+        changed = False
+        for name, calls in list(callees.items()):
+            if not calls <= callees.keys():
+                del callees[name]
+                changed = True
+    return set(callees)
+
+
+class FunctionMemo:
+    """
+    Results of one pure function, keyed by its arguments, with at most
+    maxsize entries; the least recently used entry is dropped first.
+    """
+
+    def __init__(self, maxsize=MEMO_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(parameters):
+        """A key for the values of the bound parameter symbols, or None when one cannot be cached."""
+        key = []
+        for symbol in parameters:
+            # An unbound parameter may be read from the program scope
+            if symbol is None:
+                return None
+            value = symbol.value
+            if value.__class__ not in _SCALARS:
+                return None
+            # 1, 1.0 and True are equal but not interchangeable
+            key.append((value.__class__, value))
+        return tuple(key)
+
+    def get(self, key):
+        """The (value, errors) stored for key, or None."""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry
+
+    def store(self, key, value, errors):
+        if value.__class__ not in _SCALARS:
+            return
+        self.entries[key] = (value, tuple(errors))
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
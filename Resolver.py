@@ -0,0 +1,285 @@
+"""
+Binding of the names in a lowered Program to frame slots.
+
+The engines that run the lowered AST keep symbols in plain lists rather than
+SymbolTable chains.  Frame 0 is the program scope, which holds the global
+declaration, the functions, the declarations of dish() and the names that
+dish() assigns at its top level.  Frame 1 belongs to the function being run,
+or to dish() itself.  It has a slot for every parameter, local declaration and
+assigned name of that function, and for those of each loop and taste block
+inside it.
+
+resolve() visits every use of a name once and stores a ref on the node.  A
+ref is a tuple of the (depth, slot) pairs the symbol may be found in,
+innermost first, ending at the first scope that always declares the name.
+Only a name created by an assignment, or a parameter left unbound by a short
+argument list, can be missing at run time.  As a result most refs are a single
+pair.  The slots a block owns are contiguous and are cleared each time the
+block is entered, so every entry starts with a fresh scope.
+
+Scoping is lexical: a function sees its own frame and the program scope, not
+the locals of whoever called it.  Arguments are evaluated in the caller's
+scope before the callee's frame exists.
+
+Once every name is bound, each FunctionDef is marked pure or not (Purity.py).
+"""
+import Lowering
+from Purity import pure_functions
+
+
+class _Frame:
+    """Allocates the slots of one frame layout."""
+    __slots__ = ('size',)
+
+    def __init__(self):
+        self.size = 0
+
+    def allocate(self):
+        self.size += 1
+        return self.size - 1
+
+
+class Scope:
+    __slots__ = ('depth', 'parent', 'frame', 'slots', 'declared')
+
+    def __init__(self, depth, parent, frame):
+        self.depth = depth
+        self.parent = parent
+        self.frame = frame
+        self.slots = {}        # name -> slot in frame
+        self.declared = set()  # names that exist before any statement of the scope runs
+
+    def add(self, name, declared=False):
+        slot = self.slots.get(name)
+        if slot is None:
+            slot = self.slots[name] = self.frame.allocate()
+        if declared:
+            self.declared.add(name)
+        return self.depth, slot
+
+    def is_declared(self, name):
+        scope = self
+        while scope is not None:
+            if name in scope.declared:
+                return True
+            scope = scope.parent
+        return False
+
+    def ref(self, name):
+        ref = []
+        scope = self
+        while scope is not None:
+            slot = scope.slots.get(name)
+            if slot is not None:
+                ref.append((scope.depth, slot))
+                if name in scope.declared:
+                    break
+            scope = scope.parent
+        return tuple(ref)
+
+
+class Resolver:
+    def __init__(self):
+        self.frame = None  # frame layout of the function or dish() being resolved
+        self.statements = {
+            Lowering.Assign: self.resolve_assign,
+            Lowering.ElementAssign: self.resolve_element_assign,
+            Lowering.IncDec: self.resolve_named,
+            Lowering.CallStatement: self.resolve_call,
+            Lowering.Serve: self.resolve_serve,
+            Lowering.Make: self.resolve_named,
+            Lowering.If: self.resolve_if,
+            Lowering.Flip: self.resolve_flip,
+            Lowering.For: self.resolve_for,
+            Lowering.While: self.resolve_loop,
+            Lowering.DoWhile: self.resolve_loop,
+        }
+        self.expressions = {
+            Lowering.Const: self.resolve_nothing,
+            Lowering.Var: self.resolve_named,
+            Lowering.Index: self.resolve_index,
+            Lowering.Call: self.resolve_call,
+            Lowering.Len: self.resolve_len,
+            Lowering.Arith: self.resolve_operands,
+            Lowering.ExprChain: self.resolve_operands,
+            Lowering.Or: self.resolve_or,
+            Lowering.And: self.resolve_pair,
+            Lowering.Compare: self.resolve_pair,
+            Lowering.Fail: self.resolve_nothing,
+        }
+
+    def program(self, program):
+        program_frame = _Frame()
+        scope = Scope(0, None, program_frame)
+        self.declare(program.global_decls, scope)
+        for function in program.functions:
+            function.slot = scope.add(function.name, declared=True)
+        self.declare(program.local_decls, scope)
+        self.add_assigned(program.body, scope)
+
+        for function in program.functions:
+            self.function(function, scope)
+        self.frame = _Frame()
+        self.block(program.body, scope)
+        program.size = program_frame.size
+        program.dish_size = self.frame.size
+        pure = pure_functions(program)
+        for function in program.functions:
+            function.pure = function.name in pure
+        return program
+
+    def function(self, function, program_scope):
+        self.frame = _Frame()
+        scope = Scope(1, program_scope, self.frame)
+        # A short argument list leaves parameters unbound, so they are not declared
+        function.param_slots = tuple(scope.add(name)[1] for _, name in function.params)
+        local_decls, body = function.parts[:2]
+        self.declare(local_decls, scope)
+        self.add_assigned(body, scope)
+        self.block(body, scope)
+        for return_expr in function.parts[2:]:
+            self.expression(return_expr, scope)
+        function.size = self.frame.size
+
+    def declare(self, decls, scope):
+        for decl in decls:
+            if isinstance(decl, Lowering.VarDecl):
+                decl.slots = tuple(scope.add(item[0], declared=True) for item in decl.items)
+            elif decl.declared:
+                decl.slot = scope.add(decl.name, declared=True)
+
+    def add_assigned(self, statements, scope):
+        """Gives scope a slot for each name its assignments may create; flip cases share the scope."""
+        for statement in statements:
+            if isinstance(statement, Lowering.Assign):
+                if not scope.is_declared(statement.name):
+                    scope.add(statement.name)
+            elif isinstance(statement, Lowering.Flip):
+                for _, _, body in statement.cases:
+                    self.add_assigned(body, scope)
+                if statement.default is not None:
+                    self.add_assigned(statement.default, scope)
+
+    def open_block(self, statements, parent, loop_name=None):
+        """Returns the scope of a loop or taste block and the range of slots it owns."""
+        scope = Scope(1, parent, self.frame)
+        start = self.frame.size
+        if loop_name is not None:
+            scope.add(loop_name, declared=True)
+        self.add_assigned(statements, scope)
+        stop = self.frame.size
+        return scope, (start, stop) if stop > start else None
+
+    def block(self, statements, scope):
+        handlers = self.statements
+        for statement in statements:
+            handlers[statement.__class__](statement, scope)
+
+    def expression(self, node, scope):
+        self.expressions[node.__class__](node, scope)
+
+    #-----------------------------------------------------------------
+    # Statements
+    #-----------------------------------------------------------------
+    def resolve_assign(self, node, scope):
+        node.ref = scope.ref(node.name)
+        if node.name in scope.slots:
+            node.slot = (scope.depth, scope.slots[node.name])
+        self.expression(node.value, scope)
+
+    def resolve_element_assign(self, node, scope):
+        node.ref = scope.ref(node.name)
+        self.expression(node.index, scope)
+        self.expression(node.value, scope)
+
+    def resolve_named(self, node, scope):
+        node.ref = scope.ref(node.name)
+
+    def resolve_call(self, node, scope):
+        node.ref = scope.ref(node.name)
+        for arg in node.args:
+            self.expression(arg, scope)
+
+    def resolve_serve(self, node, scope):
+        for part in node.parts:
+            if isinstance(part, Lowering.ServeLen):
+                if part.argument is not None:
+                    self.expression(part.argument, scope)
+                continue
+            if isinstance(part, Lowering.ServeText):
+                continue
+            part.ref = scope.ref(part.name)
+            if isinstance(part, Lowering.ServeIndex):
+                self.expression(part.index, scope)
+            elif isinstance(part, Lowering.ServeCall):
+                for arg in part.args:
+                    self.expression(arg, scope)
+
+    def resolve_if(self, node, scope):
+        scopes = []
+        for condition, body in node.branches:
+            self.expression(condition, scope)
+            scopes.append(self.scoped_block(body, scope))
+        if node.orelse is not None:
+            scopes.append(self.scoped_block(node.orelse, scope))
+        node.scopes = tuple(scopes)
+
+    def scoped_block(self, statements, parent):
+        scope, slots = self.open_block(statements, parent)
+        self.block(statements, scope)
+        return slots
+
+    def resolve_flip(self, node, scope):
+        node.ref = scope.ref(node.name)
+        for _, _, body in node.cases:
+            self.block(body, scope)
+        if node.default is not None:
+            self.block(node.default, scope)
+
+    def resolve_for(self, node, parent):
+        scope, node.scope = self.open_block(node.body, parent, node.name if node.declare else None)
+        node.ref = scope.ref(node.name)
+        if node.init_name is not None:
+            node.init_ref = scope.ref(node.init_name)
+        self.expression(node.condition, scope)
+        self.block(node.body, scope)
+        if node.step is not None:
+            node.step_ref = scope.ref(node.step[0])
+
+    def resolve_loop(self, node, parent):
+        scope, node.scope = self.open_block(node.body, parent)
+        self.expression(node.condition, scope)
+        self.block(node.body, scope)
+
+    #-----------------------------------------------------------------
+    # Expressions
+    #-----------------------------------------------------------------
+    def resolve_nothing(self, node, scope):
+        pass
+
+    def resolve_index(self, node, scope):
+        node.ref = scope.ref(node.name)
+        self.expression(node.index, scope)
+
+    def resolve_len(self, node, scope):
+        if node.argument is not None:
+            self.expression(node.argument, scope)
+
+    def resolve_operands(self, node, scope):
+        self.expression(node.first, scope)
+        for _, operand in node.rest:
+            self.expression(operand, scope)
+
+    def resolve_or(self, node, scope):
+        self.expression(node.first, scope)
+        for operand in node.rest:
+            self.expression(operand, scope)
+
+    def resolve_pair(self, node, scope):
+        self.expression(node.left, scope)
+        self.expression(node.right, scope)
+
+
+def resolve(program):
+    """Binds the names of the Program returned by Lowering.lower() in place; returns it."""
+    return Resolver().program(program)
@@ -1,6 +1,15 @@
-from SyntaxAnalyzer import ParseTreeNode
-from datetime import datetime
-from tkinter import simpledialog
+from SyntaxAnalyzer import NODE_KINDS, ParseTreeNode
+from Lowering import RECIPE_STORAGE, Const, lower_arith, lower_condition, lower_parameters, recipe_storage
+from Operators import FAST_OPERATIONS
+from Purity import FunctionMemo
+from Tracing import get_logger
+import operator
+import sys
+import time
+
+log = get_logger("semantic")
+symbol_log = get_logger("symbols")
+eval_log = get_logger("eval")
 
 class SemanticError(Exception):
     def __init__(self, code, message, line=None, identifier=None, is_warning=False):
@@ -15,6 +24,78 @@ class SemanticError(Exception):
         line_info = f" on line {self.line}" if self.line is not None else ""
         return f"[{self.code}] {self.message}{line_info}"
 
+def validate_input(val):
+    """Converts text entered for a make statement to a pinch, skim or pasta value."""
+    # Check if the value is None (cancelled)
+    if val is None:
+        return None
+    val = val.replace("~", "-")
+
+    # Check if the value is a valid number (float or int)
+    try:
+        # Try converting the input to a float (this will handle both int and float cases)
+        float_val = float(val)
+        # Check if the value can be safely cast to an int (if it's an integer value)
+        if float_val.is_integer():
+            return int(float_val)  # Return as integer
+        else:
+            return float_val  # Return as float
+    except ValueError:
+        # If it's not a number, check if it's a string (non-empty)
+        if isinstance(val, str) and val.strip() != "":
+            return val  # Return as string
+        else:
+            return None  # Return None if it's an invalid input
+
+_LITERAL_TYPES = frozenset(("pinchliterals", "skimliterals", "pastaliterals", "yum", "bleh"))
+# Marks a node that has no pre-computed value
+_NOT_CONSTANT = object()
+# What _apply_condition_operator() computes for each operator, before it is made a bool
+_CONDITION_OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    ">": operator.gt,
+    "<=": operator.le,
+    ">=": operator.ge,
+    "&&": lambda left, right: left and right,
+    "??": lambda left, right: left or right,
+}
+# Calls the "vm" engine lets a program nest before it stops it
+MAX_CALL_DEPTH = 100_000
+
+
+def decode_literal(node_type, text, signed=False):
+    """
+    Value of a literal token.  Expressions read "~3" as no value and yum/bleh
+    as no value; declarations (signed) read them as -3 and True/False.
+    """
+    if node_type == "pastaliterals":
+        return text.strip('"')
+    if node_type in ("yum", "bleh"):
+        return node_type == "yum" if signed else None
+    if signed:
+        text = text.replace("~", "-")
+    try:
+        return int(text) if node_type == "pinchliterals" else float(text)
+    except ValueError:
+        return None
+
+def recipe_elements(value):
+    """The elements of an indexed value: a recipe's own storage, or anything else copied to a list."""
+    return value if isinstance(value, RECIPE_STORAGE) else list(value)
+
+# Values an element of each recipe type may be given; a skim element stores a pinch as a float
+ELEMENT_CLASSES = {"pinch": (int,), "skim": (float, int), "pasta": (str,)}
+# Element type of recipe storage that carries no attributes, such as a recipe bound to a pinch parameter
+_STORAGE_TYPES = {"q": "pinch", "d": "skim"}
+_VALUE_TYPES = {int: "pinch", float: "skim", str: "pasta", bool: "bool"}
+
+def index_bound(symbol, elements):
+    """How many of elements may be indexed: a recipe's declared dimension, and never more than it holds."""
+    dimension = symbol.attributes.get('dimensions')
+    return len(elements) if dimension is None else min(dimension, len(elements))
+
 #---------------------------------------------------------------------
 # Symbol and SymbolTable classes for semantic analysis
 #---------------------------------------------------------------------
@@ -24,55 +105,111 @@ class Symbol:
         self.type = symbol_type  # e.g., "pinch", "skim", "pasta"
         self.attributes = attributes or {}  # For arrays: e.g., {'dimensions': 10, 'element_type': 'pinch'}
         self.parameters = parameters
+        self.signature = None  # FunctionSignature, for functions
         self.is_used = False  # Track if the symbol is used
         self.value = None  # Store the actual value of the symbol
-        print(f"Created symbol: {self.name} of type {self.type}")
+        symbol_log.debug("Created symbol: %s of type %s", self.name, self.type)
 
     def __repr__(self):
         if self.type == 'function':
-            if self.parameters.children:
-                return f"Symbol(name={self.name}, type={self.type}, value=<array of {len(self.value)} elements>, attributes={self.attributes}, parameters={self.parameters.value})"
+            # parameters is the <parameters> node, or a tuple for lowered functions
+            if getattr(self.parameters, 'children', self.parameters):
+                return f"Symbol(name={self.name}, type={self.type}, value=<array of {len(self.value)} elements>, attributes={self.attributes}, parameters=<parameters>)"
             else:
                 return f"Symbol(name={self.name}, type={self.type}, value=<array of {len(self.value)} elements>, attributes={self.attributes}, parameters=None)"
         else:
             return f"Symbol(name={self.name}, type={self.type}, value={self.value}, attributes={self.attributes})"
 
     def set_value(self, value):
-        print(f"Setting value for {self.name}: {value}")
+        symbol_log.debug("Setting value for %s: %s", self.name, value)
         self.value = value
         self.is_used = True
 
     def get_value(self):
-        print(f"Getting value for {self.name}: {self.value}")
+        symbol_log.debug("Getting value for %s: %s", self.name, self.value)
         return self.value
 
 
+class ParameterSymbol(Symbol):
+    """A parameter bound by a function call, already holding its argument."""
+
+    def __init__(self, name, symbol_type, value, attributes=None):
+        # Same fields as Symbol(...).set_value(value), without the per-symbol tracing
+        self.name = name
+        self.type = symbol_type
+        self.attributes = attributes or {}
+        self.parameters = None
+        self.signature = None
+        self.is_used = True
+        self.value = value
+
+
+class FunctionSignature:
+    """
+    What a call needs from a function declaration, worked out once when the
+    function is declared rather than on every call.
+
+    parts are the local declarations, the body and, for full functions, the
+    return expression.  Engines that keep locals in frame slots also pass the
+    slot of each parameter and the frame size.  memo caches the results of a
+    pure full function (see Purity.py), and is None for any other function.
+    """
+    __slots__ = ('name', 'return_type', 'params', 'arity', 'decls', 'body', 'return_expr',
+                 'bindings', 'frame_size', 'memo')
+
+    def __init__(self, name, return_type, params, parts, param_slots=None, frame_size=0, pure=False):
+        self.name = name
+        self.return_type = return_type
+        self.params = params  # tuple of (data_type, name)
+        self.arity = len(params)
+        self.decls, self.body = parts[:2]
+        self.return_expr = parts[2] if len(parts) > 2 else None
+        # (slot, data_type, name) per parameter, in order
+        slots = param_slots if param_slots is not None else [None] * self.arity
+        self.bindings = tuple((slot, data_type, data_name) for slot, (data_type, data_name) in zip(slots, params))
+        self.frame_size = frame_size
+        self.memo = FunctionMemo() if pure and self.return_expr is not None else None
+
+
+def argument_nodes(argument_node):
+    """The expression nodes of an <argument_list> chain, not yet evaluated."""
+    args = []
+    while argument_node.children:
+        if argument_node.children[0].value == ',':
+            args.append(argument_node.children[1])
+            argument_node = argument_node.children[2]
+        else:
+            args.append(argument_node.children[0])
+            argument_node = argument_node.children[1]
+    return args
+
+
 class SymbolTable:
     def __init__(self, debugName="", parent=None):
         self.parent = parent
         self.debugName = debugName
         self.symbols = {}
-        print(f"Created symbol table: {debugName}")
+        symbol_log.debug("Created symbol table: %s", debugName)
 
     def add(self, name, symbol):
         # Only check for duplicate function declarations
         if name in self.symbols and symbol.type == "function":
             raise SemanticError("DUPLICATE_DECLARATION", f"Duplicate declaration of function '{name}'", identifier=name)
         self.symbols[name] = symbol
-        print(f"Added symbol {name} to table {self.debugName}")
+        symbol_log.debug("Added symbol %s to table %s", name, self.debugName)
 
     def lookup(self, name, mark_used=True):
-        print(f"Looking up symbol: {name} in table {self.debugName}")
+        symbol_log.debug("Looking up symbol: %s in table %s", name, self.debugName)
         if name in self.symbols:
             if mark_used:
                 self.symbols[name].is_used = True
-            print(f"Found symbol {name} in table {self.debugName}")
+            symbol_log.debug("Found symbol %s in table %s", name, self.debugName)
             return self.symbols[name]
         elif self.parent:
-            print(f"Symbol {name} not found in {self.debugName}, checking parent")
+            symbol_log.debug("Symbol %s not found in %s, checking parent", name, self.debugName)
             return self.parent.lookup(name, mark_used)
         else:
-            print(f"Symbol {name} not found in any scope")
+            symbol_log.debug("Symbol %s not found in any scope", name)
             return None
 
     def get_unused(self):
@@ -82,6 +219,219 @@ class SymbolTable:
         return f"SymbolTable(name={self.debugName},symbols={self.symbols})"
 
 
+class ScopePool:
+    """
+    Hands out the SymbolTables of loop and conditional blocks.
+
+    A block's table is only reachable while the block runs, so a released
+    table is emptied and reused by the next block instead of being allocated
+    again.  Debug names are numbered with a counter.
+    """
+    def __init__(self):
+        self.free = []
+        self.count = 0
+
+    def acquire(self, kind, parent):
+        self.count += 1
+        if not self.free:
+            return SymbolTable(debugName=f"{kind}_{self.count}", parent=parent)
+        table = self.free.pop()
+        table.symbols.clear()
+        table.parent = parent
+        table.debugName = f"{kind}_{self.count}"
+        return table
+
+    def release(self, table):
+        self.free.append(table)
+
+
+class ExecutionBudget:
+    """
+    Bounds how long a program may run: at most max_steps steps, where a step
+    is one loop iteration or one function call, and at most time_limit
+    seconds of wall-clock time.  Either limit may be None.
+
+    Every engine calls tick() at loop back-edges and function calls.  With
+    only a step limit, steps are counted in chunks of up to CLOCK_INTERVAL,
+    so a tick is a counter decrement in the common case.  With a time limit
+    every tick reads the clock: a single step can take arbitrarily long (an
+    integer squared each iteration doubles in size), so counting steps
+    between reads would let a program run far past its deadline.
+
+    cancel() may be called from another thread to stop the program at its
+    next tick, e.g. when nobody is left to read its output.
+    """
+    CLOCK_INTERVAL = 1024
+
+    def __init__(self, max_steps=None, time_limit=None):
+        self.max_steps = max_steps
+        self.time_limit = time_limit
+        self.cancelled = False
+        self.start()
+
+    def start(self):
+        """Resets the step count and starts the clock."""
+        self.used = 0
+        self.deadline = None if self.time_limit is None else time.monotonic() + self.time_limit
+        self.chunk = self.countdown = self._next_chunk()
+
+    def _next_chunk(self):
+        if self.deadline is not None:
+            return 1
+        if self.max_steps is None:
+            return self.CLOCK_INTERVAL
+        # One step past the budget is the step that exceeds it
+        return max(1, min(self.CLOCK_INTERVAL, self.max_steps + 1 - self.used))
+
+    def tick(self, line=None):
+        self.countdown -= 1
+        if self.countdown <= 0:
+            self.check(line)
+
+    def cancel(self):
+        self.cancelled = True
+        # A tick racing with this store may undo it; the next chunk still checks
+        self.countdown = 0
+
+    def check(self, line=None):
+        if self.cancelled:
+            raise SemanticError("CANCELLED", "Program was cancelled", line=line)
+        self.used += self.chunk
+        if self.max_steps is not None and self.used > self.max_steps:
+            raise SemanticError("EXECUTION_LIMIT", f"Program exceeded its budget of {self.max_steps} steps",
+                                line=line)
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise SemanticError("EXECUTION_LIMIT", f"Program ran longer than {self.time_limit} seconds",
+                                line=line)
+        self.chunk = self.countdown = self._next_chunk()
+
+
+class OutputSink:
+    """
+    Where the lines a program serves go.  serve and make call write() with
+    each line as it is produced; subclasses decide what happens to it.
+
+    max_chars caps the total output: the write that goes past it raises
+    SemanticError OUTPUT_LIMIT, which stops the program.
+    """
+    def __init__(self, max_chars=None):
+        self.max_chars = max_chars
+        self.chars = 0
+        self.lines = []  # lines kept for get_output(); only ListSink keeps any
+
+    def write(self, text):
+        # Quotes around a served line are never printed
+        text = text.strip('"')
+        if self.max_chars is not None:
+            self.chars += len(text) + 1
+            if self.chars > self.max_chars:
+                raise SemanticError("OUTPUT_LIMIT", f"Program output exceeded {self.max_chars} characters")
+        self.emit(text)
+
+    def emit(self, text):
+        raise NotImplementedError
+
+    def reset(self):
+        self.chars = 0
+        self.lines.clear()
+
+    def close(self):
+        """Called once the program has finished or stopped."""
+
+
+class ListSink(OutputSink):
+    """Keeps every line, for get_output() to join once the program has finished."""
+    def emit(self, text):
+        self.lines.append(text)
+
+
+class FileSink(OutputSink):
+    """Writes each line to a text file object as soon as it is served."""
+    def __init__(self, file, max_chars=None):
+        super().__init__(max_chars)
+        self.file = file
+
+    def emit(self, text):
+        self.file.write(text + "\n")
+        self.file.flush()
+
+
+class QueueSink(OutputSink):
+    """
+    Puts each line on a queue.Queue for another thread to consume; close()
+    puts None to mark the end of the output.
+    """
+    def __init__(self, queue, max_chars=None):
+        super().__init__(max_chars)
+        self.queue = queue
+
+    def emit(self, text):
+        self.queue.put(text)
+
+    def close(self):
+        self.queue.put(None)
+
+
+class InputProvider:
+    """
+    Where make reads its input from.  read() returns the text entered for
+    a variable, or None when the entry was cancelled.  When there is no
+    input left it raises SemanticError INPUT_EXHAUSTED, which stops the
+    program.  Subclasses implement next_value(), raising EOFError when
+    they run out.  The text is converted by validate_input() as before.
+    """
+    def read(self, name, line=None):
+        try:
+            return self.next_value(name)
+        except EOFError:
+            raise SemanticError("INPUT_EXHAUSTED", f"No input left for [{name}]", line=line,
+                                identifier=name) from None
+
+    def next_value(self, name):
+        raise NotImplementedError
+
+
+class ListInput(InputProvider):
+    """Values supplied up front, e.g. with an HTTP request, read in order."""
+    def __init__(self, values):
+        self.values = list(values)
+        self.position = 0
+
+    def next_value(self, name):
+        if self.position >= len(self.values):
+            raise EOFError
+        self.position += 1
+        return self.values[self.position - 1]
+
+
+class StreamInput(InputProvider):
+    """One line per make from a text stream, standard input by default."""
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def next_value(self, name):
+        line = (self.stream or sys.stdin).readline()
+        if not line:
+            raise EOFError
+        return line.rstrip("\r\n")
+
+
+class CallableInput(InputProvider):
+    """Calls function(name) for each make; it raises EOFError when it has no more input."""
+    def __init__(self, function):
+        self.function = function
+
+    def next_value(self, name):
+        return self.function(name)
+
+
+class DialogInput(InputProvider):
+    """Asks for each value in a tkinter dialog, for the desktop."""
+    def next_value(self, name):
+        from tkinter import simpledialog
+        return simpledialog.askstring("Input needed", f"Please enter value for [{name}]:")
+
+
 
 #---------------------------------------------------------------------
 # Updated SemanticAnalyzer class
@@ -111,13 +461,43 @@ class SemanticAnalyzer:
         self._original_visit_return_statement(node)"""
 
 
-    def __init__(self):
+    def __init__(self, engine="ast", max_steps=None, time_limit=None, output=None, input_provider=None,
+                 max_depth=MAX_CALL_DEPTH):
+        # "ast" lowers the parse tree (Lowering.py), binds its names to
+        # frame slots (Resolver.py) and runs it with Interpreter.py, "vm"
+        # compiles the bound tree to bytecode (Bytecode.py) for
+        # VirtualMachine.py, "python" translates it to Python source
+        # (Transpiler.py), and "tree" walks the parse tree with the visit_*
+        # methods below.  max_steps and time_limit bound the run (see
+        # ExecutionBudget); None leaves it unbounded.  output is the
+        # OutputSink that serve writes to, a ListSink by default, and
+        # input_provider the InputProvider make reads from, a DialogInput
+        # by default.  "vm" keeps calls on a stack of its own rather than
+        # on Python's, and stops a program whose calls nest deeper than
+        # max_depth; the other engines stop at Python's recursion limit,
+        # which is reported the same way.
+        if engine not in ("ast", "vm", "python", "tree"):
+            raise ValueError(f"Unknown engine: {engine}")
+        self.engine = engine
         self.global_scope = SymbolTable(debugName="global")
         self.current_scope = self.global_scope
         self.errors = []
         self.symbol_tables = [self.global_scope]
+        self.program_scope = self.global_scope
+        self.scope_pool = ScopePool()
+        self.budget = ExecutionBudget(max_steps, time_limit)
+        self.max_depth = max_depth
+        self.call_arguments = {}  # <argument_list> node -> its argument expressions
+        self.visitors = []  # bound visitor per node kind, filled by the first visit()
+        # Filled by prepare_constants(): node -> value
+        self.constants = {}            # what _evaluate_expression() returns for the node
+        self.condition_constants = {}  # what _evaluate_condition() returns for a <condition>
+        self.signed_literals = {}      # literal tokens as declarations read them
+        self.pure_functions = set()    # names of the functions whose calls may be memoized
         self.current_function = None
-        self.output_buffer = []  # Buffer to store output from serve statements
+        self.output = output if output is not None else ListSink()
+        self.output_buffer = self.output.lines  # served lines kept by the sink
+        self.input_provider = input_provider if input_provider is not None else DialogInput()
         self.termination_code = 0
         # Define type compatibility rules
         self.type_compatibility = {
@@ -130,12 +510,12 @@ class SemanticAnalyzer:
 
     def analyze(self, parse_tree, has_syntax_errors=False):
         if has_syntax_errors:
-            print("Skipping semantic analysis due to syntax errors")
+            log.debug("Skipping semantic analysis due to syntax errors")
             return []
 
-        print("Starting semantic analysis...")
+        log.debug("Starting semantic analysis...")
         # Clear the output buffer at the start of analysis
-        self.output_buffer = []
+        self.output.reset()
         
         # Store the parse tree for function evaluation
         self.parse_tree = parse_tree
@@ -143,61 +523,126 @@ class SemanticAnalyzer:
         # Create a main program scope (should be a child of global scope)
         main_scope = SymbolTable(debugName="main_program", parent=self.global_scope)
         self.symbol_tables.append(main_scope)
+        # Function scopes are children of this scope, not of the caller's
+        self.program_scope = main_scope
         
         # Set current scope to main program
         old_scope = self.current_scope
         self.current_scope = main_scope
         
-        # Visit the parse tree
-        self.visit(parse_tree)
+        self.budget.start()
+        try:
+            self.run(parse_tree)
+        except SemanticError as error:
+            # A program stopped by its budget, its call depth, by running out
+            # of input or by being cancelled reports it like any other error
+            if error.code not in ("EXECUTION_LIMIT", "RECURSION_LIMIT", "OUTPUT_LIMIT", "INPUT_EXHAUSTED",
+                                  "CANCELLED"):
+                raise
+            self.errors.append(error)
+        except RecursionError:
+            # Calls on the Python stack run out of it long before max_depth
+            self.errors.append(SemanticError(
+                "RECURSION_LIMIT", f"Calls nested deeper than the \"{self.engine}\" engine allows; "
+                                   f"\"vm\" allows {self.max_depth}"))
+        finally:
+            self.output.close()
         
         # Restore the original scope
         self.current_scope = old_scope
         
         # Only check for unused variables in local scope
         self._check_unused_local_variables()
-        print(f"Analysis complete. Found {len(self.errors)} issues.")
+        log.debug("Analysis complete. Found %s issues.", len(self.errors))
         return self.errors
 
-    def visit(self, node, parent=None):
-        # If the node has no value, return
-        if not hasattr(node, 'value'):
-            return
-            
-        # If the node label is a non-terminal (e.g., "<local_declarations>") then try to call its visitor.
-        if isinstance(node.value, str) and node.value.startswith('<') and node.value.endswith('>'):
-            method_name = "visit_" + node.value.strip('<>').replace('-', '_')
-            if hasattr(self, method_name):
-                getattr(self, method_name)(node)
-            else:
-                self.generic_visit(node)
+    def run(self, parse_tree):
+        """Runs the program with the selected engine."""
+        if self.engine == "ast":
+            from Interpreter import Interpreter
+            from Lowering import lower
+            from Resolver import resolve
+            Interpreter(self).run(resolve(lower(parse_tree)))
+        elif self.engine == "vm":
+            from Bytecode import compile_program
+            from Lowering import lower
+            from Resolver import resolve
+            from VirtualMachine import VirtualMachine
+            VirtualMachine(self).run(compile_program(resolve(lower(parse_tree)), self._apply_operator))
+        elif self.engine == "python":
+            from Lowering import lower
+            from Resolver import resolve
+            from Transpiler import PythonRuntime, transpile
+            PythonRuntime(self).run_source(transpile(resolve(lower(parse_tree))))
         else:
-            if node.node_type == "id":
-                self.check_id_usage(node)
-            elif node.value == "serve":
-                self.visit_serve_statement(node, parent)
-            elif node.value == "make":
-                if not self.visit_make_statement(node, parent):
-                    return None
+            # Visit the parse tree
+            self.prepare_constants(parse_tree)
+            # Which functions are pure is worked out on the lowered program
+            from Lowering import lower
+            from Resolver import resolve
+            self.pure_functions = {function.name for function in resolve(lower(parse_tree)).functions
+                                   if function.pure}
+            self.visit(parse_tree)
+
+    # Terminals with a visitor of their own; other terminals have nothing to visit
+    TERMINAL_VISITORS = {"id": "visit_id", "serve": "visit_serve_keyword", "make": "visit_make_keyword",
+                         "spit": "visit_spit"}
+    # Visitor method name per node kind, built once per class
+    _visitor_names = {}
+
+    @classmethod
+    def visitor_names(cls):
+        """The visitor method name of each node kind, indexed by ParseTreeNode.kind."""
+        names = cls._visitor_names.get(cls)
+        if names is None or len(names) < len(NODE_KINDS):
+            names = []
+            for node_type in NODE_KINDS:
+                if node_type.startswith('<') and node_type.endswith('>'):
+                    # A non-terminal, e.g. "<local_declarations>" -> visit_local_declarations
+                    method_name = "visit_" + node_type.strip('<>').replace('-', '_')
+                    names.append(method_name if hasattr(cls, method_name) else "generic_visit")
+                else:
+                    names.append(cls.TERMINAL_VISITORS.get(node_type, "visit_terminal"))
+            cls._visitor_names[cls] = names
+        return names
 
-            if node.value == "spit":
-                # the spit on the main function a terminal, so why tf are you trying to access it through terminal checking, ing bitch
-                return_val = parent.children[12]
-                """
-                    idk what y'll ing want, i'll just add those 3 types of return
-                """
-                if not int(return_val.value) in [0,1]:
-                    self.errors.append(SemanticError(
-                        code="INVALID_TERMINATION_CODE",
-                        message="Program must be terminated using only these [1, 0]!",
-                        line=getattr(node, 'line_number', None)
-                    ))
-                    return None
-                self.termination_code = int(return_val.value)
-            else:
-                self.generic_visit(node)
+    def visit(self, node, parent=None):
+        try:
+            visitor = self.visitors[node.kind]
+        except IndexError:
+            # First visit, or a node kind interned since the table was built
+            self.visitors = [getattr(self, name) for name in self.visitor_names()]
+            visitor = self.visitors[node.kind]
+        visitor(node, parent)
+
+    def visit_terminal(self, node, parent=None):
+        pass
 
-    def generic_visit(self, node):
+    def visit_id(self, node, parent=None):
+        self.check_id_usage(node)
+
+    def visit_serve_keyword(self, node, parent=None):
+        self.visit_serve_statement(node, parent)
+
+    def visit_make_keyword(self, node, parent=None):
+        self.visit_make_statement(node, parent)
+
+    def visit_spit(self, node, parent=None):
+        # the spit on the main function a terminal, so why tf are you trying to access it through terminal checking, ing bitch
+        return_val = parent.children[12]
+        """
+            idk what y'll ing want, i'll just add those 3 types of return
+        """
+        if not int(return_val.value) in [0,1]:
+            self.errors.append(SemanticError(
+                code="INVALID_TERMINATION_CODE",
+                message="Program must be terminated using only these [1, 0]!",
+                line=getattr(node, 'line_number', None)
+            ))
+            return None
+        self.termination_code = int(return_val.value)
+
+    def generic_visit(self, node, parent=None):
         for child in node.children:
             self.visit(child, node)
 
@@ -224,7 +669,7 @@ class SemanticAnalyzer:
                 elif expr_node.value == "<literals>":
                     pass
             # If we can't determine the type, log it for debugging
-            print(f"Couldn't determine type for: {expr_node.value if hasattr(expr_node, 'value') else 'unknown'}")
+            eval_log.debug("Couldn't determine type for: %s", expr_node.value if hasattr(expr_node, 'value') else 'unknown')
             return None
 
         # For <expression> nodes
@@ -264,7 +709,7 @@ class SemanticAnalyzer:
                 right_type = self.get_expression_type(right_expr)
                 operator = operator_node.value
                 
-                print(f"Binary operation: {left_type} {operator} {right_type}")
+                eval_log.debug("Binary operation: %s %s %s", left_type, operator, right_type)
                 
                 # Logical operators always return boolean
                 if operator in ["==", "!=", "<", ">", "<=", ">=", "&&", "??"]:
@@ -300,7 +745,7 @@ class SemanticAnalyzer:
             return "bool"
 
         # Debug - log if we couldn't determine the type
-        print(f"Failed to determine type for expression: {expr_node.value if hasattr(expr_node, 'value') else 'unknown'}")
+        eval_log.debug("Failed to determine type for expression: %s", expr_node.value if hasattr(expr_node, 'value') else 'unknown')
         return None
 
     def get_condition_type(self, expr_node):
@@ -321,7 +766,7 @@ class SemanticAnalyzer:
                             return symbol.attributes['element_type']
                         return symbol.type
             # If we can't determine the type, log it for debugging
-            print(f"Couldn't determine type for: {expr_node.value if hasattr(expr_node, 'value') else 'unknown'}")
+            eval_log.debug("Couldn't determine type for: %s", expr_node.value if hasattr(expr_node, 'value') else 'unknown')
             return None
 
         # For <condition> nodes
@@ -362,7 +807,7 @@ class SemanticAnalyzer:
                 right_type = self.get_condition_type(right_expr)
                 operator = operator_node.value
 
-                print(f"Binary operation: {left_type} {operator} {right_type}")
+                eval_log.debug("Binary operation: %s %s %s", left_type, operator, right_type)
 
                 # Logical operators always return boolean
                 if operator in ["==", "!=", "<", ">", "<=", ">=", "&&", "??"]:
@@ -396,8 +841,7 @@ class SemanticAnalyzer:
             return self.get_condition_type(expr_node.children[1])
 
         # Debug - log if we couldn't determine the type
-        print(
-            f"Failed to determine type for condition: {expr_node.value if hasattr(expr_node, 'value') else 'unknown'}")
+        eval_log.debug("Failed to determine type for condition: %s", expr_node.value if hasattr(expr_node, 'value') else 'unknown')
         return None
 
     def are_types_compatible(self, target_type, expr_type):
@@ -405,7 +849,7 @@ class SemanticAnalyzer:
         if target_type is None or expr_type is None:
             return False  # Cannot determine compatibility
         
-        print(f"Checking compatibility: target={target_type}, expr={expr_type}")
+        log.debug("Checking compatibility: target=%s, expr=%s", target_type, expr_type)
         
         # Handle array element type compatibility
         if isinstance(target_type, dict) and 'element_type' in target_type:
@@ -418,21 +862,21 @@ class SemanticAnalyzer:
     #-----------------------------------------------------------------
     # Declaration handling
     #-----------------------------------------------------------------
-    def visit_global_dec(self, node):
+    def visit_global_dec(self, node, parent=None):
         try:
             # Debug information
-            print("\n=== Processing global declaration ===")
-            print(f"Node value: {node.value if hasattr(node, 'value') else 'No value'}")
-            print(f"Number of children: {len(node.children) if hasattr(node, 'children') else 0}")
+            log.debug("=== Processing global declaration ===")
+            log.debug("Node value: %s", node.value if hasattr(node, 'value') else 'No value')
+            log.debug("Number of children: %s", len(node.children) if hasattr(node, 'children') else 0)
             
-            # Print structure of node for diagnosis
-            if hasattr(node, 'children') and node.children:
+            # Log structure of node for diagnosis
+            if log.debug_enabled and hasattr(node, 'children') and node.children:
                 for i, child in enumerate(node.children):
-                    print(f"Child {i} value: {child.value if hasattr(child, 'value') else 'No value'}")
+                    log.debug("Child %s value: %s", i, child.value if hasattr(child, 'value') else 'No value')
                     if hasattr(child, 'children') and child.children:
-                        print(f"  Grandchildren count: {len(child.children)}")
+                        log.debug("  Grandchildren count: %s", len(child.children))
                         for j, grandchild in enumerate(child.children[:2]):  # Only print first 2 for brevity
-                            print(f"  Grandchild {j} value: {grandchild.value if hasattr(grandchild, 'value') else 'No value'}")
+                            log.debug("  Grandchild %s value: %s", j, grandchild.value if hasattr(grandchild, 'value') else 'No value')
             
             # Process each child of the global_dec node
             if hasattr(node, 'children'):
@@ -440,29 +884,24 @@ class SemanticAnalyzer:
                     if hasattr(child, 'children') and child.children:
                         # Check if this is an array declaration
                         if child.children[0].value == 'recipe':
-                            print("Found array declaration in global scope")
+                            log.debug("Found array declaration in global scope")
                             self._handle_array_declaration(child)
                         else:
-                            print("Found regular declaration in global scope")
+                            log.debug("Found regular declaration in global scope")
                             self._handle_regular_declaration(child)
             
             #self.generic_visit(node)
         except IndexError as e:
-            print(f"IndexError in visit_global_dec: {e}")
-            # Add the stack trace for debugging
-            import traceback
-            traceback.print_exc()
+            # Keep the stack trace for debugging
+            log.warning("IndexError in visit_global_dec: %s", e, exc_info=True)
             # Continue with generic visit to avoid breaking the analysis
             self.generic_visit(node)
         except Exception as e:
-            print(f"Unexpected error in visit_global_dec: {e}")
-            traceback.print_exc()
+            log.warning("Unexpected error in visit_global_dec: %s", e, exc_info=True)
             self.generic_visit(node)
 
-    def visit_declarations(self, node):
-        print("\n" + "="*50)
-        print("DEBUG: Processing declaration")
-        print("="*50)
+    def visit_declarations(self, node, parent=None):
+        log.debug("Processing declaration")
         
         if not node.children or len(node.children) < 2:
             return
@@ -474,24 +913,24 @@ class SemanticAnalyzer:
             # Get the variable type
             data_type_node = node.children[0].children[0]
             var_type = data_type_node.value
-            print(f"Variable type: {var_type}")
+            log.debug("Variable type: %s", var_type)
 
             # Get the variable name
             id_node = node.children[1]
             var_name = id_node.value
-            print(f"Variable name: {var_name}")
+            log.debug("Variable name: %s", var_name)
 
             # Create and add the symbol
             symbol = Symbol(var_name, var_type)
             self.current_scope.add(var_name, symbol)
-            print(f"Added symbol: {symbol}")
+            log.debug("Added symbol: %s", symbol)
 
             # Handle initialization if present
             if len(node.children) > 2 and node.children[2].value == "<dec_or_init>":
                 init_node = node.children[2]
                 if init_node.children and init_node.children[0].value == "=":
                     literals_node = init_node.children[1]
-                    print(f"Literals node: {literals_node.value if hasattr(literals_node, 'value') else 'No value'}")
+                    log.debug("Literals node: %s", literals_node.value if hasattr(literals_node, 'value') else 'No value')
 
                     # Extract the literal value
                     value = None
@@ -502,30 +941,30 @@ class SemanticAnalyzer:
                                 if literal_child.node_type == "pinchliterals":
                                     try:
                                         value = int(literal_child.value.replace("~", "-"))
-                                        print(f"Extracted literal pinch value: {value}")
+                                        log.debug("Extracted literal pinch value: %s", value)
                                     except ValueError:
-                                        print(f"Invalid pinch literal: {literal_child.value}")
+                                        log.debug("Invalid pinch literal: %s", literal_child.value)
                                 elif literal_child.node_type == "skimliterals":
                                     try:
                                         value = float(literal_child.value.replace("~", "-"))
-                                        print(f"Extracted literal skim value: {value}")
+                                        log.debug("Extracted literal skim value: %s", value)
                                     except ValueError:
-                                        print(f"Invalid skim literal: {literal_child.value}")
+                                        log.debug("Invalid skim literal: %s", literal_child.value)
                                 elif literal_child.node_type == "pastaliterals":
                                     value = literal_child.value.strip('"')
-                                    print(f"Extracted literal pasta value: {value}")
+                                    log.debug("Extracted literal pasta value: %s", value)
                                 elif literal_child.node_type == "<yum_or_bleh>":
                                     bool_val = literal_child.children[0].value
                                     value = bool_val
                     if value is not None:
                         symbol.set_value(value)
-                        print(f"Initialized {var_name} with value: {value}")
+                        log.debug("Initialized %s with value: %s", var_name, value)
                     else:
                         # If direct extraction failed, try the evaluator
                         value = self._evaluate_expression(literals_node)
                         if value is not None:
                             symbol.set_value(value)
-                            print(f"Initialized {var_name} with evaluated value: {value}")
+                            log.debug("Initialized %s with evaluated value: %s", var_name, value)
 
             #handle <next_dec_or_init>
 
@@ -538,13 +977,13 @@ class SemanticAnalyzer:
         # Get the variable type
         data_type_node = node.children[0].children[0]
         var_type = data_type_node.value
-        print(f"Processing declaration with type: {var_type}")
+        log.debug("Processing declaration with type: %s", var_type)
 
         # Process first declaration
         id_node = node.children[1]
         var_name = id_node.value
         line_num = getattr(id_node, 'line_number', -1)
-        print(f"Processing first variable: {var_name}")
+        log.debug("Processing first variable: %s", var_name)
 
         try:
             # Dictionary to hold all variables in this declaration
@@ -552,7 +991,7 @@ class SemanticAnalyzer:
             
             # Create symbol and add it to the current scope for the first variable
             symbol = Symbol(var_name, var_type)
-            print(f"Adding symbol {var_name} to scope {self.current_scope.debugName}")
+            log.debug("Adding symbol %s to scope %s", var_name, self.current_scope.debugName)
             self.current_scope.add(var_name, symbol)
             variables_in_declaration[var_name] = symbol
             
@@ -568,24 +1007,24 @@ class SemanticAnalyzer:
 
                     if value is not None:
                         symbol.set_value(value)
-                        print(f"Set symbol {var_name} value directly: {value}")
+                        log.debug("Set symbol %s value directly: %s", var_name, value)
                     else:
                         # If direct extraction failed, use the expression evaluator
                         value = self._evaluate_expression(literal_node)
                         if value is not None:
                             symbol.set_value(value)
-                            print(f"Set symbol {var_name} value after evaluation: {value}")
+                            log.debug("Set symbol %s value after evaluation: %s", var_name, value)
                     
                     # Check type compatibility
                     self._check_initialization(var_name, var_type, literal_node, line_num)
 
                 # Process additional declarations (variables after commas)
-                print(f"\nProcessing additional variables for {var_type} declaration")
+                log.debug("Processing additional variables for %s declaration", var_type)
                 
                 # Helper function to find and process all variables in the declaration
                 def find_additional_variables(current_node, depth=0):
                     indent = "  " * depth
-                    print(f"{indent}Exploring node: {current_node.value if hasattr(current_node, 'value') else 'No value'}")
+                    log.debug("%sExploring node: %s", indent, current_node.value if hasattr(current_node, 'value') else 'No value')
                     
                     # Skip if not a node with children or no children
                     if not hasattr(current_node, 'children') or not current_node.children:
@@ -597,13 +1036,13 @@ class SemanticAnalyzer:
                             # The variable is the second child after the comma
                             var_id_node = current_node.children[1]
                             next_id = var_id_node.value
-                            print(f"{indent}Found additional variable: {next_id}")
+                            log.debug("%sFound additional variable: %s", indent, next_id)
                             
                             # Create and register the variable
                             next_symbol = Symbol(next_id, var_type)
                             self.current_scope.add(next_id, next_symbol)
                             variables_in_declaration[next_id] = next_symbol
-                            print(f"{indent}Registered {next_id} in symbol table")
+                            log.debug("%sRegistered %s in symbol table", indent, next_id)
                             
                             # Check for initialization
                             if len(current_node.children) > 2:
@@ -612,16 +1051,16 @@ class SemanticAnalyzer:
                                     next_literal_node = next_dec.children[1]
                                     
                                     # Handle initialization
-                                    print(f"{indent}Processing initialization for {next_id}")
+                                    log.debug("%sProcessing initialization for %s", indent, next_id)
                                     next_value = self._extract_literal_value(next_literal_node)
                                     if next_value is not None:
                                         next_symbol.set_value(next_value)
-                                        print(f"{indent}Set {next_id} value directly: {next_value}")
+                                        log.debug("%sSet %s value directly: %s", indent, next_id, next_value)
                                     else:
                                         next_value = self._evaluate_expression(next_literal_node)
                                         if next_value is not None:
                                             next_symbol.set_value(next_value)
-                                            print(f"{indent}Set {next_id} value after evaluation: {next_value}")
+                                            log.debug("%sSet %s value after evaluation: %s", indent, next_id, next_value)
                                     
                                     # Check type compatibility
                                     self._check_initialization(next_id, var_type, next_literal_node, line_num)
@@ -639,14 +1078,14 @@ class SemanticAnalyzer:
                 find_additional_variables(dec_or_init)
 
                 # Print final state for debug purposes
-                print("\nFinal variable state after processing multi-variable declaration:")
+                log.debug("Final variable state after processing multi-variable declaration:")
                 for name, sym in variables_in_declaration.items():
                     val = sym.get_value()
-                    print(f"  {name}: {val} (type: {sym.type})")
+                    log.debug("  %s: %s (type: %s)", name, val, sym.type)
                 
         except SemanticError as e:
             self.errors.append(e)
-            print(f"Error processing declaration: {e}")
+            log.warning("Error processing declaration: %s", e)
 
     def _check_initialization(self, var_name, var_type, expr_node, line_num):
         """Helper method to check initialization type compatibility"""
@@ -777,7 +1216,7 @@ class SemanticAnalyzer:
                     identifier=var_name
                 ))
             if values:
-                symbol.set_value(values)
+                symbol.set_value(recipe_storage(var_type, values))
             self.current_scope.add(var_name, symbol)
 
 
@@ -791,8 +1230,8 @@ class SemanticAnalyzer:
                     identifier=var_name
                 ))
 
-    def visit_local_declarations(self, node):
-        print(f"\nProcessing local declaration in scope: {self.current_scope.debugName}")
+    def visit_local_declarations(self, node, parent=None):
+        log.debug("Processing local declaration in scope: %s", self.current_scope.debugName)
         
         # Determine whether this is an array declaration or a regular variable declaration.
         if node.children and node.children[0].value == 'recipe':
@@ -802,8 +1241,8 @@ class SemanticAnalyzer:
             
         #self.generic_visit(node)
     
-    def visit_local_dec(self, node):
-        print(f"\nProcessing local dec node in scope: {self.current_scope.debugName}")
+    def visit_local_dec(self, node, parent=None):
+        log.debug("Processing local dec node in scope: %s", self.current_scope.debugName)
         # Just genericVisit as the individual local_declarations will handle the work
         self.generic_visit(node)
 
@@ -812,6 +1251,9 @@ class SemanticAnalyzer:
 
         if node is None:
             return None
+        literal = self.signed_literals.get(node, _NOT_CONSTANT)
+        if literal is not _NOT_CONSTANT:
+            return literal
             
         # Direct literal node
         if hasattr(node, 'node_type'):
@@ -843,44 +1285,33 @@ class SemanticAnalyzer:
         return None
 
     def lookup_symbol(self, name, mark_used=True):
-        """Enhanced symbol lookup that tries harder to find symbols in all scopes"""
-        print(f"Looking up symbol: {name} in current scope: {self.current_scope.debugName}")
+        """Looks name up in the current scope and then its parents"""
+        log.debug("Looking up symbol: %s in current scope: %s", name, self.current_scope.debugName)
 
         # First try the current scope
         if name in self.current_scope.symbols:
             symbol = self.current_scope.symbols[name]
             if mark_used:
                 symbol.is_used = True
-            print(f"Found symbol {name} in current scope {self.current_scope.debugName}")
+            log.debug("Found symbol %s in current scope %s", name, self.current_scope.debugName)
             return symbol
 
         # If not found and there's a parent, try the parent scope
         if self.current_scope.parent:
-            print(f"Symbol {name} not found in {self.current_scope.debugName}, checking parent")
+            log.debug("Symbol %s not found in %s, checking parent", name, self.current_scope.debugName)
             parent_result = self.current_scope.parent.lookup(name, mark_used)
             if parent_result:
                 return parent_result
 
-        # If still not found, search all symbol tables
-        print(f"Symbol {name} not found in direct parent chain, searching all tables")
-        for table in self.symbol_tables:
-            if table != self.current_scope:  # Skip current scope as we already checked it
-                if name in table.symbols:
-                    symbol = table.symbols[name]
-                    if mark_used:
-                        symbol.is_used = True
-                    print(f"Found symbol {name} in table {table.debugName}")
-                    return symbol
-
-        print(f"Symbol {name} not found in any scope")
+        log.debug("Symbol %s not found in any scope", name)
         return None
 
     #-----------------------------------------------------------------
     # Function handling
     #-----------------------------------------------------------------
-    def visit_function(self, node):
+    def visit_function(self, node, parent=None):
         """Handle function declarations"""
-        print("\n=== Processing function declaration ===")
+        log.debug("=== Processing function declaration ===")
         
         # Get function name and return type
         if len(node.children) >= 3:
@@ -895,7 +1326,7 @@ class SemanticAnalyzer:
                 func_name = node.children[1].value
                 next_function = node.children[9]
             
-            print(f"Found function: {func_name} with return type {return_type}")
+            log.debug("Found function: %s with return type %s", func_name, return_type)
 
             # Register the function in the global scope
             # try:
@@ -913,6 +1344,11 @@ class SemanticAnalyzer:
                 parameter_node = node.children[4]
             symbol = Symbol(func_name, symbol_type="function", attributes={"return_type": return_type}, parameters=parameter_node)
             symbol.set_value(important_nodes)
+            parts = important_nodes[:2]
+            if len(important_nodes) > 2:
+                parts.append(important_nodes[2].children[1])  # the expression after spit
+            symbol.signature = FunctionSignature(func_name, return_type, lower_parameters(parameter_node), parts,
+                                                 pure=func_name in self.pure_functions)
             self.current_scope.add(func_name, symbol)
 
             """
@@ -955,38 +1391,38 @@ class SemanticAnalyzer:
     #-----------------------------------------------------------------
     # Statement handling (including assignment checking)
     #-----------------------------------------------------------------
-    def visit_statement(self, node):
+    def visit_statement(self, node, parent=None):
         if not node.children:
             return
         
-        print("\n" + "="*50)
-        print("DEBUG: Starting statement processing")
-        print("="*50)
+        log.debug("Starting statement processing")
         
         # Debug - print what kind of statement we're processing
-        print(f"\n=== Processing statement ===")
-        print(f"Statement node: {node.value if hasattr(node, 'value') else 'No value'}")
-        print(f"Statement children: {[child.value if hasattr(child, 'value') else 'No value' for child in node.children]}")
+        log.debug("=== Processing statement ===")
+        log.debug("Statement node: %s", node.value if hasattr(node, 'value') else 'No value')
+        if log.debug_enabled:
+            log.debug("Statement children: %s", [child.value if hasattr(child, 'value') else 'No value' for child in node.children])
         
         # Check if this is an assignment
         if len(node.children) >= 2:
             first_child = node.children[0]
             second_child = node.children[1]
             
-            print(f"\nFirst child: {first_child.value if hasattr(first_child, 'value') else 'No value'}")
-            print(f"First child type: {first_child.node_type if hasattr(first_child, 'node_type') else 'No type'}")
-            print(f"Second child: {second_child.value if hasattr(second_child, 'value') else 'No value'}")
-            print(f"Second child type: {second_child.node_type if hasattr(second_child, 'node_type') else 'No type'}")
+            log.debug("First child: %s", first_child.value if hasattr(first_child, 'value') else 'No value')
+            log.debug("First child type: %s", first_child.node_type if hasattr(first_child, 'node_type') else 'No type')
+            log.debug("Second child: %s", second_child.value if hasattr(second_child, 'value') else 'No value')
+            log.debug("Second child type: %s", second_child.node_type if hasattr(second_child, 'node_type') else 'No type')
             
             # Check if this is an assignment statement
             if hasattr(first_child, 'node_type') and first_child.node_type == "id":
                 var_name = first_child.value
-                print(f"\nFound identifier: {var_name}")
+                log.debug("Found identifier: %s", var_name)
                 
                 # Check if this has an assignment operator
                 if hasattr(second_child, 'value') and second_child.value == "<statement_id_tail>":
-                    print("\nFound statement_id_tail")
-                    print(f"Statement_id_tail children: {[child.value if hasattr(child, 'value') else 'No value' for child in second_child.children]}")
+                    log.debug("Found statement_id_tail")
+                    if log.debug_enabled:
+                        log.debug("Statement_id_tail children: %s", [child.value if hasattr(child, 'value') else 'No value' for child in second_child.children])
                     
                     if second_child.children and len(second_child.children) >= 2:
 
@@ -995,53 +1431,61 @@ class SemanticAnalyzer:
                             if not return_val:
                                 return None
 
+                        elif second_child.children[0].value == "[":
+                            # An element write: the index, then the value, then the element is stored
+                            index = self._evaluate_expression(second_child.children[1])
+                            value = self._evaluate_expression(second_child.children[4])
+                            self.assign_element(self.lookup_symbol(var_name), var_name, index,
+                                                second_child.children[3].children[0].value, value,
+                                                getattr(node, 'line_number', None))
 
                         else:
                             # Unwrap the real operator string
                             raw_op = None
                             operator_node = second_child.children[0]
-                            print(operator_node.node_type)
+                            log.debug("%s", operator_node.node_type)
 
                             # If it's an <assignment_operator> wrapper, grab its child token
                             if operator_node.value == "<assignment_operator>" and operator_node.children:
                                 raw_op = operator_node.children[0].value
-                                print(f"Found wrapped operator: {raw_op}")
+                                log.debug("Found wrapped operator: %s", raw_op)
                             # Otherwise maybe it was exposed directly
                             elif operator_node.value in ["=", "+=", "-=", "*=", "/=", "%="]:
                                 raw_op = operator_node.value
-                                print(f"Found direct operator: {raw_op}")
+                                log.debug("Found direct operator: %s", raw_op)
                             elif operator_node.value == '<unary_op>':
                                 raw_op = operator_node.children[0].value
-                                print(f"Found direct operator: {raw_op}")
+                                log.debug("Found direct operator: %s", raw_op)
                             expr_node = second_child.children[1]
 
-                            print(f"\nProcessing expression for {var_name}")
-                            print(f"Operator: {raw_op}")
-                            print(f"Expression node: {expr_node.value if hasattr(expr_node, 'value') else 'No value'}")
-                            print(f"Expression node type: {expr_node.node_type if hasattr(expr_node, 'node_type') else 'No type'}")
-                            print(f"Expression children: {[child.value if hasattr(child, 'value') else 'No value' for child in expr_node.children] if hasattr(expr_node, 'children') else 'No children'}")
+                            log.debug("Processing expression for %s", var_name)
+                            log.debug("Operator: %s", raw_op)
+                            log.debug("Expression node: %s", expr_node.value if hasattr(expr_node, 'value') else 'No value')
+                            log.debug("Expression node type: %s", expr_node.node_type if hasattr(expr_node, 'node_type') else 'No type')
+                            if log.debug_enabled:
+                                log.debug("Expression children: %s", [child.value if hasattr(child, 'value') else 'No value' for child in expr_node.children] if hasattr(expr_node, 'children') else 'No children')
 
                             if raw_op in ["=", "+=", "-=", "*=", "/=", "%="]:
-                                print(f"\nFound assignment operator: {raw_op}")
+                                log.debug("Found assignment operator: %s", raw_op)
 
                                 # Look up the symbol
                                 symbol = self.current_scope.lookup(var_name)
                                 if not symbol:
                                     # If symbol doesn't exist, create it as a pinch type
-                                    print(f"Creating new symbol for {var_name}")
+                                    log.debug("Creating new symbol for %s", var_name)
                                     symbol = Symbol(var_name, "pinch")
                                     self.current_scope.add(var_name, symbol)
 
-                                print(f"\nFound symbol: {symbol}")
-                                print(f"Current symbol value: {symbol.get_value()}")
+                                log.debug("Found symbol: %s", symbol)
+                                log.debug("Current symbol value: %s", symbol.get_value())
 
                                 # Evaluate the expression
-                                print("\nEvaluating expression...")
-                                print(f"Expression node structure before evaluation:")
-                                self._print_node_structure(expr_node)
+                                log.debug("Evaluating expression...")
+                                log.debug("Expression node structure before evaluation:")
+                                self._log_node_structure(expr_node)
 
                                 value = self._evaluate_condition(expr_node)
-                                print(f"Expression evaluation result: {value}")
+                                log.debug("Expression evaluation result: %s", value)
 
                                 if value is not None:
                                     # Handle different assignment operators
@@ -1074,15 +1518,15 @@ class SemanticAnalyzer:
                                             ))
                                         else:
                                             symbol.set_value((symbol.get_value() or 0) % value)
-                                    print(f"Updated symbol value: {symbol.get_value()}")
+                                    log.debug("Updated symbol value: %s", symbol.get_value())
                                 else:
-                                    print(f"\nWARNING: Expression evaluation returned None for {var_name}")
-                                    print("Expression node structure:")
-                                    #self._print_node_structure(expr_node)
-                                    print("\nCurrent scope symbols:")
-                                    #self._print_scope_symbols()
+                                    log.warning("Expression evaluation returned None for %s", var_name)
+                                    log.debug("Expression node structure:")
+                                    #self._log_node_structure(expr_node)
+                                    log.debug("Current scope symbols:")
+                                    #self._log_scope_symbols()
                             elif raw_op in ["++", "--"]:
-                                print(f"\nFound inc_dec operator: {raw_op}")
+                                log.debug("Found inc_dec operator: %s", raw_op)
 
                                 # Look up the symbol
                                 symbol = self.current_scope.lookup(var_name)
@@ -1111,7 +1555,7 @@ class SemanticAnalyzer:
                         line=line_num
                     ))
                     return
-                print(var_op)
+                log.debug("%s", var_op)
                 if var_op == '++':
                     symbol.set_value((symbol.get_value() or 0) + 1)
                 elif var_op == '--':
@@ -1121,9 +1565,60 @@ class SemanticAnalyzer:
         if node.value == '<statement>':
             self.generic_visit(node)
 
+    def assign_element(self, symbol, name, index, op, value, line):
+        """
+        Applies name[index] op value to the recipe symbol holds, once the
+        index and the value are evaluated.  Element writes of every engine
+        end here, so they report the same errors.
+        """
+        if symbol is None:
+            self.errors.append(SemanticError("UNDEFINED_IDENTIFIER", f"Identifier [{name}] does not exist!",
+                                             line=line, identifier=name))
+            return
+        elements = symbol.value
+        if not isinstance(elements, RECIPE_STORAGE):
+            self.errors.append(SemanticError("NOT_A_RECIPE", f"Identifier [{name}] is not a recipe!",
+                                             line=line, identifier=name))
+            return
+        if value is None:
+            return
+        index_value = int(index)
+        bound = index_bound(symbol, elements)
+        if not 0 <= index_value < bound:
+            self.errors.append(SemanticError(
+                "ARRAY_OUT_OF_BOUNDS",
+                f"Accessed an index outside the allowed range. index[{index_value}]:range[{bound - 1}]",
+                line=line, identifier=name))
+            return
+        if op != "=":
+            if op in ("/=", "%=") and value == 0:
+                kind = "Division" if op == "/=" else "Modulo"
+                self.errors.append(SemanticError("DIVISION_BY_ZERO", f"{kind} by zero in assignment", line=line))
+                return
+            # The element and the value combine as they would in an expression
+            value = self._apply_operator(op[0], elements[index_value], value)
+            if value is None:
+                return
+        element_type = symbol.attributes.get('element_type') or _STORAGE_TYPES.get(getattr(elements, 'typecode', None))
+        allowed = ELEMENT_CLASSES.get(element_type)
+        if allowed is not None and value.__class__ not in allowed:
+            value_type = _VALUE_TYPES.get(value.__class__, value.__class__.__name__)
+            self.errors.append(SemanticError("TYPE_MISMATCH",
+                                             f"Expected value '{element_type}' received value '{value_type}'",
+                                             line=line, identifier=name))
+            return
+        try:
+            elements[index_value] = value
+        except OverflowError:
+            # array('q') and array('d') storage is shared with recipe parameters, so it cannot be
+            # swapped for a list the way Lowering.recipe_storage() keeps an oversized literal
+            self.errors.append(SemanticError("VALUE_OUT_OF_RANGE",
+                                             f"Value does not fit an element of recipe [{name}]",
+                                             line=line, identifier=name))
+
     def get_function_return(self, var_name, node, is_void=False):
         symbol = self.lookup_symbol(var_name)
-        print(f"Found Function Call[symbol]={symbol}")
+        log.debug("Found Function Call[symbol]=%s", symbol)
         if not is_void:
             if symbol.attributes.get("return_type", "none") == 'void':
                 self.errors.append(SemanticError(
@@ -1133,50 +1628,18 @@ class SemanticAnalyzer:
                 ))
                 return None
 
-        argument_node = node
-        # Create a new scope for the function body
-        old_scope = self.current_scope
-        self.current_scope = SymbolTable(debugName=f"function_{var_name}", parent=old_scope)
-        self.symbol_tables.append(self.current_scope)
-
-        # needs to process parameters
-        parameter_node = symbol.parameters
-        while parameter_node.children and argument_node.children:
-            # process the ing parameter
-            if parameter_node.children[0].value == ',':
-                data_type = parameter_node.children[1].children[0].value
-                data_name = parameter_node.children[2].value
-                parameter_node = parameter_node.children[3]
-            else:
-                data_type = parameter_node.children[0].children[0].value
-                data_name = parameter_node.children[1].value
-                parameter_node = parameter_node.children[2]
-            # assign the ing argument to the ing parameter
-
-            if argument_node.children[0].value == ',':
-                data_val = self._evaluate_expression(argument_node.children[1])
-                argument_node = argument_node.children[2]
-            else:
-                data_val = self._evaluate_expression(argument_node.children[0])
-                argument_node = argument_node.children[1]
-            attributes = None
-            if isinstance(data_val, list):
-                dimension = len(data_val)
-                attributes = {'dimensions': dimension, 'element_type': data_type}
-                data_type = "recipe"
-            new_symbol = Symbol(data_name, data_type, attributes)
-            new_symbol.set_value(data_val)
-            self.current_scope.add(data_name, new_symbol)
-
+        function_scope, missing, extra = self._bind_arguments(symbol, node, recipes=True)
         # add error handling here for the parameter and arguments
-        if parameter_node.children:
+        if missing:
+            self.scope_pool.release(function_scope)
             self.errors.append(SemanticError(
                 code="MISSING_ARGUMENTS",
                 message="Doesn't meet the required number of arguments!",
                 line=getattr(node, 'line_number', None)
             ))
             return None
-        if argument_node.children:
+        if extra:
+            self.scope_pool.release(function_scope)
             self.errors.append(SemanticError(
                 code="TOO_MANY_ARGUMENTS",
                 message="Too many arguments provided to function call!",
@@ -1184,19 +1647,76 @@ class SemanticAnalyzer:
             ))
             return None
 
+        return_val = self._run_function(symbol.signature, function_scope, is_void)
+        if not is_void:
+            return return_val
+
+    def _bind_arguments(self, symbol, argument_node, recipes):
+        """
+        Evaluates the arguments in the caller's scope and binds them, by
+        position, in a pooled scope whose parent is the program scope.
+
+        Returns the scope and the unmatched (params, args) counts.
+        """
+        signature = symbol.signature
+        if signature is None:
+            # Not a function: the old parameter walk failed on symbol.parameters
+            raise AttributeError("'NoneType' object has no attribute 'children'")
+        args = self.call_arguments.get(argument_node)
+        if args is None:
+            args = self.call_arguments[argument_node] = argument_nodes(argument_node)
+
+        function_scope = self.scope_pool.acquire(f"function_{signature.name}", self.program_scope)
+        symbols = function_scope.symbols
+        for (_, data_type, data_name), arg in zip(signature.bindings, args):
+            data_val = self._evaluate_expression(arg)
+            attributes = None
+            if recipes and isinstance(data_val, RECIPE_STORAGE):
+                attributes = {'dimensions': len(data_val), 'element_type': data_type}
+                data_type = "recipe"
+            symbols[data_name] = ParameterSymbol(data_name, data_type, data_val, attributes)
+        count = min(signature.arity, len(args))
+        return function_scope, signature.arity - count, len(args) - count
+
+    def _run_function(self, signature, function_scope, is_void):
+        # A hungry function has no return expression: calling one in an
+        # expression fails before its body runs
+        if not is_void and signature.return_expr is None:
+            self.scope_pool.release(function_scope)
+            raise IndexError("list index out of range")
+        self.budget.tick()
+        # A pure function called with the same arguments returns the cached
+        # value and reports the errors its first run reported
+        memo = signature.memo
+        key = None
+        if memo is not None and not is_void:
+            symbols = function_scope.symbols
+            key = memo.key([symbols.get(name) for _, _, name in signature.bindings])
+            cached = memo.get(key) if key is not None else None
+            if cached is not None:
+                self.scope_pool.release(function_scope)
+                self.errors.extend(cached[1])
+                return cached[0]
+            first_error = len(self.errors)
+        old_scope = self.current_scope
+        self.current_scope = function_scope
+        self.symbol_tables.append(function_scope)
+
         # did it this way so that i don't need to add the spit on the visit_statement,  that
-        self.generic_visit(symbol.value[0])
-        self.generic_visit(symbol.value[1])
+        # generic_visit() inlined, so that a call costs no extra Python stack frame
+        for block in (signature.decls, signature.body):
+            for child in block.children:
+                self.visit(child, block)
 
         return_val = ""
         if not is_void:
-            return_node = symbol.value[2]
-            return_val = self._evaluate_expression(return_node.children[1])
+            return_val = self._evaluate_expression(signature.return_expr)
 
         self.current_scope = old_scope
-        self.symbol_tables.pop()
-        if not is_void:
-            return return_val
+        self.scope_pool.release(self.symbol_tables.pop())
+        if key is not None:
+            memo.store(key, return_val, self.errors[first_error:])
+        return return_val
 
     def replace_if_bool(self, s):
         if s == "True":
@@ -1208,38 +1728,36 @@ class SemanticAnalyzer:
 
     def visit_serve_statement(self, node, parent=None):
         """Handle the 'serve' statement (function call)"""
-        print("\n" + "="*50)
-        print("DEBUG: Processing serve statement")
-        print("="*50)
-        print(f"Current scope: {self.current_scope.debugName}")
+        log.debug("Processing serve statement")
+        log.debug("Current scope: %s", self.current_scope.debugName)
         
         # If we have a parent node, use it
         if parent and hasattr(parent, 'children') and len(parent.children) >= 3:
             statement_node = parent
-            print("Using parent node for statement")
+            log.debug("Using parent node for statement")
         else:
             # Otherwise, look for the statement node in the current node's children
             if hasattr(node, 'children') and node.children:
                 for child in node.children:
                     if hasattr(child, 'value') and child.value == "<statement>":
                         statement_node = child
-                        print("Found statement node in children")
+                        log.debug("Found statement node in children")
                         break
                 else:
-                    print("No statement node found")
+                    log.debug("No statement node found")
                     return
             else:
-                print("No children in node")
+                log.debug("No children in node")
                 return
         
         # The argument should be in the third child (index 2)
         if len(statement_node.children) < 3:
-            print("Statement node has insufficient children")
+            log.debug("Statement node has insufficient children")
             return
 
         arg_node = statement_node.children[2]
-        print(f"\nArgument node: {arg_node.value if hasattr(arg_node, 'value') else 'No value'}")
-        print(f"Argument node type: {arg_node.node_type if hasattr(arg_node, 'node_type') else 'No type'}")
+        log.debug("Argument node: %s", arg_node.value if hasattr(arg_node, 'value') else 'No value')
+        log.debug("Argument node type: %s", arg_node.node_type if hasattr(arg_node, 'node_type') else 'No type')
         
         # Handle string concatenation
         result = ""
@@ -1249,14 +1767,14 @@ class SemanticAnalyzer:
             initial_node = arg_node.children[0]
             if hasattr(initial_node, 'children') and initial_node.children:
                 first_value = initial_node.children[0]
-                print(f"\nProcessing initial value3")
-                print(f"First value node: {first_value.value if hasattr(first_value, 'value') else 'No value'}")
-                print(f"First value type: {first_value.node_type if hasattr(first_value, 'node_type') else 'No type'}")
+                log.debug("Processing initial value3")
+                log.debug("First value node: %s", first_value.value if hasattr(first_value, 'value') else 'No value')
+                log.debug("First value type: %s", first_value.node_type if hasattr(first_value, 'node_type') else 'No type')
             
                 if hasattr(first_value, 'node_type'):
                     if first_value.node_type == "pastaliterals":
                         result = first_value.value.strip('"')
-                        print(f"Found string literal: {result}")
+                        log.debug("Found string literal: %s", result)
             elif initial_node.node_type == 'id':
                 #it ing works now
                 tail_node = arg_node.children[1]
@@ -1288,13 +1806,14 @@ class SemanticAnalyzer:
                         #it's a ing array <3  this shi
                         index_value = int(self._evaluate_expression(tail_node.children[1]))
                         symbol = self.lookup_symbol(initial_node.value)
-                        listed_value = list(symbol.get_value())
-                        if index_value >= len(listed_value):
+                        listed_value = recipe_elements(symbol.get_value())
+                        bound = index_bound(symbol, listed_value)
+                        if not 0 <= index_value < bound:
                             line_num = getattr(node, 'line_number', None)
                             var_name = initial_node.value
                             self.errors.append(SemanticError(
                                 code="ARRAY_OUT_OF_BOUNDS",
-                                message=f"Accessed an index outside the allowed range. index[{index_value}]:range[{len(listed_value)-1}]",
+                                message=f"Accessed an index outside the allowed range. index[{index_value}]:range[{bound - 1}]",
                                 line=line_num,
                                 identifier=var_name
                             ))
@@ -1324,32 +1843,32 @@ class SemanticAnalyzer:
                             result = self.replace_if_bool(str(return_val).replace('"', '').replace("-", "~"))
                 else:
                     symbol = self.lookup_symbol(initial_node.value)
-                    print(f"Found symbol: {symbol}")
+                    log.debug("Found symbol: %s", symbol)
                     result = self.replace_if_bool(str(symbol.get_value() if hasattr(symbol, 'get_value') else "").replace("-", "~"))
 
             else:
-                print("acts as a fallback to do some shit[serve]")
+                log.debug("acts as a fallback to do some shit[serve]")
         # Process any serve_tail concatenations
         if len(statement_node.children) > 3:
             serve_tail = statement_node.children[3]
-            print("\nProcessing serve_tail")
+            log.debug("Processing serve_tail")
             while hasattr(serve_tail, 'children') and serve_tail.children:
                 if serve_tail.children[0].value == "+":
-                    print("Found concatenation operator")
+                    log.debug("Found concatenation operator")
                     # Get the next value3
                     next_value_node = serve_tail.children[1]
                     if hasattr(next_value_node, 'children') and next_value_node.children:
                         next_value = next_value_node.children[0]
-                        print(f"\nNext value node: {next_value.value if hasattr(next_value, 'value') else 'No value'}")
-                        print(f"Next value type: {next_value.node_type if hasattr(next_value, 'node_type') else 'No type'}")
+                        log.debug("Next value node: %s", next_value.value if hasattr(next_value, 'value') else 'No value')
+                        log.debug("Next value type: %s", next_value.node_type if hasattr(next_value, 'node_type') else 'No type')
                         
                         if hasattr(next_value, 'children') and next_value.children:
                             add_node = next_value.children[0]
                             if add_node.node_type == "pastaliterals":
                                 result += add_node.value.strip('"')
-                                print(f"Concatenated string literal: {result}")
+                                log.debug("Concatenated string literal: %s", result)
                             else:
-                                print("Hello World!")
+                                log.debug("Hello World!")
                         elif next_value.node_type == 'id':
                             # it ing works now
                             tail_node = next_value_node.children[1]
@@ -1370,13 +1889,14 @@ class SemanticAnalyzer:
                                     # it's a ing array <3  this shi
                                     index_value = int(self._evaluate_expression(tail_node.children[1]))
                                     symbol = self.lookup_symbol(next_value.value)
-                                    listed_value = list(symbol.get_value())
-                                    if index_value >= len(listed_value):
+                                    listed_value = recipe_elements(symbol.get_value())
+                                    bound = index_bound(symbol, listed_value)
+                                    if not 0 <= index_value < bound:
                                         line_num = getattr(node, 'line_number', None)
                                         var_name = next_value.value
                                         self.errors.append(SemanticError(
                                             code="ARRAY_OUT_OF_BOUNDS",
-                                            message=f"Accessed an index outside the allowed range. index[{index_value}]:range[{len(listed_value) - 1}]",
+                                            message=f"Accessed an index outside the allowed range. index[{index_value}]:range[{bound - 1}]",
                                             line=line_num,
                                             identifier=var_name
                                         ))
@@ -1388,88 +1908,64 @@ class SemanticAnalyzer:
                                         result += self.replace_if_bool(str(return_val).replace('"', '').replace("-", "~"))
                             else:
                                 symbol = self.lookup_symbol(next_value.value)
-                                print(f"Found symbol: {symbol}")
+                                log.debug("Found symbol: %s", symbol)
                                 result += self.replace_if_bool(str(symbol.get_value() if hasattr(symbol, 'get_value') else "").replace("-", "~"))
 
-                            print(f"Concatenated result: {result}")
+                            log.debug("Concatenated result: %s", result)
                     # Move to next serve_tail if exists
                     if len(serve_tail.children) > 2:
                         serve_tail = serve_tail.children[2]
-                        print("Moving to next serve_tail")
+                        log.debug("Moving to next serve_tail")
                     else:
-                        print("No more serve_tail to process")
+                        log.debug("No more serve_tail to process")
                         break
                 else:
-                    print("hi")
+                    log.debug("hi")
                     break
         
-        print(f"\nFinal concatenated result: {result}")
+        log.debug("Final concatenated result: %s", result)
         if result:  # Only add non-empty results
-            self.output_buffer.append(result)
+            self.output.write(result)
 
     def visit_make_statement(self, node, parent=None):
         """Handle the 'serve' statement (function call)"""
-        print("\n" + "=" * 50)
-        print("DEBUG: Processing make statement")
-        print("=" * 50)
-        print(f"Current scope: {self.current_scope.debugName}")
+        log.debug("Processing make statement")
+        log.debug("Current scope: %s", self.current_scope.debugName)
 
         # If we have a parent node, use it
         if parent and hasattr(parent, 'children') and len(parent.children) >= 3:
             statement_node = parent
-            print("Using parent node for statement")
+            log.debug("Using parent node for statement")
         else:
             # Otherwise, look for the statement node in the current node's children
             if hasattr(node, 'children') and node.children:
                 for child in node.children:
                     if hasattr(child, 'value') and child.value == "<statement>":
                         statement_node = child
-                        print("Found statement node in children")
+                        log.debug("Found statement node in children")
                         break
                 else:
-                    print("No statement node found")
+                    log.debug("No statement node found")
                     return
             else:
-                print("No children in node")
+                log.debug("No children in node")
                 return
 
         # The argument should be in the third child (index 2)
         if len(statement_node.children) < 3:
-            print("Statement node has insufficient children")
+            log.debug("Statement node has insufficient children")
             return
 
         # children 2 'cause that shi is the second, second ing dumbahh
         arg_node = statement_node.children[2]
-        print(f"\nArgument node: {arg_node.value if hasattr(arg_node, 'value') else 'No value'}")
-        print(f"Argument node type: {arg_node.node_type if hasattr(arg_node, 'node_type') else 'No type'}")
+        log.debug("Argument node: %s", arg_node.value if hasattr(arg_node, 'value') else 'No value')
+        log.debug("Argument node type: %s", arg_node.node_type if hasattr(arg_node, 'node_type') else 'No type')
 
         if arg_node.node_type == 'id':
             #val = input("ask for input: ")
             #raise Exception("Needs input for identifier")
             symbol = self.lookup_symbol(arg_node.value)
-            def validate_input(val):
-                # Check if the value is None (cancelled)
-                if val is None:
-                    return None
-                val = val.replace("~", "-")
-
-                # Check if the value is a valid number (float or int)
-                try:
-                    # Try converting the input to a float (this will handle both int and float cases)
-                    float_val = float(val)
-                    # Check if the value can be safely cast to an int (if it's an integer value)
-                    if float_val.is_integer():
-                        return int(float_val)  # Return as integer
-                    else:
-                        return float_val  # Return as float
-                except ValueError:
-                    # If it's not a number, check if it's a string (non-empty)
-                    if isinstance(val, str) and val.strip() != "":
-                        return val  # Return as string
-                    else:
-                        return None  # Return None if it's an invalid input
-
-            val = simpledialog.askstring("Input needed", f"Please enter value for [{symbol.name}]:")
+            val = self.input_provider.read(symbol.name, getattr(node, 'line_number', None))
 
             val = validate_input(val)
 
@@ -1485,48 +1981,48 @@ class SemanticAnalyzer:
                 ))
                 return None
             symbol.value = val
-            self.output_buffer.append("input: " + str(val).replace("-","~") + "")
+            self.output.write("input: " + str(val).replace("-","~") + "")
 
     def _evaluate_function_call(self, func_name):
         """Evaluate a function call and return its output"""
-        print(f"\n=== Evaluating function call: {func_name} ===")
+        eval_log.debug("=== Evaluating function call: %s ===", func_name)
         
         # Look up the function in the symbol table
         func_symbol = self.global_scope.lookup(func_name)
         if not func_symbol or func_symbol.type != "function":
-            print(f"Function {func_name} not found in symbol table")
+            eval_log.debug("Function %s not found in symbol table", func_name)
             return None
         
-        print(f"Found function symbol: {func_symbol}")
+        eval_log.debug("Found function symbol: %s", func_symbol)
         
         # Find the function's body in the AST
         if not hasattr(self, 'parse_tree') or not self.parse_tree:
-            print("No parse tree available")
+            eval_log.debug("No parse tree available")
             return None
             
-        print("Searching for function definition in parse tree...")
+        eval_log.debug("Searching for function definition in parse tree...")
         
         # First find the <function> node
         function_node = None
         for node in self.parse_tree.children:
             if hasattr(node, 'value') and node.value == "<function>":
-                print(f"Found function node: {node.value}")
+                eval_log.debug("Found function node: %s", node.value)
                 # Check if this is the function we're looking for
                 if len(node.children) >= 3:
                     if node.children[0].value == "full" and node.children[2].value == func_name:
                         function_node = node
-                        print(f"Found full function definition for {func_name}")
+                        eval_log.debug("Found full function definition for %s", func_name)
                         break
                     elif node.children[0].value == "hungry" and node.children[1].value == func_name:
                         function_node = node
-                        print(f"Found hungry function definition for {func_name}")
+                        eval_log.debug("Found hungry function definition for %s", func_name)
                         break
         
         if not function_node:
-            print(f"Could not find function definition for {func_name}")
+            eval_log.debug("Could not find function definition for %s", func_name)
             return None
             
-        print(f"Found function definition for {func_name}")
+        eval_log.debug("Found function definition for %s", func_name)
         
         # Create a new scope for the function
         old_scope = self.current_scope
@@ -1540,14 +2036,14 @@ class SemanticAnalyzer:
             # Execute the function body
             for child in function_node.children:
                 if hasattr(child, 'value') and child.value == "<statement_block>":
-                    print("Processing function body...")
+                    eval_log.debug("Processing function body...")
                     for stmt in child.children:
                         if hasattr(stmt, 'value') and stmt.value == "<statement>":
                             self.visit(stmt)
             
             # Get the function's output
             function_output = self.output_buffer.copy()
-            print(f"Function {func_name} output: {function_output}")
+            eval_log.debug("Function %s output: %s", func_name, function_output)
             
             return function_output
             
@@ -1561,16 +2057,8 @@ class SemanticAnalyzer:
         if not self.output_buffer:
             return "===Program executed successfully==="
         
-        # Process each item in the output buffer
-        processed_output = []
-        for item in self.output_buffer:
-            # Strip quotes from string literals if present
-            if isinstance(item, str):
-                item = item.strip('"')
-            processed_output.append(str(item))
-        
-        # Join the processed output with newlines
-        output = "\n".join(processed_output)
+        # The sink has already stripped the quotes from each line
+        output = "\n".join(self.output_buffer)
         
         # Only add success message if we have actual output
         if output:
@@ -1578,16 +2066,23 @@ class SemanticAnalyzer:
         
         return output
     
-    def visit_looping_statement(self, node):
+    def enter_block_scope(self, kind):
+        """Makes a pooled loop or conditional scope current; returns the scope to restore."""
+        old_scope = self.current_scope
+        self.current_scope = self.scope_pool.acquire(kind, old_scope)
+        self.symbol_tables.append(self.current_scope)
+        return old_scope
+
+    def leave_block_scope(self, old_scope):
+        self.scope_pool.release(self.symbol_tables.pop())
+        self.current_scope = old_scope
+
+    def visit_looping_statement(self, node, parent=None):
         if not node.children:
             return
         first_child = node.children[0]
         #add scope for the local-local
-        old_scope = self.current_scope
-
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        self.current_scope = SymbolTable(debugName=f"loop_{timestamp}", parent=old_scope)
-        self.symbol_tables.append(self.current_scope)
+        old_scope = self.enter_block_scope("loop")
 
         if hasattr(first_child, 'node_type') and first_child.node_type == "for":
             self._handle_for_loop(node)
@@ -1596,13 +2091,12 @@ class SemanticAnalyzer:
         elif hasattr(first_child, 'node_type') and first_child.node_type == "keepmix":
             self._handle_keepmix_loop(node)
 
-        self.symbol_tables.pop()
-        self.current_scope = old_scope
+        self.leave_block_scope(old_scope)
         
         # Continue with the generic visit to process child nodes???????? ARE YOU ING RETARDED? THIS IS A ING LOOP
         #self.generic_visit(node)
 
-    def visit_conditional_statement(self, node):
+    def visit_conditional_statement(self, node, parent=None):
         if not node.children:
             return
         first_child = node.children[0]
@@ -1622,19 +2116,15 @@ class SemanticAnalyzer:
 
         condition_node = node.children[2]
         eval_result = self._evaluate_condition(condition_node)
-        print(f"Taste Condition Evaluation := " + str(eval_result))
+        log.debug("Taste Condition Evaluation := %s", eval_result)
         if eval_result:
             # add scope for the local-local
-            old_scope = self.current_scope
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-            self.current_scope = SymbolTable(debugName=f"conditional_{timestamp}", parent=old_scope)
-            self.symbol_tables.append(self.current_scope)
+            old_scope = self.enter_block_scope("conditional")
 
             statement_node = node.children[5]
             self.generic_visit(statement_node)
 
-            self.symbol_tables.pop()
-            self.current_scope = old_scope
+            self.leave_block_scope(old_scope)
         else:
             tail_node = node.children[7]
             self._handle_conditional_tail(tail_node)
@@ -1693,7 +2183,7 @@ class SemanticAnalyzer:
                 self._handle_case_tail(id_node, case_tail)
         elif hasattr(first_child, 'node_type') and first_child.node_type == "default":
             statement_node = node.children[2]
-            print(statement_node)
+            log.debug("%s", statement_node)
             self.generic_visit(statement_node)
 
 
@@ -1712,36 +2202,28 @@ class SemanticAnalyzer:
         if hasattr(first_child, 'node_type') and first_child.node_type == "elif":
             condition_node = node.children[2]
             eval_result = self._evaluate_condition(condition_node)
-            print(f"Taste Condition Evaluation := " + str(eval_result))
+            log.debug("Taste Condition Evaluation := %s", eval_result)
             if eval_result:
 
                 # add scope for the local-local
-                old_scope = self.current_scope
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-                self.current_scope = SymbolTable(debugName=f"conditional_{timestamp}", parent=old_scope)
-                self.symbol_tables.append(self.current_scope)
+                old_scope = self.enter_block_scope("conditional")
 
                 statement_node = node.children[5]
                 self.generic_visit(statement_node)
 
-                self.symbol_tables.pop()
-                self.current_scope = old_scope
+                self.leave_block_scope(old_scope)
             else:
                 tail_node = node.children[7]
                 self._handle_conditional_tail(tail_node)
         elif hasattr(first_child, 'node_type') and first_child.node_type == "mix":
                 # add scope for the local-local
-                old_scope = self.current_scope
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-                self.current_scope = SymbolTable(debugName=f"conditional_{timestamp}", parent=old_scope)
-                self.symbol_tables.append(self.current_scope)
+                old_scope = self.enter_block_scope("conditional")
 
                 statement_node = node.children[2]
                 self.generic_visit(statement_node)
 
                 #remove scope
-                self.symbol_tables.pop()
-                self.current_scope = old_scope
+                self.leave_block_scope(old_scope)
 
     def _handle_keepmix_loop(self, node):
         """
@@ -1753,13 +2235,15 @@ class SemanticAnalyzer:
 
         statement_node = node.children[2]
         self.generic_visit(statement_node)
+        self.budget.tick(node.line_number)
 
         condition_node = node.children[6]
         eval_result = self._evaluate_condition(condition_node)
-        print(f"Do-While Condition Evaluation := " + str(eval_result))
+        log.debug("Do-While Condition Evaluation := %s", eval_result)
 
         while eval_result:
             self.generic_visit(statement_node)
+            self.budget.tick(node.line_number)
             eval_result = self._evaluate_condition(condition_node)
 
         """OLD, uses recursion"""
@@ -1782,10 +2266,11 @@ class SemanticAnalyzer:
         """NEW, just python while loop"""
         condition_node = node.children[2]
         eval_result = self._evaluate_condition(condition_node)
-        print(f"While Condition Evaluation := " + str(eval_result))
+        log.debug("While Condition Evaluation := %s", eval_result)
         while eval_result:
             statement_node = node.children[5]
             self.generic_visit(statement_node)
+            self.budget.tick(node.line_number)
             eval_result = self._evaluate_condition(condition_node)
         """OLD, uses recursion"""
         # condition_node = node.children[2]
@@ -1816,7 +2301,7 @@ class SemanticAnalyzer:
         if _dtype.children:
             # Create symbol and add it to the current scope for the first variable
             symbol = Symbol(_dname, _dtype.children[0].value)
-            print(f"Adding symbol {_dname} to scope {self.current_scope.debugName}")
+            log.debug("Adding symbol %s to scope %s", _dname, self.current_scope.debugName)
             self.current_scope.add(_dname, symbol)
             if _dvalue.node_type == "id":
                 _dvalue = self.lookup_symbol(_dvalue.value)
@@ -1831,14 +2316,14 @@ class SemanticAnalyzer:
                 _dvalue = self.lookup_symbol(_dvalue.value)
             else:
                 _dvalue = self._extract_literal_value(_dvalue)
-            print(f"Replacing value of {_dname} to {_dvalue} from scope {self.current_scope.debugName}")
+            log.debug("Replacing value of %s to %s from scope %s", _dname, _dvalue, self.current_scope.debugName)
 
             if _dvalue is not None:
                 symbol.set_value(_dvalue)
 
         condition_expr = node.children[7]
         eval_result = self._evaluate_condition(condition_expr)
-        print(f"For Condition Evaluation := " + str(eval_result))
+        log.debug("For Condition Evaluation := %s", eval_result)
 
         while eval_result:
             #execute code block
@@ -1858,12 +2343,13 @@ class SemanticAnalyzer:
                     line=line_num
                 ))
                 return
-            print(var_op)
+            log.debug("%s", var_op)
             if var_op == '++':
                 symbol.set_value((symbol.get_value() or 0) + 1)
             elif var_op == '--':
                 symbol.set_value((symbol.get_value() or 0) - 1)
 
+            self.budget.tick(node.line_number)
             eval_result = self._evaluate_condition(condition_expr)
 
 
@@ -1951,7 +2437,7 @@ class SemanticAnalyzer:
     #-----------------------------------------------------------------
     # Return statement handling
     #-----------------------------------------------------------------
-    def visit_return_statement(self, node):
+    def visit_return_statement(self, node, parent=None):
         if not self.current_function:
             line_num = getattr(node, 'line_number', None)
             self.errors.append(SemanticError(
@@ -2026,6 +2512,38 @@ class SemanticAnalyzer:
 
         pass
 
+    #-----------------------------------------------------------------
+    # Literal decoding and constant folding
+    #-----------------------------------------------------------------
+    def prepare_constants(self, parse_tree):
+        """
+        Runs before the tree is walked.  Every literal token is decoded once,
+        and every <arithmetic_exp> and <condition> that Lowering folds to a
+        constant (no identifiers, and no operation that reports an error or
+        divides by zero) is evaluated once.  The evaluators return these values
+        instead of re-reading the literals on every evaluation.
+        """
+        constants = self.constants
+        pending = [parse_tree]
+        while pending:
+            node = pending.pop()
+            node_type = node.node_type
+            if node_type in _LITERAL_TYPES:
+                constants[node] = decode_literal(node_type, node.value)
+                self.signed_literals[node] = decode_literal(node_type, node.value, signed=True)
+                continue
+            if node_type == "<arithmetic_exp>":
+                folded = lower_arith(node)
+                if isinstance(folded, Const):
+                    constants[node] = folded.value
+                    continue
+            elif node_type == "<condition>":
+                folded = lower_condition(node)
+                if isinstance(folded, Const):
+                    self.condition_constants[node] = folded.value
+                    continue
+            pending.extend(node.children)
+
     def _process_arithmetic_exp_tail(self, tail_node, accumulated_value):
         if tail_node.value == "<arithmetic_exp_tail>" and hasattr(tail_node, 'children') and tail_node.children:
             if tail_node.children[0].value != "λ":
@@ -2035,16 +2553,16 @@ class SemanticAnalyzer:
 
                 if operator_node.children:
                     actual_operator = operator_node.children[0].value
-                    print(f"Additive operator: {actual_operator}")
+                    eval_log.debug("Additive operator: %s", actual_operator)
                 else:
                     actual_operator = operator_node.value
-                    print(f"Direct additive operator: {actual_operator}")
+                    eval_log.debug("Direct additive operator: %s", actual_operator)
 
                 right_value = self._evaluate_expression(term_node)
-                print(f"Next term value: {right_value}")
+                eval_log.debug("Next term value: %s", right_value)
 
                 result = self._apply_operator(actual_operator, accumulated_value, right_value)
-                print(f"Result after applying additive operator: {result}")
+                eval_log.debug("Result after applying additive operator: %s", result)
 
                 return self._process_arithmetic_exp_tail(next_tail_node, result)
         return accumulated_value
@@ -2058,33 +2576,34 @@ class SemanticAnalyzer:
 
                 if operator_node.children:
                     actual_operator = operator_node.children[0].value
-                    print(f"Multiplicative operator: {actual_operator}")
+                    eval_log.debug("Multiplicative operator: %s", actual_operator)
                 else:
                     actual_operator = operator_node.value
-                    print(f"Direct multiplicative operator: {actual_operator}")
+                    eval_log.debug("Direct multiplicative operator: %s", actual_operator)
 
                 right_value = self._evaluate_expression(factor_node)
-                print(f"Next factor value: {right_value}")
+                eval_log.debug("Next factor value: %s", right_value)
 
                 result = self._apply_operator(actual_operator, accumulated_value, right_value)
-                print(f"Result after applying multiplicative operator: {result}")
+                eval_log.debug("Result after applying multiplicative operator: %s", result)
 
                 return self._process_term_tail(next_tail_node, result)
         return accumulated_value
 
     def _evaluate_expression(self, node):
+        constant = self.constants.get(node, _NOT_CONSTANT)
+        if constant is not _NOT_CONSTANT:
+            return constant
         if not node:
             return None
             
-        print("\n" + "="*50)
-        print("DEBUG: Starting expression evaluation")
-        print("="*50)
-        print(f"Evaluating node: {node.value if hasattr(node, 'value') else 'No value'}")
-        print(f"Node type: {node.node_type if hasattr(node, 'node_type') else 'No type'}")
-        if hasattr(node, 'children'):
-            print(f"Children count: {len(node.children)}")
+        eval_log.debug("Starting expression evaluation")
+        eval_log.debug("Evaluating node: %s", node.value if hasattr(node, 'value') else 'No value')
+        eval_log.debug("Node type: %s", node.node_type if hasattr(node, 'node_type') else 'No type')
+        if eval_log.debug_enabled and hasattr(node, 'children'):
+            eval_log.debug("Children count: %s", len(node.children))
             for i, child in enumerate(node.children[:3]):  # Show first 3 children for brevity
-                print(f"Child {i}: {child.value if hasattr(child, 'value') else 'No value'}")
+                eval_log.debug("Child %s: %s", i, child.value if hasattr(child, 'value') else 'No value')
         
         # Handle direct literals
         if not hasattr(node, 'children') or not node.children:
@@ -2092,63 +2611,46 @@ class SemanticAnalyzer:
                 if node.node_type == "pinchliterals":
                     try:
                         value = int(node.value)
-                        print(f"Direct pinch literal value: {value}")
+                        eval_log.debug("Direct pinch literal value: %s", value)
                         return value
                     except ValueError:
-                        print(f"Invalid pinch literal: {node.value}")
+                        eval_log.debug("Invalid pinch literal: %s", node.value)
                         return None
                 elif node.node_type == "skimliterals":
                     try:
                         value = float(node.value)
-                        print(f"Direct skim literal value: {value}")
+                        eval_log.debug("Direct skim literal value: %s", value)
                         return value
                     except ValueError:
-                        print(f"Invalid skim literal: {node.value}")
+                        eval_log.debug("Invalid skim literal: %s", node.value)
                         return None
                 elif node.node_type == "pastaliterals":
                     value = node.value.strip('"')
-                    print(f"Direct pasta literal value: {value}")
+                    eval_log.debug("Direct pasta literal value: %s", value)
                     return value
                 elif node.node_type == "id":
-                    # Enhanced variable lookup that fixes scope issues
                     var_name = node.value
-                    # Try all variable lookup strategies to ensure we find the variable
-                    symbol = None
-                    
-                    # First, direct lookup in current scope
-                    if hasattr(self, 'current_scope') and self.current_scope:
-                        symbol = self.current_scope.lookup(var_name, True)
-                    
-                    # If not found, try global scope
-                    if not symbol and hasattr(self, 'global_scope') and self.global_scope:
-                        symbol = self.global_scope.lookup(var_name, True)
-                    
-                    # Finally, search all symbol tables
-                    if not symbol and hasattr(self, 'symbol_tables'):
-                        for table in self.symbol_tables:
-                            if var_name in table.symbols:
-                                symbol = table.symbols[var_name]
-                                break
-                    
+                    # The current scope chain ends at the global scope
+                    symbol = self.current_scope.lookup(var_name, True)
                     if symbol:
                         value = symbol.get_value()
-                        print(f"Found symbol {var_name} with value: {value}")
+                        eval_log.debug("Found symbol %s with value: %s", var_name, value)
                         return value
                     else:
-                        print(f"Symbol not found: {var_name}")
+                        eval_log.debug("Symbol not found: %s", var_name)
                         return None
             return None
         
         # Handle expression nodes
         if node.value == "<expression>":
-            print("Processing <expression> node")
+            eval_log.debug("Processing <expression> node")
             if len(node.children) >= 2:
                 operand_node = node.children[0]  # First child is <expression_operand>
                 tail_node = node.children[1]     # Second child is <expression_tail>
                 
                 # Evaluate the first operand
                 left_value = self._evaluate_expression(operand_node)
-                print(f"Left operand value: {left_value}")
+                eval_log.debug("Left operand value: %s", left_value)
                 
                 # Process any operations in the expression tail
                 if left_value is not None:
@@ -2158,15 +2660,15 @@ class SemanticAnalyzer:
         
         # Handle expression_operand nodes
         elif node.value == "<expression_operand>":
-            print("Processing <expression_operand> node")
+            eval_log.debug("Processing <expression_operand> node")
             if node.children:
                 # Check if this is a parenthesized expression
                 if len(node.children) >= 3 and node.children[0].value == "(":
-                    print("Found parenthesized expression")
+                    eval_log.debug("Found parenthesized expression")
                     # The actual expression is the second child (index 1)
                     expr_node = node.children[1]
                     value = self._evaluate_expression(expr_node)
-                    print(f"Parenthesized expression value: {value}")
+                    eval_log.debug("Parenthesized expression value: %s", value)
                     return value
                 else:
                     # Regular operand, evaluate normally
@@ -2174,7 +2676,7 @@ class SemanticAnalyzer:
         
         # Handle value nodes
         elif node.value in ["<value>", "<value2>", "<value3>"]:
-            print(f"Processing {node.value} node")
+            eval_log.debug("Processing %s node", node.value)
             if len(node.children) >= 1:
                 # First child could be an ID or a literal
                 first_child = node.children[0]
@@ -2184,7 +2686,7 @@ class SemanticAnalyzer:
                     if len(node.children) >= 3:  # Should have "(", expr, ")"
                         expr_node = node.children[1]
                         value = self._evaluate_expression(expr_node)
-                        print(f"Parenthesized value: {value}")
+                        eval_log.debug("Parenthesized value: %s", value)
                         return value
 
                 if hasattr(first_child, 'node_type') and first_child.node_type == "id":
@@ -2224,7 +2726,7 @@ class SemanticAnalyzer:
                                 return return_val
                             else:
                                 symbol = self.lookup_symbol(first_child.value)
-                                print(f"Found Function Call[symbol]={symbol}")
+                                eval_log.debug("Found Function Call[symbol]=%s", symbol)
                                 if symbol.attributes.get("return_type", "none") == 'void':
                                     self.errors.append(SemanticError(
                                         code="VOID_FUNCTION",
@@ -2233,61 +2735,23 @@ class SemanticAnalyzer:
                                     ))
 
                                 argument_node = node.children[1].children[1]
-                                # Create a new scope for the function body
-                                old_scope = self.current_scope
-                                self.current_scope = SymbolTable(debugName=f"function_{first_child.value}",
-                                                                 parent=old_scope)
-                                self.symbol_tables.append(self.current_scope)
-
-                                # needs to process parameters
-                                parameter_node = symbol.parameters
-                                while parameter_node.children and argument_node.children:
-                                    # process the ing parameter
-                                    if parameter_node.children[0].value == ',':
-                                        data_type = parameter_node.children[1].children[0].value
-                                        data_name = parameter_node.children[2].value
-                                        parameter_node = parameter_node.children[3]
-                                    else:
-                                        data_type = parameter_node.children[0].children[0].value
-                                        data_name = parameter_node.children[1].value
-                                        parameter_node = parameter_node.children[2]
-                                    # assign the ing argument to the ing parameter
-
-                                    if argument_node.children[0].value == ',':
-                                        data_val = self._evaluate_expression(argument_node.children[1])
-                                        argument_node = argument_node.children[2]
-                                    else:
-                                        data_val = self._evaluate_expression(argument_node.children[0])
-                                        argument_node = argument_node.children[1]
-                                    new_symbol = Symbol(data_name, data_type)
-                                    new_symbol.set_value(data_val)
-                                    self.current_scope.add(data_name, new_symbol)
-
-                                # add error handling here for the parameter and arguments
-                                if parameter_node.children:
+                                # Same binding as get_function_return, but argument
+                                # errors are reported and the call still runs
+                                function_scope, missing, extra = self._bind_arguments(symbol, argument_node, recipes=False)
+                                if missing:
                                     self.errors.append(SemanticError(
                                         code="MISSING_ARGUMENTS",
                                         message="Doesn't meet the required number of arguments!",
                                         line=getattr(node, 'line_number', None)
                                     ))
-                                if argument_node.children:
+                                if extra:
                                     self.errors.append(SemanticError(
                                         code="TOO_MANY_ARGUMENTS",
                                         message="Too many arguments provided to function call!",
                                         line=getattr(node, 'line_number', None)
                                     ))
 
-                                return_node = symbol.value[2]
-                                #did it this way so that i don't need to add the spit on the visit_statement,  that
-                                self.generic_visit(symbol.value[0])
-                                self.generic_visit(symbol.value[1])
-
-
-                                return_val = self._evaluate_expression(return_node.children[1])
-
-                                self.current_scope = old_scope
-                                self.symbol_tables.pop()
-
+                                return_val = self._run_function(symbol.signature, function_scope, False)
                                 return return_val
                         #this is the ing array call
                         elif node.children[1].children[0].value == '[':
@@ -2300,17 +2764,17 @@ class SemanticAnalyzer:
                                     identifier=first_child.value
                                 ))
                                 return
-                            print("a"*100)
                             #it's a ing array <3  this shi
                             index_value = int(self._evaluate_expression(node.children[1].children[1]))
                             symbol = self.lookup_symbol(first_child.value)
-                            listed_value = list(symbol.get_value())
-                            if index_value >= len(listed_value):
+                            listed_value = recipe_elements(symbol.get_value())
+                            bound = index_bound(symbol, listed_value)
+                            if not 0 <= index_value < bound:
                                 line_num = getattr(node, 'line_number', None)
                                 var_name = first_child.value
                                 self.errors.append(SemanticError(
                                     code="ARRAY_OUT_OF_BOUNDS",
-                                    message=f"Accessed an index outside the allowed range. index[{index_value}]:range[{len(listed_value) - 1}]",
+                                    message=f"Accessed an index outside the allowed range. index[{index_value}]:range[{bound - 1}]",
                                     line=line_num,
                                     identifier=var_name
                                 ))
@@ -2341,10 +2805,10 @@ class SemanticAnalyzer:
                         var_name = first_child.value
                         symbol = self.lookup_symbol(var_name)
                         if symbol:
-                            print(f"Found variable {var_name} with value: {symbol.get_value()}")
+                            eval_log.debug("Found variable %s with value: %s", var_name, symbol.get_value())
                             return symbol.get_value()
                         else:
-                            print(f"Variable not found: {var_name}")
+                            eval_log.debug("Variable not found: %s", var_name)
                             return None
                 else:
                     # For other types, evaluate the child
@@ -2352,31 +2816,31 @@ class SemanticAnalyzer:
         
         # Handle value_id_tail nodes
         elif node.value == "<value_id_tail>":
-            print("Processing <value_id_tail> node")
+            eval_log.debug("Processing <value_id_tail> node")
             # This node is usually empty for basic expressions, so just return None
             return None
         
         # Handle literals and literals nodes
         elif node.value == "<literals>" or (hasattr(node, 'node_type') and node.node_type in ["pinchliterals", "skimliterals", "pastaliterals"]):
-            print(f"Processing literals node: {node.value}")
+            eval_log.debug("Processing literals node: %s", node.value)
             if hasattr(node, 'node_type'):
                 if node.node_type == "pinchliterals":
                     try:
                         value = int(node.value.replace("~", "-"))
-                        print(f"Parsed literal integer: {value}")
+                        eval_log.debug("Parsed literal integer: %s", value)
                         return value
                     except (ValueError, TypeError):
                         pass
                 elif node.node_type == "skimliterals":
                     try:
                         value = float(node.value.replace("~", "-"))
-                        print(f"Parsed literal float: {value}")
+                        eval_log.debug("Parsed literal float: %s", value)
                         return value
                     except (ValueError, TypeError):
                         pass
                 elif node.node_type == "pastaliterals":
                     value = node.value.strip('"')
-                    print(f"Parsed literal string: {value}")
+                    eval_log.debug("Parsed literal string: %s", value)
                     return value
             
             # For <literals> nodes, evaluate the first child
@@ -2385,35 +2849,35 @@ class SemanticAnalyzer:
         
         # Handle <arithmetic_exp> nodes
         elif node.value == "<arithmetic_exp>":
-            print("Processing <arithmetic_exp> node")
+            eval_log.debug("Processing <arithmetic_exp> node")
             if len(node.children) >= 2:
                 term_node = node.children[0] # this should be the term
                 exp_tail_node = node.children[1]
 
                 left_value = self._evaluate_expression(term_node)
-                print(f"Initial term value: {left_value}")
+                eval_log.debug("Initial term value: %s", left_value)
 
                 return self._process_arithmetic_exp_tail(exp_tail_node, left_value)
             else:
-                print("Unexpected structure in <arithmetic_exp>")
+                eval_log.debug("Unexpected structure in <arithmetic_exp>")
                 return None
         elif node.value == "<term>":
-            print("Processing <term> node")
+            eval_log.debug("Processing <term> node")
             if len(node.children) >= 2:
                 factor_node = node.children[0]  # <factor>
                 term_tail_node = node.children[1]  # <term_tail>
 
                 left_value = self._evaluate_expression(factor_node)
-                print(f"Initial factor value: {left_value}")
+                eval_log.debug("Initial factor value: %s", left_value)
 
                 return self._process_term_tail(term_tail_node, left_value)
             else:
-                print("Unexpected structure in <term>")
+                eval_log.debug("Unexpected structure in <term>")
                 return None
         elif node.value == "<factor>":
-            print("Processing <factor> node")
+            eval_log.debug("Processing <factor> node")
             if not node.children:
-                print("Empty <factor> node")
+                eval_log.debug("Empty <factor> node")
                 return None
 
             first_child = node.children[0]
@@ -2423,19 +2887,19 @@ class SemanticAnalyzer:
                 expression_node = node.children[1]  # <arithmetic_exp> inside the ( )
                 closing_parenthesis = node.children[2]  # Should be ')', but you usually don't need it
 
-                print("Found parenthesis: evaluating inner expression")
+                eval_log.debug("Found parenthesis: evaluating inner expression")
                 result = self._evaluate_expression(expression_node)
-                print(f"Result of inner parenthesis expression: {result}")
+                eval_log.debug("Result of inner parenthesis expression: %s", result)
                 return result
             else:
                 # It's just a simple <value2> (normal value)
                 return self._evaluate_expression(first_child)
 
         elif node.children and len(node.children) > 0:
-            print(f"Processing unrecognized node type: {node.value}, trying first child")
+            eval_log.debug("Processing unrecognized node type: %s, trying first child", node.value)
             return self._evaluate_expression(node.children[0])
         
-        print(f"Unable to evaluate expression node: {node.value}")
+        eval_log.debug("Unable to evaluate expression node: %s", node.value)
         return None
 
     def _process_optional_equality(self, node, left_value):
@@ -2458,9 +2922,8 @@ class SemanticAnalyzer:
             return left_value
 
         if tail_node.children[0].value == "??":
-            right_node = tail_node.children[1]
-            right_value = self._evaluate_condition(right_node)
-            combined = left_value or right_value
+            # A true left operand decides the result: the right one is not evaluated
+            combined = left_value or self._evaluate_condition(tail_node.children[1])
             return self._process_logical_or_tail(tail_node.children[2], combined)
         return left_value
 
@@ -2469,10 +2932,9 @@ class SemanticAnalyzer:
             return left_value
 
         if tail_node.children[0].value == "&&":
-            right_node = tail_node.children[1]
-            right_value = self._evaluate_condition(right_node)
-            combined = left_value and right_value
-            return self._process_logical_or_tail(tail_node.children[2], combined)
+            # A false left operand decides the result: the right one is not evaluated
+            combined = left_value and self._evaluate_condition(tail_node.children[1])
+            return self._process_logical_and_tail(tail_node.children[2], combined)
         return left_value
 
     def _process_equality_tail(self, node, left_value):
@@ -2507,22 +2969,23 @@ class SemanticAnalyzer:
         return left_value
 
     def _evaluate_condition(self, node):
+        constant = self.condition_constants.get(node, _NOT_CONSTANT)
+        if constant is not _NOT_CONSTANT:
+            return constant
         if not node:
             return None
 
-        print("\n" + "=" * 50)
-        print("DEBUG: Starting condition evaluation")
-        print("=" * 50)
-        print(f"Evaluating node: {node.value if hasattr(node, 'value') else 'No value'}")
-        print(f"Node type: {node.node_type if hasattr(node, 'node_type') else 'No type'}")
-        if hasattr(node, 'children'):
-            print(f"Children count: {len(node.children)}")
+        eval_log.debug("Starting condition evaluation")
+        eval_log.debug("Evaluating node: %s", node.value if hasattr(node, 'value') else 'No value')
+        eval_log.debug("Node type: %s", node.node_type if hasattr(node, 'node_type') else 'No type')
+        if eval_log.debug_enabled and hasattr(node, 'children'):
+            eval_log.debug("Children count: %s", len(node.children))
             for i, child in enumerate(node.children[:3]):  # Show first 3 children for brevity
-                print(f"Child {i}: {child.value if hasattr(child, 'value') else 'No value'}")
+                eval_log.debug("Child %s: %s", i, child.value if hasattr(child, 'value') else 'No value')
 
         # Handle <condition> node
         if node.value == "<condition>":
-            print("Processing <condition> node")
+            eval_log.debug("Processing <condition> node")
             if not node.children:
                 return None
             first_child = node.children[0]
@@ -2531,7 +2994,7 @@ class SemanticAnalyzer:
 
         # Handle <condition_operand> node
         elif node.value == "<condition_operand>":
-            print("Processing <condition_operand> node")
+            eval_log.debug("Processing <condition_operand> node")
             if node.children:
                 # Handle parenthesized, ! (negate), !! (double negate)
                 if len(node.children) >= 3 and node.children[0].value == "(":
@@ -2550,7 +3013,7 @@ class SemanticAnalyzer:
 
         # Handle <logical_or> node
         elif node.value == "<logical_or>":
-            print("Processing <logical_or> node")
+            eval_log.debug("Processing <logical_or> node")
             if len(node.children) >= 2:
                 left_node = node.children[0]
                 tail_node = node.children[1]
@@ -2562,7 +3025,7 @@ class SemanticAnalyzer:
 
         # Handle <logical_and> node
         elif node.value == "<logical_and>":
-            print("Processing <logical_and> node")
+            eval_log.debug("Processing <logical_and> node")
             if len(node.children) >= 2:
                 left_node = node.children[0]
                 tail_node = node.children[1]
@@ -2574,20 +3037,20 @@ class SemanticAnalyzer:
 
         # Handle <equality> node
         elif node.value == "<equality>":
-            print("Processing <equality> node")
+            eval_log.debug("Processing <equality> node")
             left = self._evaluate_condition(node.children[0])  # <relational>
             optional = node.children[1]  # <optional_equality>
             return self._process_optional_equality(optional, left)
 
         # Handle <relational> node
         elif node.value == "<relational>":
-            print("Processing <relational> node")
+            eval_log.debug("Processing <relational> node")
             if len(node.children) >= 2:
                 left_node = node.children[0]
                 tail_node = node.children[1]
 
                 if left_node.value == "<primary>":
-                    print("Processing <primary> node")
+                    eval_log.debug("Processing <primary> node")
                     if not node.children:
                         return None
 
@@ -2595,19 +3058,19 @@ class SemanticAnalyzer:
 
                     if first_child.value == "!":
                         # Handle "!(<condition>)"
-                        print("Found ! (negation) node")
+                        eval_log.debug("Found ! (negation) node")
                         inner_condition = node.children[2]  # because structure: ! ( <condition> )
                         value = self._evaluate_condition(inner_condition)
                     elif first_child.value == "!!":
                         # Handle "!!(<condition>)"
-                        print("Found !! (double-negation) node")
+                        eval_log.debug("Found !! (double-negation) node")
                         inner_condition = node.children[2]  # because structure: !! ( <condition> )
                         value = self._evaluate_condition(inner_condition)
                     elif first_child.value == "yum":
-                        print(f"Found: {node.value} => processing")
+                        eval_log.debug("Found: %s => processing", node.value)
                         value = True
                     elif first_child.value == "bleh":
-                        print(f"Found: {node.value} => processing")
+                        eval_log.debug("Found: %s => processing", node.value)
                         value = False
                     else:
                         # Normal <logical_or> (no negation)
@@ -2623,7 +3086,7 @@ class SemanticAnalyzer:
                 return self._evaluate_expression(node.children[0])
 
         elif node.value == "<primary>":
-            print("Processing <primary> node")
+            eval_log.debug("Processing <primary> node")
             if not node.children:
                 return None
 
@@ -2631,19 +3094,19 @@ class SemanticAnalyzer:
 
             if first_child.value == "!":
                 # Handle "!(<condition>)"
-                print("Found ! (negation) node")
+                eval_log.debug("Found ! (negation) node")
                 inner_condition = node.children[2]  # because structure: ! ( <condition> )
                 return self._evaluate_condition(inner_condition)
             elif first_child.value == "!!":
                 # Handle "!!(<condition>)"
-                print("Found !! (double-negation) node")
+                eval_log.debug("Found !! (double-negation) node")
                 inner_condition = node.children[2]  # because structure: !! ( <condition> )
                 return self._evaluate_condition(inner_condition)
             elif first_child.value == "yum":
-                print(f"Found: {node.value} => processing")
+                eval_log.debug("Found: %s => processing", node.value)
                 return True
             elif first_child.value == "bleh":
-                print(f"Found: {node.value} => processing")
+                eval_log.debug("Found: %s => processing", node.value)
                 return False
             else:
                 # Normal <logical_or> (no negation)
@@ -2651,44 +3114,44 @@ class SemanticAnalyzer:
 
         # Handle value nodes
         elif node.value == "<arithmetic_exp>":
-            print("Processing <arithmetic_exp> node")
+            eval_log.debug("Processing <arithmetic_exp> node")
             eval_result = self._evaluate_expression(node)
             return eval_result
 
         # Handle value_id_tail nodes
         elif node.value == "<value_id_tail>":
-            print("Processing <value_id_tail> node")
+            eval_log.debug("Processing <value_id_tail> node")
             # This node is usually empty for basic expressions, so just return None
             return None
 
         # Handle literals and literals nodes
         elif node.value == "<literals>" or (hasattr(node, 'node_type') and node.node_type in ["pinchliterals", "skimliterals","pastaliterals"]):
-            print(f"Processing literals node: {node.value}")
+            eval_log.debug("Processing literals node: %s", node.value)
             if hasattr(node, 'node_type'):
                 if node.node_type == "pinchliterals":
                     try:
                         value = int(node.value.replace("~", "-"))
-                        print(f"Parsed literal integer: {value}")
+                        eval_log.debug("Parsed literal integer: %s", value)
                         return value
                     except (ValueError, TypeError):
                         pass
                 elif node.node_type == "skimliterals":
                     try:
                         value = float(node.value.replace("~", "-"))
-                        print(f"Parsed literal float: {value}")
+                        eval_log.debug("Parsed literal float: %s", value)
                         return value
                     except (ValueError, TypeError):
                         pass
                 elif node.node_type == "pastaliterals":
                     value = node.value.strip('"')
-                    print(f"Parsed literal string: {value}")
+                    eval_log.debug("Parsed literal string: %s", value)
                     return value
 
             # For <literals> nodes, evaluate the first child
             if node.value == "<literals>" and node.children:
                 return self._evaluate_condition(node.children[0])
 
-        print(f"Unable to evaluate condition node: {node.value}")
+        eval_log.debug("Unable to evaluate condition node: %s", node.value)
         return None
 
     def _process_relational(self, tail_node, left_value):
@@ -2705,7 +3168,7 @@ class SemanticAnalyzer:
         if right_node.node_type == '<condition>':
             right_value = self._evaluate_condition(right_node)
             result = self._apply_condition_operator(operator_node.value, left_value, right_value)
-            print(f"Condition relation result after operation {left_value} {operator_node.value} {right_value} = {result}")
+            eval_log.debug("Condition relation result after operation %s %s %s = %s", left_value, operator_node.value, right_value, result)
             return result
 
     def _process_condition_tail(self, tail_node, left_value):
@@ -2725,26 +3188,26 @@ class SemanticAnalyzer:
         if operator_node.value == "<condition_operator>" and operator_node.children:
             # The real operator is the first child of <expression_operator>
             actual_operator = operator_node.children[0].value
-            print(f"Extracted operator from <condition_operator>: {actual_operator}")
+            eval_log.debug("Extracted operator from <condition_operator>: %s", actual_operator)
         else:
             actual_operator = operator_node.value
-            print(f"Direct operator: {actual_operator}")
+            eval_log.debug("Direct operator: %s", actual_operator)
 
         # Get the right operand - second child of expression_tail
         if len(tail_node.children) < 2:
             return left_value  # No right operand
 
         right_operand_node = tail_node.children[1]
-        print(f"Right operand node: {right_operand_node.value}")
+        eval_log.debug("Right operand node: %s", right_operand_node.value)
 
         # Evaluate the right operand
         right_value = self._evaluate_condition(right_operand_node)
-        print(f"Right operand value: {right_value}")
+        eval_log.debug("Right operand value: %s", right_value)
 
         # Apply the operator using the actual operator value
         if left_value is not None and right_value is not None and actual_operator:
             result = self._apply_condition_operator(actual_operator, left_value, right_value)
-            print(f"Condition result after operation {left_value} {actual_operator} {right_value} = {result}")
+            eval_log.debug("Condition result after operation %s %s %s = %s", left_value, actual_operator, right_value, result)
 
             # Check if there are more operations in the tail
             if len(tail_node.children) > 2:
@@ -2752,13 +3215,13 @@ class SemanticAnalyzer:
                 if next_tail.value == "<relational>" and hasattr(next_tail, 'children') and next_tail.children and \
                         next_tail.children[0].value != "λ":
                     # Recursively process the next operation with our current result as the left value
-                    print(f"Continuing to next operation in chain with result {result}")
+                    eval_log.debug("Continuing to next operation in chain with result %s", result)
                     return self._process_relational(next_tail, result)
 
             return result
 
         # If either value is None or the operator is invalid, return the left value
-        print(f"Cannot evaluate expression, left: {left_value}, right: {right_value}, op: {actual_operator}")
+        eval_log.debug("Cannot evaluate expression, left: %s, right: %s, op: %s", left_value, right_value, actual_operator)
         return left_value
 
     def _process_expression_tail(self, tail_node, left_value):
@@ -2778,39 +3241,39 @@ class SemanticAnalyzer:
         if operator_node.value == "<expression_operator>" and operator_node.children:
             # The real operator is the first child of <expression_operator>
             actual_operator = operator_node.children[0].value
-            print(f"Extracted operator from <expression_operator>: {actual_operator}")
+            eval_log.debug("Extracted operator from <expression_operator>: %s", actual_operator)
         else:
             actual_operator = operator_node.value
-            print(f"Direct operator: {actual_operator}")
+            eval_log.debug("Direct operator: %s", actual_operator)
         
         # Get the right operand - second child of expression_tail
         if len(tail_node.children) < 2:
             return left_value  # No right operand
         
         right_operand_node = tail_node.children[1]
-        print(f"Right operand node: {right_operand_node.value}")
+        eval_log.debug("Right operand node: %s", right_operand_node.value)
         
         # Evaluate the right operand
         right_value = self._evaluate_expression(right_operand_node)
-        print(f"Right operand value: {right_value}")
+        eval_log.debug("Right operand value: %s", right_value)
         
         # Apply the operator using the actual operator value
         if left_value is not None and right_value is not None and actual_operator:
             result = self._apply_operator(actual_operator, left_value, right_value)
-            print(f"Expression result after operation {left_value} {actual_operator} {right_value} = {result}")
+            eval_log.debug("Expression result after operation %s %s %s = %s", left_value, actual_operator, right_value, result)
             
             # Check if there are more operations in the tail (e.g., for chained operations like a + b + c)
             if len(tail_node.children) > 2:
                 next_tail = tail_node.children[2]
                 if next_tail.value == "<expression_tail>" and hasattr(next_tail, 'children') and next_tail.children and next_tail.children[0].value != "λ":
                     # Recursively process the next operation with our current result as the left value
-                    print(f"Continuing to next operation in chain with result {result}")
+                    eval_log.debug("Continuing to next operation in chain with result %s", result)
                     return self._process_expression_tail(next_tail, result)
             
             return result
         
         # If either value is None or the operator is invalid, return the left value
-        print(f"Cannot evaluate expression, left: {left_value}, right: {right_value}, op: {actual_operator}")
+        eval_log.debug("Cannot evaluate expression, left: %s, right: %s, op: %s", left_value, right_value, actual_operator)
         return left_value
     
     def _process_arithmetic_tail(self, tail_node, left_value):
@@ -2824,10 +3287,10 @@ class SemanticAnalyzer:
         
         if operator_node.value == "<arithmetic_operator>" and operator_node.children:
             actual_operator = operator_node.children[0].value
-            print(f"Extracted arithmetic operator: {actual_operator}")
+            eval_log.debug("Extracted arithmetic operator: %s", actual_operator)
         else:
             actual_operator = operator_node.value
-            print(f"Direct arithmetic operator: {actual_operator}")
+            eval_log.debug("Direct arithmetic operator: %s", actual_operator)
         
         # Get the right operand
         if len(tail_node.children) < 2:
@@ -2835,12 +3298,12 @@ class SemanticAnalyzer:
             
         right_node = tail_node.children[1]
         right_value = self._evaluate_expression(right_node)
-        print(f"Arithmetic right value: {right_value}")
+        eval_log.debug("Arithmetic right value: %s", right_value)
         
         # Apply the operator
         if left_value is not None and right_value is not None and actual_operator:
             result = self._apply_operator(actual_operator, left_value, right_value)
-            print(f"Arithmetic result: {result}")
+            eval_log.debug("Arithmetic result: %s", result)
             
             # Check for more operations
             if len(tail_node.children) > 2:
@@ -2856,8 +3319,8 @@ class SemanticAnalyzer:
         if not node:
             return None
             
-        print(f"\nEvaluating operand: {node.value if hasattr(node, 'value') else 'No value'}")
-        print(f"Operand type: {node.node_type if hasattr(node, 'node_type') else 'No type'}")
+        eval_log.debug("Evaluating operand: %s", node.value if hasattr(node, 'value') else 'No value')
+        eval_log.debug("Operand type: %s", node.node_type if hasattr(node, 'node_type') else 'No type')
         
         # Handle direct node types
         if hasattr(node, 'node_type'):
@@ -2865,30 +3328,30 @@ class SemanticAnalyzer:
                 # Use enhanced lookup
                 symbol = self.lookup_symbol(node.value)
                 if symbol:
-                    print(f"Found symbol value: {symbol.get_value()}")
+                    eval_log.debug("Found symbol value: %s", symbol.get_value())
                     return symbol.get_value()
                 else:
-                    print(f"Symbol not found: {node.value}")
+                    eval_log.debug("Symbol not found: %s", node.value)
                     return None
             elif node.node_type == "pinchliterals":
                 try:
                     value = int(node.value)
-                    print(f"Pinch literal value: {value}")
+                    eval_log.debug("Pinch literal value: %s", value)
                     return value
                 except ValueError:
-                    print(f"Invalid pinch literal: {node.value}")
+                    eval_log.debug("Invalid pinch literal: %s", node.value)
                     return None
             elif node.node_type == "skimliterals":
                 try:
                     value = float(node.value)
-                    print(f"Skim literal value: {value}")
+                    eval_log.debug("Skim literal value: %s", value)
                     return value
                 except ValueError:
-                    print(f"Invalid skim literal: {node.value}")
+                    eval_log.debug("Invalid skim literal: %s", node.value)
                     return None
             elif node.node_type == "pastaliterals":
                 value = node.value.strip('"')
-                print(f"Pasta literal value: {value}")
+                eval_log.debug("Pasta literal value: %s", value)
                 return value
         
         # Handle different node values
@@ -2896,11 +3359,15 @@ class SemanticAnalyzer:
 
     def _apply_operator(self, operator, left, right):
         """Apply binary operator to left and right operands"""
-        print(f"Applying operator: {left} {operator} {right}")
+        eval_log.debug("Applying operator: %s %s %s", left, operator, right)
+
+        fast = FAST_OPERATIONS.get((operator, left.__class__, right.__class__))
+        if fast is not None:
+            return fast(left, right)
 
         if (not isinstance(left, (int, float)) or not isinstance(right, (int, float))) and not operator == '+':
             self.errors.append(SemanticError("INVALID_OPERANDS", f"Cannot use '{operator}' to data_types({type(left)},{type(right)})"))
-            print("Operands must be int, float, or string-string")
+            eval_log.debug("Operands must be int, float, or string-string")
             return None
 
         result = None
@@ -2913,7 +3380,7 @@ class SemanticAnalyzer:
             result = left * right
         elif operator == "/":
             if right == 0:
-                print("Division by zero error")
+                eval_log.debug("Division by zero error")
                 return None
             if isinstance(left, int) and isinstance(right, int):
                 result = left // right  # Integer division
@@ -2921,68 +3388,40 @@ class SemanticAnalyzer:
                 result = left / right  # Float division
         elif operator == "%":
             if right == 0:
-                print("Modulo by zero error")
+                eval_log.debug("Modulo by zero error")
                 return None
             result = left % right
 
-        print(f"Operation result: {result}")
+        eval_log.debug("Operation result: %s", result)
         return result
 
     def _apply_condition_operator(self, operator, left, right):
-        print(f"Applying condition operator: {left} {operator} {right}")
-
-        if operator == "==":
-            result = left == right
-            print(f"Equality result: {result}")
-            return True if result else False
+        eval_log.debug("Applying condition operator: %s %s %s", left, operator, right)
 
-        elif operator == "!=":
-            result = left != right
-            print(f"Inequality result: {result}")
-            return True if result else False
-
-        elif operator == "<":
-            result = left < right
-            print(f"Less than result: {result}")
-            return True if result else False
-        elif operator == ">":
-            result = left > right
-            print(f"Greater than result: {result}")
-            return True if result else False
-        elif operator == "<=":
-            result = left <= right
-            print(f"Less than or equal result: {result}")
-            return True if result else False
-        elif operator == ">=":
-            result = left >= right
-            print(f"Greater than or equal result: {result}")
-            return True if result else False
-
-        elif operator == "&&":
-            result = left and right
-            print(f"And result: {result}")
-            return True if result else False
-
-        elif operator == "??":
-            result = left or right
-            print(f"Or result: {result}")
-            return True if result else False
-
-        print(f"Unknown operator: {operator}")
-        return None
+        condition = _CONDITION_OPERATORS.get(operator)
+        if condition is None:
+            eval_log.debug("Unknown operator: %s", operator)
+            return None
+        result = condition(left, right)
+        eval_log.debug("Condition result: %s", result)
+        return True if result else False
 
-    def _print_scope_symbols(self):
-        """Helper method to print all symbols in current scope"""
-        print("\nCurrent scope symbols:")
+    def _log_scope_symbols(self):
+        """Helper method to log all symbols in current scope"""
+        if not log.debug_enabled:
+            return
+        log.debug("Current scope symbols:")
         for name, symbol in self.current_scope.symbols.items():
-            print(f"  {name}: {symbol.value} (type: {symbol.type})")
+            log.debug("  %s: %s (type: %s)", name, symbol.value, symbol.type)
     
-    def _print_node_structure(self, node, level=0):
-        """Helper method to print the structure of a node"""
+    def _log_node_structure(self, node, level=0):
+        """Helper method to log the structure of a node"""
+        if not log.debug_enabled:
+            return
         indent = "  " * level
-        print(f"{indent}Node: {node.value if hasattr(node, 'value') else 'No value'}")
-        print(f"{indent}Type: {node.node_type if hasattr(node, 'node_type') else 'No type'}")
+        log.debug("%sNode: %s", indent, node.value if hasattr(node, 'value') else 'No value')
+        log.debug("%sType: %s", indent, node.node_type if hasattr(node, 'node_type') else 'No type')
         if hasattr(node, 'children'):
-            print(f"{indent}Children:")
+            log.debug("%sChildren:", indent)
             for child in node.children:
-                self._print_node_structure(child, level + 1)
\ No newline at end of file
+                self._log_node_structure(child, level + 1)
\ No newline at end of file
@@ -1,3 +1,14 @@
+import io
+import marshal
+import os
+import sys
+import zlib
+
+from LexicalAnalyzer import Token
+from Tracing import get_logger
+
+log = get_logger("parser")
+
 class SyntaxAnalyzer:
     def __init__(self, cfg):
         self.cfg = cfg
@@ -316,7 +327,7 @@ def compute_predict_set(cfg, first_set, follow_set):
 
     return predict_set
 
-def gen_parse_table():
+def gen_parse_table(predict_set):
     parse_table = {}
     for (non_terminal, production), predict in predict_set.items():
         if non_terminal not in parse_table:
@@ -328,12 +339,143 @@ def gen_parse_table():
 
     return parse_table  
 
-first_set = compute_first_set(cfg)
-follow_set = compute_follow_set(cfg, "<program>", first_set)
-predict_set = compute_predict_set(cfg, first_set, follow_set)
-parse_table = gen_parse_table()
+# The grammar analysis above is cached in GRAMMAR_CACHE_FILE, keyed by a
+# hash of cfg.  Bump GRAMMAR_CACHE_VERSION whenever the file layout or the
+# analysis itself changes.  The file is written with marshal, which loads
+# faster than json and needs no extra imports at startup.
+GRAMMAR_CACHE_VERSION = 1
+GRAMMAR_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "grammar_cache.marshal")
+
+
+def grammar_hash(cfg):
+    return zlib.crc32(repr((GRAMMAR_CACHE_VERSION, marshal.version, cfg)).encode("utf-8"))
+
+
+def encode_grammar(cfg):
+    """Number the symbols and productions of cfg.
+
+    Non-terminals come first, in cfg order, followed by the terminals in
+    order of first use.  Productions are (lhs, rhs) pairs of symbol ids.
+    """
+    symbols = list(cfg)
+    symbol_ids = {symbol: index for index, symbol in enumerate(symbols)}
+    productions = []
+    for non_terminal, rules in cfg.items():
+        for production in rules:
+            for symbol in production:
+                if symbol not in symbol_ids:
+                    symbol_ids[symbol] = len(symbols)
+                    symbols.append(symbol)
+            productions.append((symbol_ids[non_terminal], tuple(symbol_ids[symbol] for symbol in production)))
+    return symbols, productions
+
+
+def validate_grammar(cfg, parse_table):
+    for non_terminal, rules in cfg.items():
+        for production in rules:
+            for symbol in production:
+                if symbol.startswith("<") and symbol.endswith(">") and symbol not in cfg:
+                    raise ValueError(f"Grammar error: {non_terminal} uses undefined non-terminal {symbol}")
+        if not parse_table.get(non_terminal):
+            raise ValueError(f"Grammar error: {non_terminal} has no parse table entries")
+
+
+def build_grammar_tables(cfg):
+    """Run the full grammar analysis and return the cache contents."""
+    first_set = compute_first_set(cfg)
+    follow_set = compute_follow_set(cfg, "<program>", first_set)
+    predict_set = compute_predict_set(cfg, first_set, follow_set)
+    parse_table = gen_parse_table(predict_set)
+    validate_grammar(cfg, parse_table)
+
+    symbols, productions = encode_grammar(cfg)
+    symbol_ids = {symbol: index for index, symbol in enumerate(symbols)}
+    production_ids = {}
+    for index, (lhs, rhs) in enumerate(productions):
+        production_ids.setdefault((lhs, rhs), index)
+
+    return {
+        "version": GRAMMAR_CACHE_VERSION,
+        "grammar_hash": grammar_hash(cfg),
+        "symbols": symbols,
+        "productions": [[lhs, list(rhs)] for lhs, rhs in productions],
+        "first_set": {non_terminal: sorted(first) for non_terminal, first in first_set.items()},
+        "follow_set": {non_terminal: sorted(follow) for non_terminal, follow in follow_set.items()},
+        "parse_table": {
+            non_terminal: {
+                terminal: production_ids[(symbol_ids[non_terminal], tuple(symbol_ids[symbol] for symbol in production))]
+                for terminal, production in row.items()
+            }
+            for non_terminal, row in parse_table.items()
+        },
+    }
+
+
+def decode_grammar_tables(data):
+    """Turn cache contents back into first_set, follow_set, predict_set and parse_table."""
+    symbols = data["symbols"]
+    productions = [(symbols[lhs], tuple(symbols[symbol] for symbol in rhs)) for lhs, rhs in data["productions"]]
+    first_set = {non_terminal: set(first) for non_terminal, first in data["first_set"].items()}
+    follow_set = {non_terminal: set(follow) for non_terminal, follow in data["follow_set"].items()}
+    parse_table = {}
+    predict_set = {}
+    for non_terminal, row in data["parse_table"].items():
+        parse_table[non_terminal] = {}
+        for terminal, index in row.items():
+            parse_table[non_terminal][terminal] = productions[index][1]
+            predict_set.setdefault(productions[index], set()).add(terminal)
+    for production in productions:
+        predict_set.setdefault(production, set())
+    return first_set, follow_set, predict_set, parse_table
+
+
+def write_grammar_cache(data, path=GRAMMAR_CACHE_FILE):
+    # Write next to the target and rename, so concurrent workers never
+    # read a half written file.  A read-only install just skips the cache.
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, "wb") as file:
+            marshal.dump(data, file)
+        os.replace(temporary, path)
+    except OSError:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def load_grammar_tables(cfg, path=GRAMMAR_CACHE_FILE):
+    """Load the grammar tables from the cache, rebuilding it when cfg has changed."""
+    try:
+        with open(path, "rb") as file:
+            data = marshal.loads(file.read())
+        if data.get("version") == GRAMMAR_CACHE_VERSION and data.get("grammar_hash") == grammar_hash(cfg):
+            return decode_grammar_tables(data)
+    except (OSError, EOFError, ValueError, KeyError, IndexError, TypeError, AttributeError):
+        pass
+
+    data = build_grammar_tables(cfg)
+    write_grammar_cache(data, path)
+    return decode_grammar_tables(data)
+
+
+first_set, follow_set, predict_set, parse_table = load_grammar_tables(cfg)
+
+# Interned node kinds.  Every node_type a parse tree node can have, i.e. every
+# grammar symbol, is numbered once, and the number is kept on the node as
+# ParseTreeNode.kind so that tree walkers can dispatch with a list index.
+NODE_KINDS = {}
+
+
+def node_kind(node_type):
+    """The interned kind id of a node_type such as '<statement>' or 'id'."""
+    kind = NODE_KINDS.get(node_type)
+    if kind is None:
+        kind = NODE_KINDS[node_type] = len(NODE_KINDS)
+    return kind
+
 
 class ParseTreeNode:
+    __slots__ = ('value', 'node_type', 'children', 'line_number', 'kind')
+
     def __init__(self, token_value, node_type=None, line_number=-1):
         if isinstance(token_value, str) and ':' in token_value:
             token_type, literal = token_value.split(':', 1)
@@ -346,19 +488,170 @@ class ParseTreeNode:
             self.node_type = node_type if node_type is not None else token_value
         self.children = []
         self.line_number = line_number  # Line number attribute
+        self.kind = node_kind(self.node_type)
+
+    @classmethod
+    def terminal(cls, node_type, value, line_number=-1, kind=None):
+        """Build a terminal node without going through a "type:value" string."""
+        node = cls.__new__(cls)
+        node.value = value
+        node.node_type = node_type
+        node.children = []
+        node.line_number = line_number
+        node.kind = kind if kind is not None else node_kind(node_type)
+        return node
+
+    @classmethod
+    def nonterminal(cls, node_type, line_number, kind):
+        """Build the node of a non-terminal whose kind is already known."""
+        node = cls.__new__(cls)
+        node.value = node.node_type = node_type
+        node.children = []
+        node.line_number = line_number
+        node.kind = kind
+        return node
 
     def add_child(self, child):
         self.children.append(child)
 
+    def iter_lines(self, level=0):
+        """Yield the rendered lines of this subtree, depth first, without recursion."""
+        pending = [(self, level)]
+        while pending:
+            node, depth = pending.pop()
+            yield "  " * depth + f"{node.node_type} (Line {node.line_number})\n"
+            pending.extend((child, depth + 1) for child in reversed(node.children))
+
+    def write(self, stream, level=0):
+        stream.writelines(self.iter_lines(level))
+
     def __str__(self, level=0):
-        ret = "  " * level + f"{self.node_type} (Line {self.line_number})"
-        ret += "\n"
-        for child in self.children:
-            ret += child.__str__(level + 1)
-        return ret
+        buffer = io.StringIO()
+        self.write(buffer, level)
+        return buffer.getvalue()
+
+class TokenStream:
+    """Pulls normalized tokens one at a time and ends them with the ('$', '$', -1) marker.
+
+    Only the current token is held.  While pulling it notes whether a
+    'takeout' has been consumed and the line of any token that follows the
+    first 'takeout', which the parser reports as code after the program.
+    """
+
+    END = Token('$', '$', -1)
+
+    def __init__(self, tokens):
+        self.tokens = iter(tokens)
+        self.current = None
+        self.takeout_consumed = False
+        self.takeout_seen = False
+        self.trailing_line = None
+        self.finished = False
+        self.advance()
+
+    def advance(self):
+        if self.current is not None and self.current.lexeme == 'takeout':
+            self.takeout_consumed = True
+        if self.finished:
+            self.current = None
+            return
+        token = next(self.tokens, None)
+        if token is None:
+            self.finished = True
+            self.current = self.END
+            return
+        if self.takeout_seen and self.trailing_line is None:
+            self.trailing_line = token.line
+        if token.lexeme == 'takeout':
+            self.takeout_seen = True
+        self.current = token
+
+    def at_end(self):
+        return self.current is self.END
+
+    def drain(self):
+        """Pull the rest of the input without moving the current token."""
+        if self.finished:
+            return
+        for token in self.tokens:
+            if self.takeout_seen and self.trailing_line is None:
+                self.trailing_line = token.line
+            if token.lexeme == 'takeout':
+                self.takeout_seen = True
+        self.finished = True
+
+class CompiledParseTable:
+    """Integer-coded form of a cfg and its LL(1) parse table.
+
+    Symbols are numbered as in encode_grammar(): non-terminals first, so
+    an id below non_terminal_count is a non-terminal, then terminals and
+    '$'.  rows[nt][symbol] is a production index or -1; the last column
+    stands for token types the grammar does not know.  bodies[production]
+    holds the right-hand side reversed for pushing, or None for λ.  An end
+    of production marker on the stack is the tagged int ~nt.
+    """
+
+    def __init__(self, cfg, parse_table):
+        symbols, productions = encode_grammar(cfg)
+        symbol_ids = {symbol: index for index, symbol in enumerate(symbols)}
+        for row in parse_table.values():
+            for terminal in row:
+                if terminal not in symbol_ids:
+                    symbol_ids[terminal] = len(symbols)
+                    symbols.append(terminal)
+        if '$' not in symbol_ids:
+            symbol_ids['$'] = len(symbols)
+            symbols.append('$')
+
+        self.symbols = symbols
+        self.symbol_ids = symbol_ids
+        self.kinds = [node_kind(symbol) for symbol in symbols]  # node kind of each symbol id
+        self.non_terminal_count = len(cfg)
+        self.unknown = len(symbols)
+        self.bottom = symbol_ids['$']
+        self.start = symbol_ids['<program>']
+
+        production_ids = {}
+        for index, production in enumerate(productions):
+            production_ids.setdefault(production, index)
+        self.bodies = [
+            None if rhs[0] == symbol_ids.get('λ') else tuple(reversed(rhs))
+            for lhs, rhs in productions
+        ]
+
+        self.rows = [[-1] * (len(symbols) + 1) for _ in range(self.non_terminal_count)]
+        for non_terminal, row in parse_table.items():
+            lhs = symbol_ids[non_terminal]
+            for terminal, production in row.items():
+                rhs = tuple(symbol_ids[symbol] for symbol in production)
+                self.rows[lhs][symbol_ids[terminal]] = production_ids[(lhs, rhs)]
+
+    def decode_stack(self, stack):
+        """The stack in the string form used by the error reporting."""
+        return [('END', self.symbols[~item]) if item < 0 else self.symbols[item] for item in stack]
+
+
+# Compiled tables per (cfg, parse_table) pair, so parsers created per
+# request share them.
+_compiled_parse_tables = {}
+
+
+def compile_parse_table(cfg, parse_table):
+    key = (id(cfg), id(parse_table))
+    entry = _compiled_parse_tables.get(key)
+    if entry is None or entry[0] is not cfg or entry[1] is not parse_table:
+        entry = _compiled_parse_tables[key] = (cfg, parse_table, CompiledParseTable(cfg, parse_table))
+    return entry[2]
+
 
 class LL1Parser:
-    def __init__(self, cfg, parse_table, follow_set):
+    def __init__(self, cfg, parse_table, follow_set, dump_tree=False, engine="table"):
+        # dump_tree writes the parse tree to stdout after a successful
+        # parse.  It is meant for debugging and off by default.
+        self.dump_tree = dump_tree
+        # "table" runs on the integer-coded CompiledParseTable, "dict" runs
+        # the original loop over the parse_table dicts in parse_dict().
+        self.engine = engine
         self.cfg = cfg
         self.parse_table = parse_table
         self.follow_set = follow_set
@@ -368,67 +661,201 @@ class LL1Parser:
         self.parse_tree = None
         self.errors = []
         self.node_stack = []
-        self.production_markers = []
-        
+
     def parse(self, tokens):
-        # Filter out comment tokens before processing
-        filtered_tokens = []
+        return self.parse_stream(tokens)
+
+    def parse_stream(self, tokens):
+        """Parse tokens pulled one at a time from any iterable, e.g. LexicalAnalyzer.iter_tokens()."""
+        self.input_tokens = TokenStream(self._normalize_tokens(self._filter_comments(tokens)))
+        self.index = 0
+        self.parse_tree = ParseTreeNode('<program>')
+        self.node_stack = [self.parse_tree]
+        if self.engine == "dict":
+            return self.parse_dict()
+
+        table = compile_parse_table(self.cfg, self.parse_table)
+        rows = table.rows
+        bodies = table.bodies
+        symbols = table.symbols
+        symbol_ids = table.symbol_ids
+        kinds = table.kinds
+        non_terminal_count = table.non_terminal_count
+        unknown = table.unknown
+        bottom = table.bottom
+        stream = self.input_tokens
+        node_stack = self.node_stack
+        stack = [bottom, table.start]
+        token = stream.current
+        kind = symbol_ids.get(token.kind, unknown)
+        # λ productions leave their node without children, so the pruning
+        # pass is only needed if a terminal itself reads 'λ'.
+        needs_pruning = False
+
+        while True:
+            top = stack[-1]
+            if top == bottom:
+                break
+
+            # End of production marker
+            if top < 0:
+                stack.pop()
+                node_stack.pop()
+                continue
+
+            if top >= non_terminal_count:  # Terminal
+                if top != kind:
+                    self.stack = table.decode_stack(stack)
+                    self.improved_syntax_error(token.line, token.kind)
+                    return self._finish_parse(False)
+                stack.pop()
+                terminal_node = ParseTreeNode.terminal(symbols[top], token.lexeme, token.line, kinds[top])
+                node_stack[-1].add_child(terminal_node)
+                if terminal_node.value == 'λ':
+                    needs_pruning = True
+                stream.advance()
+                self.index += 1
+                token = stream.current
+                kind = symbol_ids.get(token.kind, unknown)
+            else:  # Non-terminal
+                production = rows[top][kind]
+                if production < 0:
+                    self.stack = table.decode_stack(stack)
+                    self.improved_syntax_error(token.line, token.kind)
+                    return self._finish_parse(False)
+
+                stack.pop()
+                new_node = ParseTreeNode.nonterminal(symbols[top], token.line, kinds[top])
+                node_stack[-1].add_child(new_node)
+                body = bodies[production]
+                if body is not None:
+                    stack.append(~top)
+                    stack.extend(body)
+                    node_stack.append(new_node)
+
+        self.stack = table.decode_stack(stack)
+        if needs_pruning:
+            self._prune_lambda_nodes(self.parse_tree)
+        return self._finish_parse(True)
+
+    def parse_dict(self):
+        """The reference parse loop: a stack of grammar symbols and ('END', nt) markers, looked up in parse_table."""
+        stream = self.input_tokens
+        self.stack = ['$', '<program>']
+
+        while self.stack[-1] != '$':
+            top = self.stack[-1]
+            token = stream.current
+
+            # End of production marker
+            if isinstance(top, tuple):
+                self.stack.pop()
+                self.node_stack.pop()
+                continue
+
+            if top not in self.cfg:  # Terminal
+                if top != token.kind:
+                    self.improved_syntax_error(token.line, token.kind)
+                    return self._finish_parse(False)
+                self.stack.pop()
+                self.node_stack[-1].add_child(ParseTreeNode.terminal(top, token.lexeme, token.line))
+                stream.advance()
+                self.index += 1
+            else:  # Non-terminal
+                production = self.parse_table.get(top, {}).get(token.kind)
+                if production is None:
+                    self.improved_syntax_error(token.line, token.kind)
+                    return self._finish_parse(False)
+
+                self.stack.pop()
+                new_node = ParseTreeNode(top, line_number=token.line)
+                self.node_stack[-1].add_child(new_node)
+                if production[0] == 'λ':
+                    new_node.add_child(ParseTreeNode('λ', line_number=token.line))
+                else:
+                    self.stack.append(('END', top))
+                    self.stack.extend(reversed(production))
+                    self.node_stack.append(new_node)
+
+        self._prune_lambda_nodes(self.parse_tree)
+        return self._finish_parse(True)
+
+    def _finish_parse(self, completed):
+        """Drain the remaining tokens and report code after 'takeout' ahead of any other error."""
+        self.input_tokens.drain()
+        if self.input_tokens.trailing_line is not None:
+            self.errors.insert(0, f"[SYNTAX_ERROR] at line {self.input_tokens.trailing_line}: Unexpected code after 'takeout'. All code must be within 'dinein' and 'takeout'.")
+        if not completed:
+            return False, self.errors
+
+        # Final validation and cleanup
+        if self.input_tokens.at_end():
+            log.info("Parsing successful!")
+            if self.dump_tree:
+                self.parse_tree.write(sys.stdout)
+                print()
+            return True, []
+        else:
+            if not self.errors:  # Only add this error if no other errors exist
+                self.errors.append("[SYNTAX_ERROR]: Incomplete parsing")
+            return False, self.errors
+
+    def _filter_comments(self, tokens):
+        """Skip comment tokens, including tokens inside an unclosed block comment."""
         in_block_comment = False
-        
-        i = 0
-        while i < len(tokens):
-            token = tokens[i]
-            
+
+        for token in tokens:
+            if isinstance(token, Token):
+                token_lexeme = token.lexeme
+                # Every comment marker contains '/'.
+                if not in_block_comment and '/' not in token_lexeme:
+                    yield token
+                    continue
+                token_type = token.kind
             # Safety check for token structure
-            if not isinstance(token, tuple) or len(token) < 2:
-                filtered_tokens.append(token)
-                i += 1
+            elif not isinstance(token, tuple) or len(token) < 2:
+                yield token
                 continue
-                
-            token_lexeme = token[0]
-            token_type = token[1]
-            
+            else:
+                token_lexeme = token[0]
+                token_type = token[1]
+
             # Check if this is a block comment token (both open and close in one token)
             if isinstance(token_lexeme, str) and '/-' in token_lexeme and '-/' in token_lexeme:
-                # This is a complete block comment, skip it
-                i += 1
                 continue
-                
+
             # Check if this is the start of a block comment
             if not in_block_comment and isinstance(token_lexeme, str) and '/-' in token_lexeme:
                 in_block_comment = True
-                i += 1
                 continue
-                
+
             # Check if this is the end of a block comment
             if in_block_comment and isinstance(token_lexeme, str) and '-/' in token_lexeme:
                 in_block_comment = False
-                i += 1
                 continue
-                
+
             # Skip tokens if we're in a block comment
             if in_block_comment:
-                i += 1
                 continue
-                
+
             # Handle line comments starting with //
             if isinstance(token_lexeme, str) and token_lexeme.startswith('//'):
-                i += 1
                 continue
             if isinstance(token_type, str) and token_type.startswith('//'):
-                i += 1
                 continue
-                
-            # If we get here, the token is not a comment and not in a comment block
-            filtered_tokens.append(token)
-            i += 1
-        
+
+            yield token
+
         # Print warning if we ended in a block comment state
         if in_block_comment:
-            print("WARNING: Unclosed block comment detected. Processing continued assuming end of file closes the comment.")
-        
-        # Continue with the original token processing logic
-        def safe_process_token(token):
+            log.warning("Unclosed block comment detected. Processing continued assuming end of file closes the comment.")
+
+    def _normalize_tokens(self, tokens):
+        """Turn plain tuples into Tokens, with identifier types collapsed to 'id'."""
+        for token in tokens:
+            if isinstance(token, Token):
+                yield token
+                continue
             try:
                 if isinstance(token, tuple):
                     # Ensure we have at least lexeme, token_type, and line_number
@@ -440,157 +867,44 @@ class LL1Parser:
                         lexeme = token[0] if len(token) > 0 else ""
                         token_type = token[1] if len(token) > 1 else str(lexeme)
                         line_number = -1
-                    
+
                     # Only normalize the token type for identifiers, preserve the lexeme
                     if isinstance(token_type, str) and token_type.startswith("id"):
-                        normalized_token = (lexeme, "id", line_number)
+                        yield Token(lexeme, "id", line_number)
                     else:
-                        normalized_token = (lexeme, token_type, line_number)
-                    
-                    return normalized_token
+                        yield Token(lexeme, token_type, line_number)
                 else:
-                    return (str(token), str(token), -1)
+                    yield Token(str(token), str(token), -1)
             except Exception as e:
-                print(f"Error processing token {token}: {e}")
-                return (str(token), str(token), -1)
+                log.warning("Error processing token %s: %s", token, e)
+                yield Token(str(token), str(token), -1)
 
-        # Process the filtered tokens
-        try:
-            processed_tokens = [safe_process_token(token) for token in filtered_tokens]
-            
-            # Check for code after 'takeout'
-            takeout_index = -1
-            for i, token in enumerate(processed_tokens):
-                if token[0] == 'takeout':
-                    takeout_index = i
-                    break
-            
-            if takeout_index != -1 and takeout_index < len(processed_tokens) - 1:
-                # There is code after 'takeout'
-                illegal_token = processed_tokens[takeout_index + 1]
-                self.errors.append(f"[SYNTAX_ERROR] at line {illegal_token[2]}: Unexpected code after 'takeout'. All code must be within 'dinein' and 'takeout'.")
-        
-            # Add end marker only after checking for code after takeout
-            processed_tokens.append(('$', '$', -1))
-            
-            # Debug: Print processed tokens after filtering comments
-            # print("DEBUG: Received Tokens (after comment filtering):")
-            # for i, token in enumerate(processed_tokens[:-1]):  # Skip the $ token in debug output
-            #     print(f"Token {i}: Lexeme={token[0]}, Type={token[1]}, Line={token[2]}")
-                
-        except Exception as e:
-            print(f"ERROR during token processing: {e}")
-            return False, [f"Token processing error: {e}"]
-
-
-        # Check if processed tokens are empty
-        if not processed_tokens:
-            print("ERROR: No tokens were processed!")
-            return False, ["No tokens found for parsing"]
-        
-        self.input_tokens = processed_tokens
-        self.index = 0
-        self.stack = ['$', '<program>']
-        self.parse_tree = ParseTreeNode('<program>')
-        self.node_stack = [self.parse_tree]
-        self.production_markers = []
-
-        while self.stack[-1] != '$':
-            top = self.stack[-1]
-            current_token = self.input_tokens[self.index][1]
-            current_line = self.input_tokens[self.index][2]
-
-            # Handle production completion markers
-            if isinstance(top, tuple) and top[0] == 'END':
-                self._handle_production_end()
-                continue
-
-            if top not in self.cfg:  # Terminal
-                if top == current_token:
-                    self._process_terminal(current_line)
-                else:
-                    self.improved_syntax_error(current_line, current_token)
-                    return False, self.errors
-            else:  # Non-terminal
-                if not self._process_non_terminal(current_token, current_line):
-                    return False, self.errors
-
-        self._prune_lambda_nodes(self.parse_tree)
-        # Final validation and cleanup
-        if self.index == len(self.input_tokens) - 1:
-            print("Parsing successful!")
-            print(self.parse_tree)
-            return True, []
-        else:
-            if not self.errors:  # Only add this error if no other errors exist
-                self.errors.append("[SYNTAX_ERROR]: Incomplete parsing")
-            return False, self.errors
-
-    def _handle_production_end(self):
-        """Handle end of production markers"""
-        marker = self.stack.pop()
-        if self.node_stack and self.production_markers:
-            expected_marker = self.production_markers.pop()
-            if marker[1] == expected_marker:
-                self.node_stack.pop()
     def _prune_lambda_nodes(self, node):
         """Prune λ nodes from the AST."""
-        if not hasattr(node, 'children'):
-            return
-        
-        # Process children first
-        for child in node.children[:]:
-            self._prune_lambda_nodes(child)
-        
-        # Remove λ nodes
-        node.children = [child for child in node.children if child.value != 'λ']
-        
-        # If node has only one child and is not a terminal, promote the child
-        if len(node.children) == 1 and not hasattr(node.children[0], 'node_type'):
-            child = node.children[0]
-            node.value = child.value
-            node.children = child.children
-
-    def _process_terminal(self, current_line):
-        """Process terminal symbols"""
-        expected_symbol = self.stack.pop()
-        terminal_node = ParseTreeNode(f"{expected_symbol}:{self.input_tokens[self.index][0]}", line_number=current_line)
-        self.node_stack[-1].add_child(terminal_node)
-        self.index += 1
-
-    def _process_non_terminal(self, current_token, current_line):
-        """Process non-terminal symbols with proper nesting"""
-        try:
-            production = self.parse_table[self.stack[-1]].get(current_token)
-            if production is None:
-                self.improved_syntax_error(current_line, current_token)
-                return False
-
-            # Get current non-terminal and create node with line number
-            current_nt = self.stack.pop()
-            new_node = ParseTreeNode(current_nt, line_number=current_line)
-            self.node_stack[-1].add_child(new_node)
-
-            if production[0] != 'λ':
-                # Push production markers and symbols
-                self.production_markers.append(current_nt)
-                self.stack.append(('END', current_nt))  # End marker
-                for symbol in reversed(production):
-                    self.stack.append(symbol)
-                self.node_stack.append(new_node)
-            else:
-                # Add λ node with the same line number as the non-terminal
-                lambda_node = ParseTreeNode('λ', line_number=current_line)
-                new_node.add_child(lambda_node)
+        # Children first, with an explicit stack so deep statement lists
+        # do not hit the recursion limit.
+        pending = [(node, False)]
+        while pending:
+            current, children_done = pending.pop()
+            if not hasattr(current, 'children'):
+                continue
+            if not children_done:
+                pending.append((current, True))
+                pending.extend((child, False) for child in current.children)
+                continue
 
-            return True
-        except KeyError:
-            self.improved_syntax_error(current_line, current_token)
-            return False
+            # Remove λ nodes
+            current.children = [child for child in current.children if child.value != 'λ']
+
+            # If node has only one child and is not a terminal, promote the child
+            if len(current.children) == 1 and not hasattr(current.children[0], 'node_type'):
+                child = current.children[0]
+                current.value = child.value
+                current.children = child.children
 
     def improved_syntax_error(self, line_number, found):
         """Enhanced syntax error reporting with focused context awareness and helpful messages."""
-        token_lexeme = self.input_tokens[self.index][0] if self.index < len(self.input_tokens) else found
+        token_lexeme = self.input_tokens.current.lexeme if self.input_tokens.current is not None else found
         
         # Check if we're at the start of parsing and the first token isn't 'dinein'
         if self.index == 0 and token_lexeme != 'dinein':
@@ -599,7 +913,7 @@ class LL1Parser:
             return
 
         # Check if we've found code after 'takeout'
-        if 'takeout' in [t[0] for t in self.input_tokens[:self.index]] and self.index < len(self.input_tokens) - 1:
+        if self.input_tokens.takeout_consumed and not self.input_tokens.at_end():
             error_message = f"[SYNTAX_ERROR] at line {line_number}: Unexpected code after 'takeout'. All code must be within 'dinein' and 'takeout'."
             self.errors.append(error_message)
             return
@@ -671,11 +985,12 @@ class LL1Parser:
                 return True
             
             # If we can't find a sync point, skip the current token
+            self.input_tokens.advance()
             self.index += 1
-            if self.index >= len(self.input_tokens):
+            if self.input_tokens.current is None:
                 break
                 
-            current_token = self.input_tokens[self.index][1]
+            current_token = self.input_tokens.current.kind
             recovery_attempts += 1
         
         # We've removed the fatal error message
@@ -721,3 +1036,9 @@ class LL1Parser:
 #         print()  
 
 # display_parse_table(parse_table)
+
+
+if __name__ == "__main__":
+    # Build step: regenerate the grammar cache unconditionally.
+    write_grammar_cache(build_grammar_tables(cfg))
+    print(f"Wrote {GRAMMAR_CACHE_FILE}")
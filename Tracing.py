@@ -0,0 +1,122 @@
+"""
+Tracing for the analysis pipeline.
+
+Each component traces through its own Tracer (parser, semantic, symbols,
+eval), which writes to the logger "chef.<component>".  The "chef" logger is
+set to WARNING and given a NullHandler, so a normal run writes nothing.
+
+Debug messages sit on hot paths of the interpreter.  Going through
+Logger.debug() for each of them costs more than the old print calls did,
+so a Tracer keeps the result of the level check in `debug_enabled` and
+drops debug messages before logging is involved.  Messages use %-style
+arguments and are only formatted once a record is actually handled.
+
+To look at what an analysis did, record into a ring buffer:
+
+    handler = enable_trace(capacity=5000)
+    ...run the analyzers...
+    print("\\n".join(handler.lines()))
+    disable_trace(handler)
+
+After changing "chef" levels through the logging module directly, call
+refresh() so the tracers pick the new levels up.
+"""
+import logging
+from collections import deque
+
+ROOT_LOGGER = "chef"
+DEFAULT_LEVEL = logging.WARNING
+TRACE_FORMAT = "%(name)s %(levelname)s: %(message)s"
+
+_root = logging.getLogger(ROOT_LOGGER)
+_root.addHandler(logging.NullHandler())
+_root.setLevel(DEFAULT_LEVEL)
+
+_tracers = {}
+
+
+class Tracer:
+    """Per-component front end to a logging.Logger with a cached debug check."""
+
+    __slots__ = ('logger', 'debug_enabled')
+
+    def __init__(self, component):
+        self.logger = logging.getLogger(f"{ROOT_LOGGER}.{component}")
+        self.debug_enabled = False
+        self.refresh()
+
+    def refresh(self):
+        self.debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+
+    def debug(self, msg, *args):
+        if self.debug_enabled:
+            self.logger.debug(msg, *args)
+
+    def info(self, msg, *args):
+        self.logger.info(msg, *args)
+
+    def warning(self, msg, *args, exc_info=False):
+        self.logger.warning(msg, *args, exc_info=exc_info)
+
+
+def get_logger(component):
+    """Returns the Tracer for one pipeline component, e.g. "parser"."""
+    tracer = _tracers.get(component)
+    if tracer is None:
+        tracer = _tracers[component] = Tracer(component)
+    return tracer
+
+
+def refresh():
+    """Re-reads the effective level of every component."""
+    for tracer in _tracers.values():
+        tracer.refresh()
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the last `capacity` formatted records in memory."""
+
+    def __init__(self, capacity=10000, level=logging.NOTSET):
+        super().__init__(level)
+        self.records = deque(maxlen=capacity)
+        self.setFormatter(logging.Formatter(TRACE_FORMAT))
+
+    def emit(self, record):
+        # Format right away: the arguments are often live objects (symbols,
+        # buffers) whose values change as the program runs.
+        try:
+            self.records.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+    def lines(self):
+        return list(self.records)
+
+    def clear(self):
+        self.records.clear()
+
+
+def _logger_for(component):
+    return get_logger(component).logger if component else _root
+
+
+def enable_trace(capacity=10000, level=logging.DEBUG, component=None):
+    """
+    Records messages at `level` and above into a new RingBufferHandler and
+    returns it.  Pass a component name to trace only that part of the
+    pipeline.
+    """
+    logger = _logger_for(component)
+    handler = RingBufferHandler(capacity)
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    refresh()
+    return handler
+
+
+def disable_trace(handler, component=None):
+    """Detaches a handler returned by enable_trace and restores the default level."""
+    logger = _logger_for(component)
+    logger.removeHandler(handler)
+    logger.setLevel(DEFAULT_LEVEL if logger is _root else logging.NOTSET)
+    refresh()
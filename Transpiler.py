@@ -0,0 +1,372 @@
+"""
+Translation of ChefScript programs to Python source.
+
+transpile() turns the AST returned by Lowering.lower(), with its names bound
+by Resolver.resolve(), into a Python module:
+dish() and every full/hungry function become defs, simmer becomes a while
+loop, keepmix a "while True" loop that breaks on its condition, taste/elif/mix
+an if chain, and flip an if chain over its cases.  Each arithmetic operator
+is an Operators.operator_site() whose generic path is _apply_operator, so
+integer division, zero checks and invalid operands behave exactly as in the
+other engines.
+
+The module does not hold any state.  Symbols stay in the frames of
+PythonRuntime, errors and output stay in the SemanticAnalyzer, and the
+generated code reaches both through PythonRuntime.
+Its code object can therefore be compiled once and reused, and load() keeps
+the code objects of recently run programs in an LRU cache.
+"""
+import hashlib
+import math
+from array import array
+from collections import OrderedDict
+
+import Lowering
+from Interpreter import Interpreter
+from Operators import operator_site
+
+_NODE_CLASSES = (
+    "Program", "FunctionDef", "VarDecl", "ArrayDecl", "Assign", "ElementAssign", "IncDec", "CallStatement", "Serve",
+    "Make", "For", "ServeText", "ServeVar", "ServeIndex", "ServeCall", "ServeLen", "Var", "Index", "Call", "Len",
+)
+
+# Ints longer than this are written in hex: repr() of an int with more than
+# sys.get_int_max_str_digits() (4300 by default) digits raises ValueError
+_LITERAL_BITS = 4096
+
+
+def _raise(exception):
+    raise exception
+
+
+class Transpiler:
+    def __init__(self):
+        self.constants = []
+        self.lines = []
+        self.statements = {
+            Lowering.VarDecl: self.emit_var_decl,
+            Lowering.ArrayDecl: self.emit_array_decl,
+            Lowering.Assign: self.emit_assign,
+            Lowering.ElementAssign: self.emit_element_assign,
+            Lowering.IncDec: self.emit_inc_dec,
+            Lowering.CallStatement: self.emit_call_statement,
+            Lowering.Serve: self.emit_serve,
+            Lowering.Make: self.emit_make,
+            Lowering.If: self.emit_if,
+            Lowering.Flip: self.emit_flip,
+            Lowering.For: self.emit_for,
+            Lowering.While: self.emit_while,
+            Lowering.DoWhile: self.emit_do_while,
+        }
+        self.expressions = {
+            Lowering.Const: self.expr_const,
+            Lowering.Var: self.expr_var,
+            Lowering.Index: self.expr_index,
+            Lowering.Call: self.expr_call,
+            Lowering.Len: self.expr_len,
+            Lowering.Arith: self.expr_arith,
+            Lowering.ExprChain: self.expr_chain,
+            Lowering.Or: self.expr_or,
+            Lowering.And: self.expr_and,
+            Lowering.Compare: self.expr_compare,
+            Lowering.Fail: self.expr_fail,
+        }
+
+    def program(self, program):
+        functions = []
+        self.emit_def("chef_globals", program.global_decls)
+        for position, function in enumerate(program.functions):
+            prefix = f"function{position}"
+            self.emit_def(f"{prefix}_decls", function.parts[0])
+            self.emit_def(f"{prefix}_body", function.parts[1])
+            parts = [f"{prefix}_decls", f"{prefix}_body"]
+            if len(function.parts) > 2:
+                self.lines += [f"def {prefix}_spit():", f"    return {self.expression(function.parts[2])}", ""]
+                parts.append(f"{prefix}_spit")
+            functions.append(f"FunctionDef({function.name!r}, {function.return_type!r}, "
+                             f"{function.params!r}, [{', '.join(parts)}], {function.slot!r}, "
+                             f"{function.size!r}, {function.param_slots!r}, {function.pure!r})")
+        self.emit_def("dish_decls", program.local_decls)
+        self.emit_def("dish", program.body)
+        self.lines.append(f"PROGRAM = Program(chef_globals, [{', '.join(functions)}], dish_decls, dish, "
+                          f"{program.exit_code!r}, {program.exit_line!r}, {program.size!r}, "
+                          f"{program.dish_size!r})")
+        return "\n".join(["# Generated by Transpiler.py", ""] + self.constants + [""] + self.lines) + "\n"
+
+    def constant(self, source):
+        """Defines source once at module level; returns its name."""
+        name = f"_k{len(self.constants)}"
+        self.constants.append(f"{name} = {source}")
+        return name
+
+    def emit_def(self, name, statements):
+        self.lines.append(f"def {name}():")
+        self.emit_block(statements, 1)
+        self.lines.append("")
+
+    def emit_block(self, statements, depth):
+        if not statements:
+            self.emit("pass", depth)
+        handlers = self.statements
+        for statement in statements:
+            handlers[statement.__class__](statement, depth)
+
+    def emit(self, line, depth):
+        self.lines.append("    " * depth + line)
+
+    def emit_enter(self, slots, depth):
+        if slots is not None:
+            self.emit(f"_enter({slots!r})", depth)
+
+    def emit_scoped(self, statements, slots, depth):
+        self.emit_enter(slots, depth)
+        self.emit_block(statements, depth)
+
+    #-----------------------------------------------------------------
+    # Statements
+    #-----------------------------------------------------------------
+    def emit_var_decl(self, node, depth):
+        self.emit(f"_declare({self.constant(f'VarDecl({node.var_type!r}, {node.items!r}, {node.slots!r})')})",
+                  depth)
+
+    def emit_array_decl(self, node, depth):
+        source = (f"ArrayDecl({node.name!r}, {node.attributes!r}, {node.values!r}, "
+                  f"{node.errors!r}, {node.declared!r}, {node.slot!r})")
+        self.emit(f"_declare_array({self.constant(source)})", depth)
+
+    def emit_assign(self, node, depth):
+        target = self.constant(f"Assign({node.name!r}, None, None, None, {node.ref!r}, {node.slot!r})")
+        self.emit(f"_assign(_target({target}), {node.op!r}, {self.expression(node.value)}, {node.line!r})",
+                  depth)
+
+    def emit_element_assign(self, node, depth):
+        target = self.constant(f"ElementAssign({node.name!r}, None, {node.op!r}, None, {node.line!r}, {node.ref!r})")
+        self.emit(f"_store_element({target}, {self.expression(node.index)}, {self.expression(node.value)})", depth)
+
+    def emit_inc_dec(self, node, depth):
+        source = f"IncDec({node.name!r}, {node.delta!r}, {node.line!r}, {node.ref!r})"
+        self.emit(f"_inc_dec({self.constant(source)})", depth)
+
+    def emit_call_statement(self, node, depth):
+        source = f"CallStatement({node.name!r}, {self.thunks(node.args)}, {node.line!r}, {node.ref!r})"
+        self.emit(f"_call_statement({self.constant(source)})", depth)
+
+    def emit_serve(self, node, depth):
+        parts = []
+        for part in node.parts:
+            if isinstance(part, Lowering.ServeText):
+                parts.append(f"ServeText({part.text!r})")
+            elif isinstance(part, Lowering.ServeVar):
+                parts.append(f"ServeVar({part.name!r}, {part.checked!r}, {part.line!r}, {part.ref!r})")
+            elif isinstance(part, Lowering.ServeIndex):
+                parts.append(f"ServeIndex({part.name!r}, {self.thunk(part.index)}, {part.line!r}, {part.ref!r})")
+            elif isinstance(part, Lowering.ServeCall):
+                parts.append(f"ServeCall({part.name!r}, {self.thunks(part.args)}, {part.args_line!r}, "
+                             f"{part.line!r}, {part.ref!r})")
+            else:
+                parts.append(f"ServeLen({self.thunk(part.argument)}, {part.error!r}, {part.line!r})")
+        source = f"Serve([{', '.join(parts)}], {node.line!r})"
+        self.emit(f"_serve({self.constant(source)})", depth)
+
+    def emit_make(self, node, depth):
+        self.emit(f"_make({self.constant(f'Make({node.name!r}, {node.line!r}, {node.ref!r})')})", depth)
+
+    def emit_if(self, node, depth):
+        keyword = "if"
+        for position, (condition, body) in enumerate(node.branches):
+            self.emit(f"{keyword} {self.expression(condition)}:", depth)
+            self.emit_scoped(body, node.scopes[position], depth + 1)
+            keyword = "elif"
+        if node.orelse is not None:
+            self.emit("else:", depth)
+            self.emit_scoped(node.orelse, node.scopes[-1], depth + 1)
+
+    def emit_flip(self, node, depth):
+        keyword = "if"
+        for is_pinch, literal, body in node.cases:
+            self.emit(f"{keyword} _flip({node.ref!r}, {is_pinch!r}, {literal!r}):", depth)
+            self.emit_block(body, depth + 1)
+            keyword = "elif"
+        if node.default is not None:
+            self.emit("else:", depth)
+            self.emit_block(node.default, depth + 1)
+
+    def emit_for(self, node, depth):
+        source = (f"For({node.declare!r}, {node.name!r}, {node.init_name!r}, {node.init_value!r}, "
+                  f"None, None, {node.step!r}, {node.line!r}, {node.ref!r}, {node.init_ref!r}, "
+                  f"{node.step_ref!r})")
+        loop = self.constant(source)
+        self.emit_enter(node.scope, depth)
+        self.emit(f"_init_for({loop})", depth)
+        self.emit(f"while {self.expression(node.condition)}:", depth)
+        self.emit_block(node.body, depth + 1)
+        self.emit(f"_tick({node.line!r})", depth + 1)
+        self.emit(f"if not _step({loop}):", depth + 1)
+        self.emit("break", depth + 2)
+
+    def emit_while(self, node, depth):
+        self.emit_enter(node.scope, depth)
+        self.emit(f"while {self.expression(node.condition)}:", depth)
+        self.emit_block(node.body, depth + 1)
+        self.emit(f"_tick({node.line!r})", depth + 1)
+
+    def emit_do_while(self, node, depth):
+        self.emit_enter(node.scope, depth)
+        self.emit("while True:", depth)
+        self.emit_block(node.body, depth + 1)
+        self.emit(f"_tick({node.line!r})", depth + 1)
+        self.emit(f"if not {self.expression(node.condition)}:", depth + 1)
+        self.emit("break", depth + 2)
+
+    #-----------------------------------------------------------------
+    # Expressions
+    #-----------------------------------------------------------------
+    def expression(self, node):
+        return self.expressions[node.__class__](node)
+
+    def thunk(self, node):
+        """A lambda for an expression that an Interpreter method evaluates later, or None."""
+        return f"lambda: {self.expression(node)}" if node is not None else "None"
+
+    def thunks(self, nodes):
+        return f"[{', '.join(self.thunk(node) for node in nodes)}]"
+
+    def expr_const(self, node):
+        value = node.value
+        # Folding can produce inf or nan, which have no literal, and ints
+        # too long for repr(); hex() is not limited in length
+        if value.__class__ is float and not math.isfinite(value):
+            return self.constant(f"float({str(value)!r})")
+        if value.__class__ is int and value.bit_length() > _LITERAL_BITS:
+            return self.constant(f"int({hex(value)!r}, 16)")
+        return repr(value)
+
+    def expr_var(self, node):
+        return f"_load({self.constant(f'Var({node.name!r}, {node.line!r}, {node.ref!r})')})"
+
+    def expr_index(self, node):
+        source = f"Index({node.name!r}, {self.thunk(node.index)}, {node.line!r}, {node.ref!r})"
+        return f"_index({self.constant(source)})"
+
+    def expr_call(self, node):
+        return f"_call({self.constant(f'Call({node.name!r}, {self.thunks(node.args)}, {node.line!r}, {node.ref!r})')})"
+
+    def expr_len(self, node):
+        return f"_len({self.constant(f'Len({self.thunk(node.argument)}, {node.error!r}, {node.line!r})')})"
+
+    def expr_arith(self, node):
+        source = self.expression(node.first)
+        for op, operand in node.rest:
+            source = f"{self.constant(f'_site({op!r})')}({source}, {self.expression(operand)})"
+        return source
+
+    def expr_chain(self, node):
+        # The operands after the first are lambdas: a None operand ends the chain
+        rest = "".join(f"({self.constant(f'_site({op!r})')}, {self.thunk(operand)}), " for op, operand in node.rest)
+        return f"_chain({self.expression(node.first)}, ({rest}))"
+
+    def expr_or(self, node):
+        # Python's or and and stop at the operand that decides the result, as ChefScript's do
+        operands = [self.expression(node.first)] + [self.expression(operand) for operand in node.rest]
+        return f"({' or '.join(operands)})"
+
+    def expr_and(self, node):
+        return f"({self.expression(node.left)} and {self.expression(node.right)})"
+
+    def expr_compare(self, node):
+        return f"({self.expression(node.left)} {node.op} {self.expression(node.right)})"
+
+    def expr_fail(self, node):
+        return f"_raise({node.exc_type.__name__}({node.message!r}))"
+
+
+def transpile(program):
+    """Returns the Python source for a Program bound by Resolver.resolve()."""
+    return Transpiler().program(program)
+
+
+class CodeCache:
+    """Code objects of transpiled programs, keyed by the SHA-256 of their source."""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, source):
+        key = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        code = self.entries.get(key)
+        if code is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return code
+        self.misses += 1
+        code = compile(source, f"<chefscript {key[:12]}>", "exec")
+        self.entries[key] = code
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return code
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = 0
+
+
+code_cache = CodeCache()
+
+
+class PythonRuntime(Interpreter):
+    """Runs transpiled programs; blocks and expressions are Python callables here."""
+
+    def run_block(self, block):
+        block()
+
+    def evaluate(self, thunk):
+        return thunk()
+
+    def run_source(self, source):
+        namespace = self.namespace()
+        exec(code_cache.load(source), namespace)
+        self.run(namespace["PROGRAM"])
+
+    def namespace(self):
+        namespace = {name: getattr(Lowering, name) for name in _NODE_CLASSES}
+        namespace.update({
+            "array": array,  # recipe elements, see Lowering.recipe_storage()
+            "_site": self.operator_site,
+            "_raise": _raise,
+            "_chain": self.chain,
+            "_load": self.eval_var,
+            "_index": self.eval_index,
+            "_call": self.eval_call,
+            "_len": self.eval_len,
+            "_target": self.assign_target,
+            "_assign": self.assign,
+            "_store_element": self.store_element,
+            "_inc_dec": self.exec_inc_dec,
+            "_declare": self.exec_var_decl,
+            "_declare_array": self.exec_array_decl,
+            "_serve": self.exec_serve,
+            "_make": self.exec_make,
+            "_call_statement": self.exec_call_statement,
+            "_enter": self.enter_block,
+            "_init_for": self.init_for,
+            "_step": self.step_for,
+            "_flip": self.flip_matches,
+            "_tick": self.tick,
+        })
+        return namespace
+
+    def chain(self, value, rest):
+        if value is None:
+            return None
+        for apply, operand in rest:
+            right = operand()
+            if value is None or right is None:
+                return value
+            value = apply(value, right)
+        return value
+
+    def operator_site(self, op):
+        return operator_site(op, self.apply_operator)
@@ -0,0 +1,314 @@
+"""
+Stack machine that runs the Code objects produced by Bytecode.Compiler.
+
+VirtualMachine extends Interpreter: declarations, make, serve parts and recipe
+elements are handled by the same methods, and only the instruction loop and
+calls are new.
+
+Calls do not recurse.  Whether made in an expression (CALL), as a statement
+(CALL_STATEMENT) or inside serve (SERVE_CALL), each one is a Call on the call
+stack that execute() keeps: the caller's instructions, pc and value stack
+wait in it while the loop runs the callee's arguments, declarations, body
+and return expression one after the other.  Recipe indexes and len()
+operands are compiled inline, so a call inside them is one of these too, and
+how deep calls may nest is bounded by SemanticAnalyzer.max_depth rather than
+by Python's recursion limit.  A function whose return expression is nothing
+but a call ends with a tail call: the callee's Call takes the place of the
+caller's, so such calls take no room on the stack at all.
+"""
+import Lowering
+from Bytecode import (CONST, LOAD_VAR, BINARY, COMPARE, OR, AND, CHAIN, INDEX, LEN, CALL, RAISE,
+                      JUMP, JUMP_IF_FALSE, JUMP_IF_TRUE, JUMP_IF_NONE, LOAD_TARGET, STORE, INC_DEC,
+                      ENTER_BLOCK, FOR_INIT, FOR_STEP, FLIP_CASE, DECLARE, DECLARE_ARRAY,
+                      SERVE, MAKE, CALL_STATEMENT, TICK, DEFINED, SERVE_PART, SERVE_INDEX, SERVE_CALL,
+                      SERVE_VALUE, SERVE_JOIN, STORE_ELEMENT)
+from Interpreter import Interpreter, _serve_text, _step
+from SemanticAnalyzer import SemanticError
+
+# What a Call runs next
+_ARGUMENTS, _DECLS, _BODY, _RETURN = range(4)
+
+
+class Call:
+    """A call in progress: the callee's frame, how far it has got and where the caller resumes."""
+    __slots__ = ('node', 'signature', 'frame', 'is_void', 'strict', 'count', 'bound', 'phase', 'caller',
+                 'resume', 'key', 'first_error', 'replaces', 'value')
+
+    def __init__(self, node, signature, frame, kind, caller):
+        self.node = node
+        self.signature = signature
+        self.frame = frame
+        self.is_void = kind == CALL_STATEMENT  # a call statement leaves no value
+        # Call statements and calls inside serve bind recipes as recipes and
+        # end before the body when the argument count is wrong
+        self.strict = kind != CALL
+        self.count = min(signature.arity, len(node.args))  # arguments that are evaluated and bound
+        self.bound = -1           # the argument last bound
+        self.phase = _ARGUMENTS
+        self.caller = caller      # the frame to restore on return
+        self.resume = None        # (instructions, pc, stack) of the caller
+        self.key = None           # memo key of the arguments
+        self.first_error = 0
+        self.replaces = None      # the Call this one is the tail call of
+        self.value = None
+
+
+class VirtualMachine(Interpreter):
+    def run_block(self, code):
+        self.execute(code)
+
+    def evaluate(self, code):
+        return self.execute(code)
+
+    def execute(self, code):
+        """Runs code; returns the value left on the stack by an expression, else None."""
+        instructions = code.instructions
+        end = len(instructions)
+        stack = []
+        calls = []
+        frames = self.frames
+        tick = self.tick
+        pc = 0
+        while True:
+            push = stack.append
+            pop = stack.pop
+            while pc < end:
+                op, argument = instructions[pc]
+                pc += 1
+                if op == LOAD_VAR:
+                    for depth, slot in argument.ref:
+                        symbol = frames[depth][slot]
+                        if symbol is not None:
+                            push(symbol.value)
+                            break
+                    else:
+                        push(self.eval_var(argument))
+                elif op == CONST:
+                    push(argument)
+                elif op == BINARY:
+                    right = pop()
+                    stack[-1] = argument(stack[-1], right)
+                elif op == COMPARE:
+                    right = pop()
+                    stack[-1] = argument(stack[-1], right)
+                elif op == JUMP_IF_FALSE:
+                    if not pop():
+                        pc = argument
+                elif op == JUMP:
+                    pc = argument
+                elif op == LOAD_TARGET:
+                    push(self.assign_target(argument))
+                elif op == STORE:
+                    value = pop()
+                    self.assign(pop(), argument[0], value, argument[1])
+                elif op == TICK:
+                    tick(argument)
+                elif op == FOR_STEP:
+                    node, start, exit = argument
+                    if node.step is None:
+                        raise IndexError(Lowering._INDEX_ERROR)
+                    name, delta = node.step
+                    symbol = self.load(node.step_ref)
+                    if symbol is None:
+                        self.report("UNDEFINED_VARIABLE", f"VARIABLE '{name}' is UNDEFINED!", node.line)
+                        pc = exit
+                    else:
+                        symbol.set_value(_step(symbol.value, delta))
+                        pc = start
+                elif op == INC_DEC:
+                    self.exec_inc_dec(argument)
+                elif op == STORE_ELEMENT:
+                    value = pop()
+                    self.store_element(argument, pop(), value)
+                elif op == AND:
+                    if stack[-1]:
+                        pop()
+                    else:
+                        pc = argument
+                elif op == OR:
+                    if stack[-1]:
+                        pc = argument
+                    else:
+                        pop()
+                elif op == CHAIN:
+                    right = pop()
+                    left = stack[-1]
+                    if left is None or right is None:
+                        pc = argument[1]
+                    else:
+                        stack[-1] = argument[0](left, right)
+                elif op == JUMP_IF_NONE:
+                    if stack[-1] is None:
+                        pc = argument
+                elif op == JUMP_IF_TRUE:
+                    if pop():
+                        pc = argument
+                elif op == ENTER_BLOCK:
+                    self.enter_block(argument)
+                elif op == DEFINED:
+                    if not self.check_defined(argument[0]):
+                        push(None)
+                        pc = argument[1]
+                elif op == INDEX:
+                    stack[-1] = self.index_element(argument, stack[-1])
+                elif op == CALL or op == CALL_STATEMENT or op == SERVE_CALL:
+                    call = self.start_call(argument, op)
+                    if call is None:
+                        push(None)
+                        continue
+                    call.resume = (instructions, pc, stack)
+                    calls.append(call)
+                    break
+                elif op == LEN:
+                    if argument.error:
+                        push(self.eval_len(argument))
+                    else:
+                        stack[-1] = len(stack[-1])
+                elif op == SERVE_PART:
+                    push(self.serve_parts[argument.__class__](argument))
+                elif op == SERVE_INDEX:
+                    stack[-1] = self.serve_element(argument, stack[-1])
+                elif op == SERVE_VALUE:
+                    value = stack[-1]
+                    stack[-1] = _serve_text(value) if value else ""
+                elif op == SERVE_JOIN:
+                    text = pop()
+                    if text is None:
+                        pop()
+                        pc = argument
+                    else:
+                        stack[-1] += text
+                elif op == SERVE:
+                    text = pop()
+                    if text:
+                        self.output.write(text)
+                elif op == FLIP_CASE:
+                    name, is_pinch, literal, next_case = argument
+                    if not self.flip_matches(name, is_pinch, literal):
+                        pc = next_case
+                elif op == FOR_INIT:
+                    self.init_for(argument)
+                elif op == DECLARE:
+                    self.exec_var_decl(argument)
+                elif op == DECLARE_ARRAY:
+                    self.exec_array_decl(argument)
+                elif op == MAKE:
+                    self.exec_make(argument)
+                elif op == RAISE:
+                    self.eval_fail(argument)
+                else:
+                    raise ValueError(f"Unknown opcode {op}")
+            else:
+                # The code ran to its end: its value goes to the call waiting for it
+                if not calls:
+                    return stack[-1] if stack else None
+                calls[-1].value = stack[-1] if stack else None
+            call = calls[-1]
+            code = self.advance(call, calls)
+            if code is None:
+                # The call returned: the caller carries on where it stopped
+                call = calls.pop()
+                instructions, pc, stack = call.resume
+                if not call.is_void:
+                    stack.append(call.value)
+            else:
+                instructions = code.instructions
+                pc = 0
+                stack = []
+            end = len(instructions)
+
+    #-----------------------------------------------------------------
+    # Calls
+    #-----------------------------------------------------------------
+    def start_call(self, node, kind):
+        """A Call of node for the CALL, CALL_STATEMENT or SERVE_CALL instruction kind.
+
+        Returns None, for a value of None, when an expression calls an undefined
+        name or serve calls a void function.
+        """
+        symbol = self.load(node.ref)
+        if kind != CALL_STATEMENT:
+            if symbol is None:
+                self.report("UNDEFINED_IDENTIFIER", f"Identifier [{node.name}] does not exist!", node.line, node.name)
+                return None
+            if symbol.attributes.get("return_type", "none") == 'void':
+                self.report("VOID_FUNCTION", "Void functions does not return a value!", node.line)
+                if kind == SERVE_CALL:
+                    return None
+        signature, frame = self.new_frame(symbol)
+        return Call(node, signature, frame, kind, self.frames[1])
+
+    def advance(self, call, calls):
+        """Moves call on to the next Code it runs; returns None once it has returned."""
+        phase = call.phase
+        signature = call.signature
+        if phase == _ARGUMENTS:
+            if call.bound >= 0:
+                self.bind_argument(call.frame, signature.bindings[call.bound], call.value, call.strict)
+            call.bound += 1
+            if call.bound < call.count:
+                return call.node.args[call.bound]
+            return self.enter(call, calls)
+        if phase == _DECLS:
+            call.phase = _BODY
+            return signature.body
+        if phase == _RETURN:
+            return self.finish(call, call.value)
+        if call.is_void:
+            return self.finish(call, None)
+        return_expr = signature.return_expr
+        instructions = return_expr.instructions
+        # A tail call; the memo of a pure function that ends with one is never filled
+        if len(instructions) == 1 and instructions[0][0] == CALL:
+            tail = self.start_call(instructions[0][1], CALL)
+            if tail is None:
+                return self.finish(call, None)
+            tail.replaces = call
+            calls.append(tail)
+            return self.advance(tail, calls)
+        call.phase = _RETURN
+        return return_expr
+
+    def enter(self, call, calls):
+        """Starts the body of a call once its arguments are bound, as Interpreter._run_function does."""
+        node = call.node
+        signature = call.signature
+        missing = signature.arity - call.count
+        extra = len(node.args) - call.count
+        if missing:
+            self.report("MISSING_ARGUMENTS", "Doesn't meet the required number of arguments!", node.line)
+        if extra:
+            self.report("TOO_MANY_ARGUMENTS", "Too many arguments provided to function call!", node.line)
+        if call.strict and (missing or extra):
+            return self.finish(call, None)
+        replaced = call.replaces
+        if replaced is not None:
+            # Nothing is left to do in the call that ends with this one
+            del calls[-2]
+            call.caller = replaced.caller
+            call.resume = replaced.resume
+        if not call.is_void and signature.return_expr is None:
+            raise IndexError("list index out of range")
+        self.tick()
+        memo = signature.memo
+        if memo is not None and not call.is_void:
+            key = memo.key([call.frame[slot] for slot, _, _ in signature.bindings])
+            cached = memo.get(key) if key is not None else None
+            if cached is not None:
+                self.errors.extend(cached[1])
+                return self.finish(call, cached[0])
+            call.key = key
+            call.first_error = len(self.errors)
+        if len(calls) > self.analyzer.max_depth:
+            raise SemanticError("RECURSION_LIMIT", f"Calls nested deeper than {self.analyzer.max_depth}",
+                                line=node.line)
+        self.frames[1] = call.frame
+        call.phase = _DECLS
+        return signature.decls
+
+    def finish(self, call, value):
+        self.frames[1] = call.caller
+        if call.key is not None:
+            call.signature.memo.store(call.key, value, self.errors[call.first_error:])
+        call.value = value
+        return None
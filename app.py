@@ -1,7 +1,10 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
 from LexicalAnalyzer import LexicalAnalyzer
 from SyntaxAnalyzer import SyntaxAnalyzer, LL1Parser, cfg, parse_table, follow_set
-from SemanticAnalyzer import SemanticAnalyzer
+from SemanticAnalyzer import ListInput, ListSink, QueueSink, SemanticAnalyzer
+import json
+import queue
+import threading
 import time
 import sys
 import os
@@ -11,6 +14,17 @@ sys.stdout = open(os.devnull, 'w')
 
 app = Flask(__name__)
 
+# Upper bounds on how long a submitted program may run.  A request can ask
+# for a smaller budget with the max_steps and time_limit form fields.
+MAX_STEPS = 1_000_000   # loop iterations and function calls
+TIME_LIMIT = 5.0        # seconds of wall-clock time
+MAX_OUTPUT_CHARS = 1_000_000
+# "vm" keeps calls on a stack of its own, so recursion is bounded by the
+# analyzer's max_depth rather than by Python's recursion limit
+ENGINE = "vm"
+# Most lines sent in one Server-Sent Event by /run_stream
+STREAM_BATCH = 256
+
 def normalize_newlines(text):
     """Normalize newline characters for cross-platform compatibility."""
     return text.replace("\r\n", "\n").replace("\r", "\n")
@@ -30,8 +44,20 @@ def process_output(raw_output):
     
     return processed
 
+def execution_limits(form):
+    """The step budget and deadline for one request, capped at MAX_STEPS and TIME_LIMIT."""
+    limits = {"max_steps": MAX_STEPS, "time_limit": TIME_LIMIT}
+    for name, convert in (("max_steps", int), ("time_limit", float)):
+        try:
+            value = convert(form.get(name, ""))
+        except ValueError:
+            continue
+        if value > 0:
+            limits[name] = min(value, limits[name])
+    return limits
+
 # lex, parse, sem
-def analyze(code):
+def analyze(code, max_steps=MAX_STEPS, time_limit=TIME_LIMIT, inputs=()):
     tokens = []
     syntax_errors = []
     semantic_errors = []
@@ -56,7 +82,8 @@ def analyze(code):
     # Semantic Analysis
     if code.strip():
         if not syntax_errors:  # Only proceed if syntax analysis passed
-            analyzer = SemanticAnalyzer()
+            analyzer = SemanticAnalyzer(engine=ENGINE, max_steps=max_steps, time_limit=time_limit,
+                                        output=ListSink(MAX_OUTPUT_CHARS), input_provider=ListInput(inputs))
             semantic_errors_exceptions = analyzer.analyze(parser.parse_tree)
             
             for error in semantic_errors_exceptions:
@@ -73,6 +100,79 @@ def analyze(code):
     
     return tokens, syntax_errors, semantic_errors, output
 
+def request_inputs(form):
+    """The values make reads, one per line of the inputs form field."""
+    text = normalize_newlines(form.get("inputs", ""))
+    return ListInput(text.split("\n") if text else [])
+
+def sse(event, data):
+    """One Server-Sent Event carrying data as JSON."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def stream_run(code, limits, inputs):
+    """
+    Runs code and yields its output as Server-Sent Events while it runs:
+    "output" events hold the lines served since the last one, and a final
+    "done" event holds the errors.  Lines are not held back until the
+    program ends, so output already sent stays on the page even if the
+    program later reports an error.
+    """
+    errors = []
+    if code.strip():
+        try:
+            lexer = LexicalAnalyzer()
+            tokens = lexer.tokenize(code)
+            # Like Run, a program with lexical errors is not parsed
+            errors = list(lexer.errors)
+            if not errors:
+                parser = LL1Parser(cfg, parse_table, follow_set)
+                is_valid, errors = parser.parse(tokens)
+        except Exception as e:
+            errors = [f"An error occurred during analysis: {e}"]
+    if not code.strip() or errors:
+        yield sse("done", {"errors": errors})
+        return
+
+    lines = queue.Queue()
+    analyzer = SemanticAnalyzer(engine=ENGINE, output=QueueSink(lines, MAX_OUTPUT_CHARS), input_provider=inputs,
+                                **limits)
+    result = {"errors": []}
+
+    def run():
+        # analyze() closes the QueueSink, which puts the None that ends the stream
+        try:
+            result["errors"] = [str(error) for error in analyzer.analyze(parser.parse_tree)]
+        except Exception as e:
+            result["errors"] = [f"An error occurred during semantic analysis: {e}"]
+
+    worker = threading.Thread(target=run, daemon=True)
+    worker.start()
+    finished = False
+    try:
+        while not finished:
+            batch = [lines.get()]
+            while len(batch) < STREAM_BATCH and not lines.empty():
+                batch.append(lines.get())
+            if None in batch:
+                batch = batch[:batch.index(None)]
+                finished = True
+            if batch:
+                yield sse("output", process_output("\n".join(batch)))
+    except GeneratorExit:
+        # The client disconnected: stop the program rather than let it run to its limits
+        analyzer.budget.cancel()
+        raise
+    worker.join()
+    yield sse("done", {"errors": result["errors"]})
+
+@app.route("/run_stream", methods=["POST"])
+def run_stream():
+    """Streaming counterpart of the Run action (see stream_run)."""
+    code = normalize_newlines(request.form.get("code", ""))
+    events = stream_with_context(stream_run(code, execution_limits(request.form), request_inputs(request.form)))
+    return Response(events, mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @app.route("/download_file", methods=["POST"])
 def download_file():
     """Handle file download requests."""
@@ -118,7 +218,7 @@ def index():
             analyzer = LexicalAnalyzer()
             try:
                 tokens = analyzer.tokenize(code)
-                result = [(token[0], token[1]) for token in tokens]
+                result = [(token.lexeme, token.type) for token in tokens]
                 error_tokens_text = "\n".join(analyzer.errors) if hasattr(analyzer, 'errors') else ""
             except Exception as e:
                 error_tokens_text = f"An error occurred during lexical analysis: {e}"
@@ -137,7 +237,9 @@ def index():
         if (action == "Semantic" or action == "Run") and code.strip():
             if not error_tokens_text and not error_syntax_text:
                 try:
-                    analyzer = SemanticAnalyzer()
+                    analyzer = SemanticAnalyzer(engine=ENGINE, output=ListSink(MAX_OUTPUT_CHARS),
+                                                input_provider=request_inputs(request.form),
+                                                **execution_limits(request.form))
                     semantic_errors_exceptions = analyzer.analyze(parser.parse_tree)
                     semantic_errors = [str(error) for error in semantic_errors_exceptions]
                     error_semantic_text = "\n".join(semantic_errors)
@@ -0,0 +1,108 @@
+"""Recursive fib and factorial run with each engine, followed by the overhead
+of a single call: a loop that adds same(i) to a total, less the same loop
+adding i.
+
+Run from the repository root:  python benchmarks/call_benchmark.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from SemanticAnalyzer import SemanticAnalyzer
+from vm_benchmark import parse
+
+RECURSION = """
+dinein
+
+full pinch fib(pinch n) {
+    pinch result = 0;
+    result = n;
+    taste (n > 1) {
+        result = fib(n - 1) + fib(n - 2);
+    }
+    spit result;
+}
+
+full pinch fact(pinch n, pinch acc) {
+    pinch result = 0;
+    result = acc;
+    taste (n > 1) {
+        result = fact(n - 1, acc * n);
+    }
+    spit result;
+}
+
+hungry count(pinch n) {
+    taste (n > 0) {
+        count(n - 1);
+    }
+}
+
+chef pinch dish() {
+    pinch i;
+    serve(fib(%d));
+    for (i = 0; i < %d; i++) {
+        serve(fact(12, 1));
+    }
+    count(%d);
+    spit 0;
+}
+
+takeout
+"""
+
+LOOP = """
+dinein
+
+full pinch same(pinch x) {
+    spit x;
+}
+
+chef pinch dish() {
+    pinch i;
+    pinch total = 0;
+    for (i = 0; i < %d; i++) {
+        total += %s;
+    }
+    serve(total);
+    spit 0;
+}
+
+takeout
+"""
+
+# fib(n) makes 2 * fib(n + 1) - 1 calls, fact(12, 1) makes 12 and count(n) n + 1
+FIB_CALLS = {15: 1973, 18: 8361}
+ENGINES = ("tree", "ast", "vm", "python")
+
+
+def run(tree, engine):
+    analyzer = SemanticAnalyzer(engine=engine)
+    start = time.perf_counter()
+    analyzer.analyze(tree)
+    return time.perf_counter() - start, analyzer.get_output()
+
+
+if __name__ == "__main__":
+    for n, facts, depth in ((15, 20, 30), (18, 50, 60)):
+        tree = parse(RECURSION % (n, facts, depth))
+        calls = FIB_CALLS[n] + 12 * facts + depth + 1
+        print(f"fib({n}), {facts} x fact(12), count({depth}): {calls} calls")
+        expected = None
+        for engine in ENGINES:
+            elapsed, output = min(run(tree, engine) for _ in range(3))
+            expected = expected or output
+            assert output == expected, (engine, output, expected)
+            print(f"  {engine:<6} {elapsed:.4f} s, {elapsed / calls * 1e6:.1f} us per call")
+
+    count = 3000
+    with_calls, without_calls = parse(LOOP % (count, "same(i)")), parse(LOOP % (count, "i"))
+    print(f"Overhead of one call, {count} calls:")
+    for engine in ENGINES:
+        called, output = min(run(with_calls, engine) for _ in range(3))
+        inline, expected = min(run(without_calls, engine) for _ in range(3))
+        assert output == expected, (engine, output, expected)
+        print(f"  {engine:<6} {(called - inline) / count * 1e6:.1f} us")
@@ -0,0 +1,57 @@
+"""A loop whose body is made of literals and constant sub-expressions, run
+with each engine.  Every iteration used to decode the same literals and
+recompute the same products; now they are decoded and folded once before
+the program starts.
+
+Run from the repository root:  python benchmarks/constant_benchmark.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from SemanticAnalyzer import SemanticAnalyzer
+from vm_benchmark import ENGINES, parse
+
+CONSTANT = """
+dinein
+
+chef pinch dish() {
+    pinch i;
+    pinch x = 0;
+    skim f = 0.0;
+    for (i = 0; i < %d; i++) {
+        x = x + 2 * 3 - 8 / 4;
+        f = f + 1.5 * 2.0 - 0.25;
+        taste (i %% 2 == 0 && 10 > 3 * 3) {
+            x = x - (7 - 6);
+        }
+    }
+    serve("x " + x);
+    serve("f " + f);
+    spit 0;
+}
+
+takeout
+"""
+
+
+def run(tree, engine):
+    analyzer = SemanticAnalyzer(engine=engine)
+    start = time.perf_counter()
+    analyzer.analyze(tree)
+    return time.perf_counter() - start, analyzer.get_output()
+
+
+if __name__ == "__main__":
+    for count in (500, 2000):
+        tree = parse(CONSTANT % count)
+        print(f"Constant expressions, {count} iterations:")
+        expected = None
+        for engine in ENGINES:
+            elapsed, output = min(run(tree, engine) for _ in range(3))
+            expected = expected or output
+            assert output == expected, (engine, output, expected)
+            print(f"  {engine:<5} {elapsed:.4f} s, {elapsed / count * 1e6:.1f} us per iteration")
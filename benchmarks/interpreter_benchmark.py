@@ -0,0 +1,115 @@
+"""Semantic analysis / interpretation time of the parse-tree walker against the
+lowered-AST interpreter, and with tracing off, into a ring buffer and with every
+debug message logged to os.devnull.
+
+Run from the repository root:  python benchmarks/interpreter_benchmark.py
+"""
+import contextlib
+import io
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Tracing
+from LexicalAnalyzer import LexicalAnalyzer
+from SemanticAnalyzer import SemanticAnalyzer
+from SyntaxAnalyzer import LL1Parser, cfg, parse_table, follow_set
+
+PROGRAM = """
+dinein
+
+full pinch step(pinch a, pinch b) {
+    spit a * b + 1;
+}
+
+chef pinch dish() {
+    pinch i;
+    pinch j;
+    pinch total = 0;
+    skim ratio = 0.5;
+    for (i = 0; i < 40; i++) {
+        for (j = 0; j < 25; j++) {
+            total += i * j % 7;
+            taste (total > 1000) {
+                total = total - 1000;
+            }
+        }
+        ratio = ratio * 1.5;
+    }
+    serve("total " + total);
+    serve(step(3, 4));
+    spit 0;
+}
+
+takeout
+"""
+
+
+def parse(code):
+    parser = LL1Parser(cfg, parse_table, follow_set)
+    is_valid, errors = parser.parse(LexicalAnalyzer().tokenize(code))
+    assert is_valid, errors
+    return parser.parse_tree
+
+
+def bench(tree, repeat=3, engine="ast"):
+    best = None
+    for _ in range(repeat):
+        analyzer = SemanticAnalyzer(engine=engine)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            errors = analyzer.analyze(tree)
+        elapsed = time.perf_counter() - start
+        assert not [error for error in errors if not error.is_warning], errors
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class DevNullHandler(logging.Handler):
+    """Writes each message to os.devnull."""
+
+    def __init__(self, stream):
+        super().__init__()
+        self.stream = stream
+
+    def emit(self, record):
+        self.stream.write(record.getMessage() + "\n")
+
+
+def bench_full_output(tree):
+    root = logging.getLogger(Tracing.ROOT_LOGGER)
+    with open(os.devnull, "w") as devnull:
+        handler = DevNullHandler(devnull)
+        root.addHandler(handler)
+        root.setLevel(logging.DEBUG)
+        Tracing.refresh()
+        try:
+            return bench(tree)
+        finally:
+            root.removeHandler(handler)
+            root.setLevel(Tracing.DEFAULT_LEVEL)
+            Tracing.refresh()
+
+
+def bench_ring_buffer(tree):
+    handler = Tracing.enable_trace(capacity=10000)
+    try:
+        return bench(tree), len(handler.lines())
+    finally:
+        Tracing.disable_trace(handler)
+
+
+if __name__ == "__main__":
+    tree = parse(PROGRAM)
+    walker = bench(tree, engine="tree")
+    off = bench(tree)
+    print(f"Parse-tree walker:     {walker:.3f} s")
+    print(f"Lowered AST:           {off:.3f} s, {walker / off:.1f}x faster")
+    ring, kept = bench_ring_buffer(tree)
+    full = bench_full_output(tree)
+    print(f"Tracing off:           {off:.3f} s")
+    print(f"Ring buffer trace:     {ring:.3f} s ({kept} records kept)")
+    print(f"All to os.devnull:     {full:.3f} s, {full / off:.1f}x slower than tracing off")
@@ -0,0 +1,61 @@
+"""Tokens per second of the lexer engines on ~1 MB programs.
+
+Run from the repository root:  python benchmarks/lexer_benchmark.py
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from LexicalAnalyzer import LexicalAnalyzer
+
+TARGET_SIZE = 1024 * 1024
+
+
+def repeat_to_size(sample):
+    return (sample + "\n") * (TARGET_SIZE // (len(sample) + 1) + 1)
+
+
+def load_source():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with open(os.path.join(root, "test.pasta"), encoding="utf-8") as file:
+        return repeat_to_size(file.read())
+
+
+def identifier_source():
+    # Mostly keywords, keyword look-alikes and long identifiers.
+    line = "pinch chefs_total = dish_count + recipe_size * spicy_pepper_amount;"
+    return repeat_to_size("\n".join([line, "simmer (keepmixing <= hungrycats) {", "chop;", "}"]))
+
+
+def bench(engine, code, repeat=3):
+    best = None
+    count = 0
+    for _ in range(repeat):
+        analyzer = LexicalAnalyzer(engine=engine)
+        start = time.perf_counter()
+        tokens = analyzer.tokenize(code)
+        elapsed = time.perf_counter() - start
+        count = len(tokens)
+        best = elapsed if best is None else min(best, elapsed)
+    return count, best
+
+
+def bytes_per_token(engine, code):
+    tracemalloc.start()
+    tokens = LexicalAnalyzer(engine=engine).tokenize(code)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / len(tokens)
+
+
+if __name__ == "__main__":
+    for name, code in (("test.pasta", load_source()), ("identifiers", identifier_source())):
+        print(f"\nInput: {name}, {len(code) / 1024 / 1024:.2f} MB")
+        print(f"{'Engine'.ljust(10)}{'Tokens'.rjust(10)}{'Seconds'.rjust(10)}{'Tokens/sec'.rjust(14)}{'Bytes/token'.rjust(14)}")
+        for engine in ("dfa", "table"):
+            count, elapsed = bench(engine, code)
+            size = bytes_per_token(engine, code)
+            print(f"{engine.ljust(10)}{count:>10}{elapsed:>10.3f}{count / elapsed:>14,.0f}{size:>14.1f}")
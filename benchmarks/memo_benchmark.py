@@ -0,0 +1,60 @@
+"""Naive recursive fib run with each engine.  "pure" only uses its argument,
+so its calls are memoized; "impure" also adds a global that is always 0,
+which keeps every call, so it makes 2 * fib(n + 1) - 1 calls.
+
+Run from the repository root:  python benchmarks/memo_benchmark.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from SemanticAnalyzer import SemanticAnalyzer
+from vm_benchmark import parse
+
+FIB = """
+dinein
+pinch zero = 0;
+
+full pinch fib(pinch n) {
+    pinch result = 0;
+    result = n%s;
+    taste (n > 1) {
+        result = fib(n - 1) + fib(n - 2);
+    }
+    spit result;
+}
+
+chef pinch dish() {
+    serve(fib(%d));
+    spit 0;
+}
+
+takeout
+"""
+
+ENGINES = ("tree", "ast", "vm", "python")
+
+
+def run(tree, engine):
+    analyzer = SemanticAnalyzer(engine=engine)
+    start = time.perf_counter()
+    analyzer.analyze(tree)
+    return time.perf_counter() - start, analyzer.get_output()
+
+
+if __name__ == "__main__":
+    for n in (15, 18):
+        pure, impure = parse(FIB % ("", n)), parse(FIB % (" + zero", n))
+        print(f"fib({n}):")
+        for engine in ENGINES:
+            memoized, output = run(pure, engine)
+            every_call, expected = run(impure, engine)
+            assert output == expected, (engine, output, expected)
+            print(f"  {engine:<6} pure {memoized:.4f} s, impure {every_call:.4f} s")
+    tree = parse(FIB % ("", 40))
+    for engine in ENGINES:
+        elapsed, output = run(tree, engine)
+        print(f"fib(40) with {engine}: {output.splitlines()[0]} in {elapsed:.4f} s")
@@ -0,0 +1,62 @@
+"""Arithmetic-heavy loops: int, float and mixed operators, integer division
+and modulo, run with each engine.  Nearly every step is a binary operator,
+so the time goes to the operator sites of Operators.py.
+
+Run from the repository root:  python benchmarks/operator_benchmark.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from SemanticAnalyzer import SemanticAnalyzer
+from vm_benchmark import parse
+
+PROGRAM = """
+dinein
+
+chef pinch dish() {
+    pinch i;
+    pinch total = 0;
+    pinch mixed = 1;
+    skim x = 0.5;
+    skim y = 0.0;
+    for (i = 0; i < %d; i++) {
+        total = total + i * 3 - i / 2 + i %% 7;
+        mixed = (mixed * 31 + i) %% 1000003;
+        x = x * 1.5 - x / 3.0 + 0.25;
+        y = y + i * 0.5 - x / 4;
+    }
+    serve("total " + total);
+    serve("mixed " + mixed);
+    serve("x " + x);
+    serve("y " + y);
+    spit 0;
+}
+
+takeout
+"""
+
+ENGINES = ("tree", "ast", "vm", "python")
+
+
+def run(tree, engine):
+    analyzer = SemanticAnalyzer(engine=engine)
+    start = time.perf_counter()
+    analyzer.analyze(tree)
+    return time.perf_counter() - start, analyzer.get_output()
+
+
+if __name__ == "__main__":
+    for iterations in (2000, 10000):
+        tree = parse(PROGRAM % iterations)
+        operations = 17 * iterations
+        print(f"{iterations} iterations, {operations} operators:")
+        expected = None
+        for engine in ENGINES:
+            elapsed, output = min(run(tree, engine) for _ in range(3))
+            expected = expected or output
+            assert output == expected, (engine, output, expected)
+            print(f"  {engine:<6} {elapsed:.4f} s, {elapsed / operations * 1e9:.0f} ns per operator")
@@ -0,0 +1,83 @@
+"""Parse speed and parse tree size of LL1Parser on a generated program of about 50k tokens.
+
+Run from the repository root:  python benchmarks/parser_benchmark.py
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from LexicalAnalyzer import LexicalAnalyzer
+from SyntaxAnalyzer import LL1Parser, cfg, parse_table, follow_set
+
+FUNCTION = """
+full pinch f{n}(pinch a, pinch b) {{
+    pinch total = 0;
+    pinch i;
+    for (i = 0; i < a; i++) {{
+        total += i * b;
+        taste (total > 100) {{
+            total = total - 100;
+        }} elif (total == 7) {{
+            serve("seven " + total);
+        }} mix {{
+            total++;
+        }}
+    }}
+    simmer (b > 0) {{
+        b--;
+    }}
+    spit total + a * (b - 1);
+}}
+"""
+
+
+def generate_program(functions):
+    body = "".join(FUNCTION.format(n=n) for n in range(functions))
+    return "dinein\n" + body + "\nchef pinch dish() {\n    serve(f0(3, 4));\n    spit 0;\n}\n\ntakeout\n"
+
+
+def bench(tokens, repeat=3):
+    best = None
+    for _ in range(repeat):
+        parser = LL1Parser(cfg, parse_table, follow_set)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            is_valid, errors = parser.parse(tokens)
+        elapsed = time.perf_counter() - start
+        assert is_valid, errors
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def tree_memory(tokens):
+    parser = LL1Parser(cfg, parse_table, follow_set)
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        parser.parse(tokens)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, count_nodes(parser.parse_tree)
+
+
+def count_nodes(root):
+    count = 0
+    pending = [root]
+    while pending:
+        node = pending.pop()
+        count += 1
+        pending.extend(node.children)
+    return count
+
+
+if __name__ == "__main__":
+    tokens = LexicalAnalyzer().tokenize(generate_program(500))
+    elapsed = bench(tokens)
+    print(f"Tokens: {len(tokens)}")
+    print(f"Parse: {elapsed:.3f} s, {len(tokens) / elapsed:,.0f} tokens/sec")
+    size, nodes = tree_memory(tokens)
+    print(f"Tree: {nodes} nodes, {size / nodes:.0f} bytes/node")
@@ -0,0 +1,82 @@
+"""Array-heavy programs: prefix sums over a recipe and counting the
+inversions of a recipe, which reads two elements for every pair i < j, run
+with each engine; the larger recipe leaves out the slow "tree" engine.  Also
+prints the memory taken by a 1000-element recipe pinch, kept as its lexemes
+and as the storage Lowering.recipe_storage() gives it.
+
+Run from the repository root:  python benchmarks/recipe_benchmark.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from Lowering import recipe_storage
+from SemanticAnalyzer import SemanticAnalyzer
+from vm_benchmark import parse
+
+PROGRAM = """
+dinein
+
+chef pinch dish() {
+    recipe pinch a[%(size)d] = {%(elements)s};
+    pinch i, j, sum = 0, inversions = 0;
+    for (i = 0; i < %(size)d; i++) {
+        sum += a[i];
+    }
+    for (i = 0; i < %(size)d; i++) {
+        for (j = 0; j < %(size)d; j++) {
+            taste (j > i) {
+                taste (a[i] > a[j] ) {
+                    inversions++;
+                }
+            }
+        }
+    }
+    serve("sum " + sum);
+    serve("inversions " + inversions);
+    spit 0;
+}
+
+takeout
+"""
+
+ENGINES = ("tree", "ast", "vm", "python")
+
+
+def lexemes(size):
+    return [str(value * 7919 % 1000).replace("-", "~") for value in range(size)]
+
+
+def run(tree, engine):
+    analyzer = SemanticAnalyzer(engine=engine)
+    start = time.perf_counter()
+    analyzer.analyze(tree)
+    return time.perf_counter() - start, analyzer.get_output()
+
+
+def footprint(storage):
+    """Bytes taken by storage and the element objects it refers to."""
+    if not isinstance(storage, list):
+        return sys.getsizeof(storage)
+    return sys.getsizeof(storage) + sum(sys.getsizeof(element) for element in storage)
+
+
+if __name__ == "__main__":
+    for size, engines in ((60, ENGINES), (400, ENGINES[1:])):
+        tree = parse(PROGRAM % {"size": size, "elements": ", ".join(lexemes(size))})
+        reads = size + size * (size - 1)  # a[i] and a[j] for each j > i
+        print(f"{size} elements, {reads} element reads:")
+        expected = None
+        for engine in engines:
+            elapsed, output = min(run(tree, engine) for _ in range(3))
+            expected = expected or output
+            assert output == expected, (engine, output, expected)
+            print(f"  {engine:<6} {elapsed:.4f} s, {elapsed / reads * 1e9:.0f} ns per read")
+
+    texts = lexemes(1000)
+    print("Elements of a 1000-element recipe pinch:")
+    print(f"  lexemes  {footprint(list(texts)):>6} bytes")
+    print(f"  storage  {footprint(recipe_storage('pinch', texts)):>6} bytes")
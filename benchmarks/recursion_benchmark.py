@@ -0,0 +1,74 @@
+"""Deep recursion: down(n) nests n + 1 calls, wrap(n) ends with a tail call
+to it, count(n) is a recursive call statement and echo(n) recurses inside
+serve.  Every engine runs a depth Python's recursion limit allows; only "vm",
+which keeps calls on a stack of its own, runs the depth of 10,000.
+
+Run from the repository root:  python benchmarks/recursion_benchmark.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from SemanticAnalyzer import SemanticAnalyzer
+from vm_benchmark import parse
+
+PROGRAM = """
+dinein
+
+full pinch down(pinch n) {
+    pinch r = 0;
+    taste (n > 0) {
+        r = down(n - 1) + 1;
+    }
+    spit r;
+}
+
+full pinch wrap(pinch n) {
+    spit down(n);
+}
+
+hungry count(pinch n) {
+    taste (n > 0) {
+        count(n - 1);
+    }
+}
+
+full pinch echo(pinch n) {
+    taste (n > 0) {
+        serve(echo(n - 1));
+    }
+    spit n;
+}
+
+chef pinch dish() {
+    serve(wrap(%d));
+    count(%d);
+    serve(echo(%d));
+    spit 0;
+}
+
+takeout
+"""
+
+ENGINES = ("ast", "vm", "python")
+
+
+def run(tree, engine):
+    analyzer = SemanticAnalyzer(engine=engine)
+    start = time.perf_counter()
+    analyzer.analyze(tree)
+    return time.perf_counter() - start, analyzer.get_output(), analyzer.errors
+
+
+if __name__ == "__main__":
+    for depth, engines in ((50, ENGINES), (10_000, ("vm",))):
+        tree = parse(PROGRAM % (depth, depth, depth))
+        calls = 3 * depth + 4
+        print(f"depth {depth}: {calls} calls")
+        for engine in engines:
+            elapsed, output, errors = min(run(tree, engine) for _ in range(3))
+            assert not errors and output.startswith(f"{depth}\n1\n"), (engine, output[:100], errors)
+            print(f"  {engine:<6} {elapsed:.4f} s, {elapsed / calls * 1e6:.1f} us per call")
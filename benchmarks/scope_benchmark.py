@@ -0,0 +1,78 @@
+"""Nested for loops, which enter a loop scope per outer iteration and a
+conditional scope per taken taste branch, run with each engine.  The share of
+profiled time spent creating and discarding those scopes is printed as well.
+
+Run from the repository root:  python benchmarks/scope_benchmark.py
+"""
+import cProfile
+import os
+import pstats
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from Interpreter import Interpreter
+from SemanticAnalyzer import ScopePool, SemanticAnalyzer, SymbolTable
+from vm_benchmark import ENGINES, parse
+
+NESTED = """
+dinein
+
+chef pinch dish() {
+    pinch i;
+    pinch j;
+    pinch k;
+    pinch hits = 0;
+    for (i = 0; i < %d; i++) {
+        for (j = 0; j < %d; j++) {
+            for (k = 0; k < 3; k++) {
+                taste (k == 1) {
+                    hits++;
+                }
+            }
+        }
+    }
+    serve("hits " + hits);
+    spit 0;
+}
+
+takeout
+"""
+
+# Functions that only create, reuse or discard block scopes
+SCOPE_FUNCTIONS = {
+    (function.__code__.co_filename, function.__code__.co_firstlineno, function.__name__)
+    for function in (SemanticAnalyzer.enter_block_scope, SemanticAnalyzer.leave_block_scope,
+                     ScopePool.acquire, ScopePool.release, SymbolTable.__init__, Interpreter.enter_block)
+}
+
+
+def run(tree, engine):
+    analyzer = SemanticAnalyzer(engine=engine)
+    start = time.perf_counter()
+    analyzer.analyze(tree)
+    return time.perf_counter() - start, analyzer.get_output()
+
+
+def scope_share(tree, engine):
+    """Fraction of the profiled run time spent in scope bookkeeping."""
+    profiler = cProfile.Profile()
+    profiler.runcall(SemanticAnalyzer(engine=engine).analyze, tree)
+    stats = pstats.Stats(profiler).stats
+    total = sum(entry[2] for entry in stats.values())
+    scopes = sum(entry[2] for key, entry in stats.items() if key in SCOPE_FUNCTIONS)
+    return scopes / total if total else 0.0
+
+
+if __name__ == "__main__":
+    for outer, inner in ((10, 10), (30, 30)):
+        tree = parse(NESTED % (outer, inner))
+        print(f"Nested for loops, {outer} x {inner} x 3:")
+        expected = None
+        for engine in ENGINES:
+            elapsed, output = min(run(tree, engine) for _ in range(3))
+            expected = expected or output
+            assert output == expected, (engine, output, expected)
+            print(f"  {engine:<5} {elapsed:.4f} s, scope bookkeeping {scope_share(tree, engine):.1%} of profile")
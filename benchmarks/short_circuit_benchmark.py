@@ -0,0 +1,69 @@
+"""A guard of the form "taste (i < n && expensive(i))" in a loop where the
+first operand is false for nearly every iteration, so that with && stopping
+early the call is only paid for n times.
+
+Run from the repository root:  python benchmarks/short_circuit_benchmark.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from SemanticAnalyzer import SemanticAnalyzer
+from vm_benchmark import parse
+
+PROGRAM = """
+dinein
+
+pinch seed = 0;
+
+full pinch expensive(pinch n) {
+    pinch k;
+    pinch total = 0;
+    total = seed;
+    for (k = 0; k < 40; k++) {
+        total += n * k %% 3;
+    }
+    spit total;
+}
+
+chef pinch dish() {
+    pinch i;
+    pinch hits = 0;
+    for (i = 0; i < %d; i++) {
+        taste (i < 10 && expensive(i)) {
+            hits++;
+        }
+        taste (i > 5 ?? expensive(i)) {
+            hits++;
+        }
+    }
+    serve("hits " + hits);
+    spit 0;
+}
+
+takeout
+"""
+
+ENGINES = ("tree", "ast", "vm", "python")
+
+
+def run(tree, engine):
+    analyzer = SemanticAnalyzer(engine=engine)
+    start = time.perf_counter()
+    analyzer.analyze(tree)
+    return time.perf_counter() - start, analyzer.get_output()
+
+
+if __name__ == "__main__":
+    for iterations in (500, 2000):
+        tree = parse(PROGRAM % iterations)
+        print(f"{iterations} iterations:")
+        expected = None
+        for engine in ENGINES:
+            elapsed, output = min(run(tree, engine) for _ in range(3))
+            expected = expected or output
+            assert output == expected, (engine, output, expected)
+            print(f"  {engine:<6} {elapsed:.4f} s, {elapsed / iterations * 1e6:.1f} us per iteration")
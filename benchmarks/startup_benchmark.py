@@ -0,0 +1,59 @@
+"""Startup cost of the LL(1) tables: loading the grammar cache vs rebuilding it.
+
+Each measurement runs in a fresh interpreter, like a new worker process.
+Run from the repository root:  python benchmarks/startup_benchmark.py
+"""
+import os
+import py_compile
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT = """
+import sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import SyntaxAnalyzer
+print(time.perf_counter() - start)
+"""
+
+# Import, then time loading the tables from the cache file at path, or on
+# a cache miss the full grammar analysis plus writing the file.
+TABLES = """
+import sys, time
+sys.path.insert(0, {root!r})
+import SyntaxAnalyzer
+start = time.perf_counter()
+SyntaxAnalyzer.load_grammar_tables(SyntaxAnalyzer.cfg, {path!r})
+print(time.perf_counter() - start)
+"""
+
+
+def run(script, repeat=7):
+    times = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+        times.append(float(output))
+    return min(times)
+
+
+if __name__ == "__main__":
+    # Measure the module body, not source compilation: make sure the .pyc
+    # files exist even under PYTHONDONTWRITEBYTECODE.
+    for module in ("LexicalAnalyzer.py", "SyntaxAnalyzer.py"):
+        py_compile.compile(os.path.join(ROOT, module))
+
+    with tempfile.TemporaryDirectory() as directory:
+        missing = os.path.join(directory, "grammar_cache.marshal")
+        # Each rebuild writes the file, so remove it before every run.
+        rebuild = TABLES.format(root=ROOT, path=missing)
+        rebuild = f"import os\nif os.path.exists({missing!r}): os.remove({missing!r})\n" + rebuild
+        cached = run(IMPORT.format(root=ROOT))
+        loaded = run(TABLES.format(root=ROOT, path=os.path.join(ROOT, "grammar_cache.marshal")))
+        rebuilt = run(rebuild)
+
+    print(f"{'Import SyntaxAnalyzer (cache hit)'.ljust(45)}{cached * 1000:>8.2f} ms")
+    print(f"{'Load tables from the cache'.ljust(45)}{loaded * 1000:>8.2f} ms")
+    print(f"{'Rebuild tables on a cache miss'.ljust(45)}{rebuilt * 1000:>8.2f} ms")
@@ -0,0 +1,48 @@
+"""Repeated runs of one program with the lowered-AST interpreter and with the
+Python backend, whose first run also pays for compile() and whose later runs
+take the code object from the cache.
+
+Run from the repository root:  python benchmarks/transpiler_benchmark.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import Transpiler
+from Lowering import lower
+from Resolver import resolve
+from SemanticAnalyzer import SemanticAnalyzer
+from vm_benchmark import LOOPS, CALLS, parse
+
+RUNS = 20
+
+
+def run(tree, engine):
+    start = time.perf_counter()
+    analyzer = SemanticAnalyzer(engine=engine)
+    analyzer.analyze(tree)
+    return time.perf_counter() - start, analyzer.get_output()
+
+
+if __name__ == "__main__":
+    for name, code in (("Loop-heavy", LOOPS), ("Call-heavy", CALLS)):
+        tree = parse(code)
+        source = Transpiler.transpile(resolve(lower(tree)))
+        start = time.perf_counter()
+        compile(source, "<chefscript>", "exec")
+        compile_time = time.perf_counter() - start
+
+        Transpiler.code_cache.clear()
+        first, expected = run(tree, "python")
+        warm = min(run(tree, "python")[0] for _ in range(RUNS))
+        interpreted, output = min(run(tree, "ast") for _ in range(RUNS))
+        assert output == expected
+
+        print(f"{name} ({len(source.splitlines())} lines of Python, compile() {compile_time * 1000:.2f} ms):")
+        print(f"  ast              {interpreted:.4f} s per run")
+        print(f"  python, 1st run  {first:.4f} s")
+        print(f"  python, cached   {warm:.4f} s per run, {interpreted / warm:.1f}x faster than ast")
+        print(f"  cache            {Transpiler.code_cache.hits} hits, {Transpiler.code_cache.misses} misses")
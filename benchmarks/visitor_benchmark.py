@@ -0,0 +1,58 @@
+"""Static checking with the parse-tree walker: a program made of many
+declarations, functions and straight-line statements, so that nearly all of
+the time goes to SemanticAnalyzer.visit() and the visitors it dispatches to.
+
+Run from the repository root:  python benchmarks/visitor_benchmark.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from SemanticAnalyzer import SemanticAnalyzer
+from vm_benchmark import parse
+
+RUNS = 10
+
+
+def program(functions, statements):
+    lines = ["dinein", "pinch g0 = 1;", "skim g1 = 2.5;", 'pasta g2 = "x";']
+    for index in range(functions):
+        lines += [f"full pinch f{index}(pinch a, pinch b) {{",
+                  "    pinch c = 0;",
+                  "    c = a * b + 1;",
+                  "    spit c;",
+                  "}"]
+    lines += ["chef pinch dish() {", "    pinch x = 0;", "    pinch y = 3;", "    skim z = 1.5;"]
+    for index in range(statements):
+        lines.append(f"    x = x + y * {index % 7} - (y - 1) / 2;" if index % 3
+                     else f"    z = z * 2.0 + x;")
+    lines += ['    serve("x " + x);', "    spit 0;", "}", "takeout"]
+    return "\n".join(lines)
+
+
+def count_nodes(tree):
+    count, pending = 0, [tree]
+    while pending:
+        node = pending.pop()
+        count += 1
+        pending.extend(node.children)
+    return count
+
+
+def run(tree):
+    analyzer = SemanticAnalyzer(engine="tree")
+    start = time.perf_counter()
+    analyzer.analyze(tree)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    for functions, statements in ((20, 100), (80, 400)):
+        tree = parse(program(functions, statements))
+        elapsed = min(run(tree) for _ in range(RUNS))
+        nodes = count_nodes(tree)
+        print(f"{functions} functions, {statements} statements ({nodes} parse tree nodes):")
+        print(f"  tree  {elapsed:.4f} s, {elapsed / nodes * 1e6:.2f} us per node")
@@ -0,0 +1,105 @@
+"""Run time of the parse-tree walker, the lowered-AST interpreter and the
+bytecode VM on a loop-heavy and a call-heavy program.
+
+Run from the repository root:  python benchmarks/vm_benchmark.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from LexicalAnalyzer import LexicalAnalyzer
+from SemanticAnalyzer import SemanticAnalyzer
+from SyntaxAnalyzer import LL1Parser, cfg, parse_table, follow_set
+
+LOOPS = """
+dinein
+
+chef pinch dish() {
+    pinch i;
+    pinch j;
+    pinch total = 0;
+    pinch evens = 0;
+    for (i = 0; i < 60; i++) {
+        for (j = 0; j < 50; j++) {
+            total += i * j % 7;
+            taste (total % 2 == 0) {
+                evens++;
+            }
+        }
+        simmer (total > 500) {
+            total -= 500;
+        }
+    }
+    serve("total " + total);
+    serve("evens " + evens);
+    spit 0;
+}
+
+takeout
+"""
+
+CALLS = """
+dinein
+
+full pinch fib(pinch n) {
+    pinch result = 0;
+    result = n;
+    taste (n > 1) {
+        result = fib(n - 1) + fib(n - 2);
+    }
+    spit result;
+}
+
+full pinch square(pinch x) {
+    spit x * x;
+}
+
+chef pinch dish() {
+    pinch i;
+    pinch sum = 0;
+    serve(fib(14));
+    for (i = 0; i < 400; i++) {
+        sum += square(i) % 11;
+    }
+    serve("sum " + sum);
+    spit 0;
+}
+
+takeout
+"""
+
+ENGINES = ("tree", "ast", "vm")
+
+
+def parse(code):
+    parser = LL1Parser(cfg, parse_table, follow_set)
+    is_valid, errors = parser.parse(LexicalAnalyzer().tokenize(code))
+    assert is_valid, errors
+    return parser.parse_tree
+
+
+def bench(tree, engine, repeat=3):
+    best = None
+    output = None
+    for _ in range(repeat):
+        analyzer = SemanticAnalyzer(engine=engine)
+        start = time.perf_counter()
+        analyzer.analyze(tree)
+        elapsed = time.perf_counter() - start
+        output = analyzer.get_output()
+        best = elapsed if best is None else min(best, elapsed)
+    return best, output
+
+
+if __name__ == "__main__":
+    for name, code in (("Loop-heavy", LOOPS), ("Call-heavy", CALLS)):
+        tree = parse(code)
+        results = {engine: bench(tree, engine) for engine in ENGINES}
+        reference, expected = results["tree"]
+        print(f"{name}:")
+        for engine in ENGINES:
+            elapsed, output = results[engine]
+            assert output == expected, (engine, output, expected)
+            print(f"  {engine:<5} {elapsed:.3f} s, {reference / elapsed:.1f}x the tree walker")
@@ -0,0 +1,1119 @@
+import io
+import random
+import re
+import threading
+import time
+
+import run
+from LexicalAnalyzer import LexicalAnalyzer
+from SemanticAnalyzer import CallableInput, FileSink, ListInput, ListSink, SemanticAnalyzer, StreamInput
+from SyntaxAnalyzer import LL1Parser, cfg, parse_table, follow_set
+
+# ANSI color codes for output formatting
+GREEN = "\033[92m"
+RED = "\033[91m"
+CYAN = "\033[96m"
+RESET = "\033[0m"
+
+ENGINES = ("tree", "ast", "vm", "python")
+INPUTS = ["7", "~2", "2.5", "word", "", "3"]
+
+_pending_inputs = []
+
+
+def _answer(name):
+    # Past the end of INPUTS every entry is cancelled
+    return _pending_inputs.pop(0) if _pending_inputs else None
+
+
+def _no_input(name):
+    raise EOFError
+
+
+def parse(code):
+    """Returns the parse tree of code, or None when it does not parse."""
+    lexer = LexicalAnalyzer()
+    tokens = lexer.tokenize(code)
+    if lexer.errors:
+        return None
+    parser = LL1Parser(cfg, parse_table, follow_set)
+    is_valid, errors = parser.parse(tokens)
+    return parser.parse_tree if is_valid and not errors else None
+
+
+def execute(engine, tree, **arguments):
+    """Errors and output of one engine, or the exception it raised and the output so far."""
+    _pending_inputs[:] = INPUTS
+    analyzer = SemanticAnalyzer(engine=engine, **{"input_provider": CallableInput(_answer), **arguments})
+    try:
+        errors = analyzer.analyze(tree)
+    except Exception as e:
+        return ("exception", repr(e), list(analyzer.output_buffer))
+    return ("ok", [(error.code, error.identifier, str(error)) for error in errors],
+            analyzer.get_output(), analyzer.termination_code)
+
+
+def compare(tree, **arguments):
+    """Returns None when every engine agrees with "tree", else the first difference."""
+    expected = execute("tree", tree, **arguments)
+    for engine in ENGINES[1:]:
+        actual = execute(engine, tree, **arguments)
+        if actual != expected:
+            return f"tree: {expected}\n    {engine}: {actual}"
+    return None
+
+
+FEATURE_PROGRAMS = [
+    ("Arithmetic", """dinein
+chef pinch dish() {
+    pinch a = 7, b = ~3, c;
+    skim s = 1.5;
+    c = a + b * 2 - (a - 1) / 2;
+    serve(c);
+    c = a / 2 + a % 3;
+    serve("div " + c);
+    s = s * 2 + a / 2.0;
+    serve(s);
+    c = 10 - 17;
+    serve(c);
+    c = a / 0;
+    serve(c);
+    spit 0;
+}
+takeout"""),
+    ("Compound Assignment", """dinein
+pinch g = 4;
+chef pinch dish() {
+    pinch x = 10;
+    pasta p = "ab";
+    x += 5; x -= 2; x *= 3; x /= 2; serve(x);
+    x %= 4; serve(x);
+    x /= 0; x %= 0;
+    p += "cd"; p += 1; serve(p);
+    fresh = 3; fresh += 2; serve(fresh);
+    ++x; x++; --x; serve(x);
+    ++missing;
+    g += 1; serve(g);
+    spit 0;
+}
+takeout"""),
+    ("Conditions", """dinein
+chef pinch dish() {
+    pinch a = 5, b = 3;
+    bool t = yum, f = bleh;
+    pasta s = "hi";
+    taste (a > 10 && b > 1) { serve("and"); } mix { serve("and short"); }
+    taste (a > 1 && b > 1 && a > 100) { serve("and chain"); } mix { serve("and chain false"); }
+    taste (t ?? f) { serve("or"); }
+    taste (f ?? bleh ?? a == 5) { serve("or chain"); }
+    taste (a != b) { serve("ne"); }
+    taste (s == "hi") { serve("str eq"); }
+    taste (1 < 2 < 0) { serve("rel chain"); }
+    taste (a < 0) { serve("neg"); } elif (a == 5) { serve("elif"); } mix { serve("mix"); }
+    taste (a > !(bleh)) { serve("not quirk"); }
+    serve(t); serve(f);
+    spit 0;
+}
+takeout"""),
+    ("Negated Relational", """dinein
+chef pinch dish() {
+    pinch a = 1;
+    serve("before");
+    taste (!(a > 1)) { serve("never"); }
+    spit 0;
+}
+takeout"""),
+    ("Loops", """dinein
+chef pinch dish() {
+    pinch i, j, n = 0, w = 3;
+    for (i = 0; i < 4; i++) {
+        for (pinch k = i; k > 0; k--) { n += k; }
+    }
+    serve("n " + n);
+    simmer (w > 0) { w--; serve("w" + w); }
+    keepmix { w++; } simmer (w < 2);
+    serve(w);
+    for (j = 0; j < 3; missing++) { serve("once"); }
+    for (pinch d = 3; d > 0; --d) { serve("dec " + d); }
+    spit 0;
+}
+takeout"""),
+    ("Functions", """dinein
+pinch counter = 0;
+full pinch fib(pinch n) {
+    pinch r = 0;
+    r = n;
+    taste (n > 1) { r = fib(n - 1) + fib(n - 2); }
+    spit r;
+}
+full pinch add(pinch a, pinch b) { spit a + b; }
+full pasta shout(pasta w) { spit w + "!"; }
+full bool big(pinch v) { spit v > 100; }
+full pinch peek() { spit secret; }
+hungry bump() { counter++; }
+hungry show(pinch v, pasta label) { serve(label + v); }
+chef pinch dish() {
+    pinch y, secret = 42;
+    serve(fib(8));
+    serve(add(2, 3) + "");
+    y = add(4, add(1, 1)) * 2; serve(y);
+    serve(shout("hey"));
+    serve(big(500));
+    bump(); bump(); serve("counter " + counter);
+    show(42, "v=");
+    serve(peek());
+    y = add(1); serve(y);
+    y = add(1, 2, 3); serve(y);
+    serve(add(1));
+    serve(bump());
+    add(1, 2);
+    serve("after");
+    spit 0;
+}
+takeout"""),
+    ("Arrays", """dinein
+recipe pinch g[3] = {1, 2, 3};
+chef pinch dish() {
+    recipe pinch a[5] = {5, 3, 8, 1, 9};
+    recipe skim v[2] = {1.5, 2.5};
+    recipe pasta names[2] = {"ann", "bo"};
+    recipe pinch short[4] = {1, 2};
+    recipe pinch long[1] = {1, 2};
+    recipe pinch mixed[2] = {1, "x"};
+    recipe pinch empty[2];
+    pinch i, s = 0, x;
+    for (i = 0; i < 5; i++) { s += a[i]; }
+    serve("sum " + s);
+    serve(a[2] ); serve(names[1] ); serve(v[0] );
+    x = a[0] + a[1]; serve(x);
+    x = len(a); serve("len " + x);
+    serve(len(names));
+    a[0] = 99; serve(a[0] );
+    serve(a[7] );
+    x = a[9]; serve(x);
+    serve(g[2] + "");
+    serve(len[0] );
+    serve(len());
+    spit 0;
+}
+takeout"""),
+    ("Recipe Storage", """dinein
+hungry show(pinch r) {
+    serve("show " + r[1] );
+}
+chef pinch dish() {
+    recipe pinch a[6] = {4, ~2, 7, 0, ~9, 3};
+    recipe skim w[3] = {1.50, ~0.25, 2.0};
+    recipe pasta p[2] = {"x", "yz"};
+    recipe pinch t[2] = {1, 2, 3};
+    pinch i, sum = 0, low, big = 999999999;
+    skim scaled = 0.0;
+    low = a[0];
+    for (i = 0; i < 6; i++) {
+        sum += a[i];
+        serve("prefix " + sum);
+        taste (a[i] < low) {
+            low = a[i];
+        }
+    }
+    serve("low " + low);
+    for (i = 0; i < 3; i++) {
+        scaled += w[i];
+    }
+    serve("scaled " + scaled);
+    serve(w[0] );
+    serve(a[1] );
+    serve(p[1] + p[0] );
+    show(a);
+    serve(a[6] );
+    i = 0 - 1;
+    low = 5;
+    low = a[i];
+    serve("negative " + low);
+    serve(a[i] );
+    low = t[2];
+    serve("past " + low + " " + t[1] );
+    a[0] = big * big * big;
+    low = 1;
+    for (i = 0; i < 35; i++) {
+        low *= big;
+    }
+    w[0] = low;
+    serve("kept " + a[0] + " " + w[0] );
+    spit 0;
+}
+takeout"""),
+    ("Element Writes", """dinein
+hungry fill(pinch r, pinch v) {
+    pinch k;
+    for (k = 0; k < 3; k++) {
+        r[k] = v + k;
+    }
+}
+chef pinch dish() {
+    recipe pinch a[3] = {10, 20, 30};
+    recipe skim s[2] = {1.5, 2.5};
+    recipe pasta p[2] = {"ab", "cd"};
+    pinch i = 0;
+    a[0] += 5;
+    a[1] /= 3;
+    a[2] /= 0;
+    s[0] = 4;
+    s[1] *= 2;
+    p[0] += "xy";
+    p[1] = 7;
+    i = 0 - 1;
+    a[i] = 1;
+    a[3] = 1;
+    nope[0] = 1;
+    i[0] = 2;
+    serve(a[0] + " " + a[1] + " " + a[2] );
+    serve(s[0] + " " + s[1] );
+    serve(p[0] + " " + p[1] );
+    fill(a, 40);
+    serve(a[0] + " " + a[1] + " " + a[2] );
+    spit 0;
+}
+takeout"""),
+    ("Flip", """dinein
+chef pinch dish() {
+    pinch c = 2;
+    pasta p = "b";
+    flip(c) {
+        case 1: serve("one"); chop;
+        case 2: serve("two"); chop;
+        default: serve("dflt"); chop;
+    }
+    c = 9;
+    flip(c) { case 1: serve("one"); chop; default: serve("dflt"); chop; }
+    flip(p) { case "a": serve("pa"); chop; case "b": serve("pb"); chop; }
+    spit 0;
+}
+takeout"""),
+    ("Make", """dinein
+chef pinch dish() {
+    pinch a, b;
+    skim s;
+    pasta w;
+    make(a); make(b); make(s); make(w); make(w);
+    serve(a + b);
+    spit 1;
+}
+takeout"""),
+    ("Undefined Names", """dinein
+chef pinch dish() {
+    pinch a = 1;
+    serve(nope);
+    serve("x" + nope);
+    a = nope + 1;
+    a = nope * 2;
+    nofunc(1);
+    spit 0;
+}
+takeout"""),
+    ("Bad Termination", """dinein
+chef pinch dish() {
+    serve("end");
+    spit 5;
+}
+takeout"""),
+    ("Duplicate Function", """dinein
+hungry f() { }
+hungry f() { }
+chef pinch dish() {
+    spit 0;
+}
+takeout"""),
+    ("Hungry In Expression", """dinein
+hungry h() { serve("h"); }
+chef pinch dish() {
+    pinch v;
+    v = h();
+    spit 0;
+}
+takeout"""),
+    ("Call Binding", """dinein
+full pinch add(pinch a, pinch b) { spit a + b; }
+full pinch fact(pinch n, pinch acc) {
+    pinch r = 0;
+    r = acc;
+    taste (n > 1) { r = fact(n - 1, acc * n); }
+    spit r;
+}
+full pinch first(pinch r) { spit r[0]; }
+hungry show(pinch a, pinch b) { serve("show " + a + b); }
+chef pinch dish() {
+    recipe pinch nums[3] = {4, 5, 6};
+    serve("nested " + add(add(1, 2) , add(3, add(4, 5) )));
+    serve("fact " + fact(5, 1));
+    serve("first " + first(nums));
+    serve("short " + add(1));
+    serve("long " + add(1, 2, 3));
+    show(1);
+    show(1, 2, 3);
+    show(add(1, 1) , fact(3, 1));
+    spit 0;
+}
+takeout"""),
+    ("Memoized Calls", """dinein
+pinch bump = 0;
+full pinch fib(pinch n) {
+    pinch result = 0;
+    result = n;
+    taste (n > 1) { result = fib(n - 1) + fib(n - 2); }
+    spit result;
+}
+full pinch bad(pinch n) {
+    pinch r = 0;
+    r = "x" * n;
+    spit n + 1;
+}
+full pinch addbump(pinch n) {
+    spit n + bump;
+}
+full pinch loud(pinch n) {
+    serve("loud " + n);
+    spit n;
+}
+full pinch usesloud(pinch n) {
+    spit loud(n) + 1;
+}
+chef pinch dish() {
+    serve("fib " + fib(25));
+    serve("bad " + bad(1));
+    serve("bad " + bad(1));
+    serve("add " + addbump(1));
+    bump = 10;
+    serve("add " + addbump(1));
+    serve("uses " + usesloud(2));
+    serve("uses " + usesloud(2));
+    spit 0;
+}
+takeout"""),
+    ("Operator Sites", """dinein
+full skim half(skim v) {
+    spit v / 2;
+}
+full pasta twice(pasta w) {
+    spit w + w;
+}
+chef pinch dish() {
+    pinch i, c = 0;
+    skim x = 0.5;
+    for (i = 0; i < 4; i++) {
+        c = 7 / (2 - i);
+        serve("div " + c);
+        x = x * 3 + i % 2;
+        serve("mix " + x);
+    }
+    serve("half " + half(7));
+    serve("half " + half(7.5));
+    serve("half " + half("x"));
+    serve("twice " + twice("ab"));
+    serve("twice " + twice(4));
+    spit 0;
+}
+takeout"""),
+    ("Short Circuit", """dinein
+pinch calls = 0;
+full pinch probe(pinch n) {
+    serve("probe " + n);
+    calls++;
+    spit n;
+}
+chef pinch dish() {
+    pinch i, n = 2;
+    taste (0 && probe(1)) {
+        serve("and short");
+    }
+    taste (1 ?? probe(2)) {
+        serve("or short");
+    }
+    taste (0 ?? probe(3)) {
+        serve("or long");
+    }
+    taste (1 && probe(0)) {
+        serve("and true");
+    } mix {
+        serve("and long");
+    }
+    for (i = 0; i < 4; i++) {
+        taste (i < n && probe(i + 10)) {
+            serve("guard " + i);
+        }
+    }
+    simmer (n > 0 && probe(n)) {
+        n--;
+    }
+    taste (probe(0) ?? probe(0) ?? probe(5) ?? probe(6)) {
+        serve("chain");
+    }
+    taste (yum ?? probe(7)) {
+        serve("yum");
+    }
+    taste (bleh && probe(8)) {
+        serve("bleh");
+    }
+    taste (probe(1) && probe(0) && probe(9)) {
+        serve("and chain");
+    }
+    taste (probe(1) && probe(2) && probe(3)) {
+        serve("and chain true");
+    }
+    serve("calls " + calls);
+    spit 0;
+}
+takeout"""),
+    ("Constant Folding", """dinein
+chef pinch dish() {
+    pinch i, x = 0;
+    skim f = 0.0;
+    for (i = 0; i < 2; i++) {
+        x = 2 * 3 + 4 - 10 / 4;
+        serve("x " + x);
+        x = 7 / 0;
+        serve(x);
+        x = (1 + 2) % 0;
+        f = 10 / 4.0 * 2;
+        serve("f " + f);
+        x = "a" * 2;
+        taste (1 < 2 && 3 == 3) { serve("yes " + x); }
+        taste (bleh ?? 0 > 1) { serve("never"); } mix { serve("mix"); }
+    }
+    spit 0;
+}
+takeout"""),
+    ("Scoping", """dinein
+pinch shared = 1;
+full pinch peekloop() { spit inner; }
+full pinch twice(pinch shared) { spit shared * 2; }
+hungry need(pinch a, pinch b) { serve(a + b); }
+hungry setglobal() { shared = 5; made = 3; }
+full pinch readmade() { spit made; }
+full pinch readlate() { spit late; }
+chef pinch dish() {
+    pinch i, a = 10;
+    for (i = 0; i < 2; i++) {
+        serve(inner);
+        inner = i + 1;
+        serve("inner " + inner);
+        serve(peekloop());
+        for (pinch j = 0; j < 1; j++) {
+            serve(fresh);
+            fresh = 7;
+        }
+    }
+    serve(inner);
+    serve("twice " + twice(shared + a));
+    need(1);
+    serve("a " + a);
+    setglobal();
+    serve("shared " + shared);
+    serve(readmade());
+    late = 4;
+    serve("late " + readlate());
+    spit 0;
+}
+takeout"""),
+    # Folding gives inf, and an int too long for repr(), which the "python"
+    # engine cannot write as literals
+    ("Folded Limits", """dinein
+chef pinch dish() {
+    skim f = 0.0;
+    pinch big = 0;
+    f = %(huge_skim)s;
+    serve("inf " + f);
+    big = %(huge_pinch)s;
+    big = big - big + 1;
+    serve("big " + big);
+    spit 0;
+}
+takeout""" % {"huge_skim": " * ".join(["999999999.0"] * 35), "huge_pinch": " * ".join(["999999999"] * 140)}),
+]
+
+# Output every engine must give, where agreeing with each other is not enough
+EXPECTED_OUTPUTS = {
+    "Call Binding": "nested 15\nfact 120\nfirst 4\nshort \nlong \nshow 26\n\n===Program executed successfully===",
+    "Folded Limits": "inf inf\nbig 1\n\n===Program executed successfully===",
+    "Constant Folding": "x 8\n8\nf 5.0\nyes 8\nmix\nx 8\n8\nf 5.0\nyes 8\nmix\n\n===Program executed successfully===",
+    "Recipe Storage": "prefix 4\nprefix 2\nprefix 9\nprefix 9\nprefix 0\nprefix 3\nlow ~9\nscaled 3.25\n1.5\n~2\nyzx\nshow ~2\nnegative 5\npast 5 2\nkept 4 1.5\n\n===Program executed successfully===",
+    "Element Writes": "15 6 30\n4.0 5.0\nabxy cd\n40 41 42\n\n===Program executed successfully===",
+    "Short Circuit": "or short\nprobe 3\nor long\nprobe 0\nand long\nprobe 10\nguard 0\nprobe 11\nguard 1\nprobe 2\nprobe 1\nprobe 0\nprobe 0\nprobe 5\nchain\nyum\nprobe 1\nprobe 0\nprobe 1\nprobe 2\nprobe 3\nand chain true\ncalls 14\n\n===Program executed successfully===",
+    "Operator Sites": "div 3\nmix 1.5\ndiv 7\nmix 5.5\ndiv 7\nmix 16.5\ndiv ~7\nmix 50.5\nhalf 3\nhalf 3.75\nhalf \ntwice abab\ntwice 8\n\n===Program executed successfully===",
+    "Memoized Calls": "fib 75025\nbad 2\nbad 2\nadd 1\nadd 11\nloud 2\nuses 3\nloud 2\nuses 3\n\n===Program executed successfully===",
+    "Scoping": "inner 1\n1\ninner 2\ntwice 22\na 10\nshared 5\nlate 4\n\n===Program executed successfully===",
+}
+
+# Loops and calls each take a step of the budget: 3 for iterations, 3 calls,
+# 2 keepmix passes, then the endless simmer stops on its 5th pass
+BUDGET_PROGRAM = """dinein
+full pinch twice(pinch n) {
+    spit n * 2;
+}
+chef pinch dish() {
+    pinch i, n = 0;
+    for (i = 0; i < 3; i++) {
+        serve("for " + twice(i));
+    }
+    keepmix {
+        n++;
+    } simmer (n < 2);
+    serve("n " + n);
+    simmer (n > 0) {
+        serve("spin " + n);
+        n++;
+    }
+    spit 0;
+}
+takeout"""
+
+INPUT_PROGRAM = """dinein
+chef pinch dish() {
+    pinch a, b;
+    make(a);
+    serve("a " + a);
+    make(b);
+    serve("b " + b);
+    spit 0;
+}
+takeout"""
+
+# Every simmer pass squares a number of about 200,000 bits, so each step takes
+# milliseconds; the deadline must stop it within a step or two of passing
+SLOW_STEP_PROGRAM = """dinein
+chef pinch dish() {
+    pinch i, x = 3, y = 0;
+    for (i = 0; i < 17; i++) {
+        x = x * x;
+    }
+    simmer (i > 0) {
+        y = x * x;
+    }
+    spit 0;
+}
+takeout"""
+SLOW_STEP_LIMIT = 0.2
+
+# (name, program, SemanticAnalyzer arguments, error every engine reports, output of the run)
+LIMIT_TESTS = [
+    ("Step Budget", BUDGET_PROGRAM, {"max_steps": 12},
+     "[EXECUTION_LIMIT] Program exceeded its budget of 12 steps on line 14",
+     "for \nfor 2\nfor 4\nn 2\nspin 2\nspin 3\nspin 4\nspin 5\nspin 6\n\n===Program executed successfully==="),
+    ("Deadline", BUDGET_PROGRAM, {"time_limit": 0.05},
+     "[EXECUTION_LIMIT] Program ran longer than 0.05 seconds on line 14", None),
+    ("Output Cap", BUDGET_PROGRAM, {"output": ListSink(max_chars=40)},
+     "[OUTPUT_LIMIT] Program output exceeded 40 characters",
+     "for \nfor 2\nfor 4\nn 2\nspin 2\nspin 3\n\n===Program executed successfully==="),
+    ("No Input", INPUT_PROGRAM, {"input_provider": CallableInput(_no_input)},
+     "[INPUT_EXHAUSTED] No input left for [a] on line 4", "===Program executed successfully==="),
+]
+
+
+def check_limits():
+    """Runs each of LIMIT_TESTS; returns the (name, code, difference) of failures."""
+    failed = []
+    for name, code, arguments, error, output in LIMIT_TESTS:
+        tree = parse(code)
+        if output is not None:
+            difference = compare(tree, **arguments)
+            if difference is not None:
+                failed.append((name, code, difference))
+                continue
+        # How far a timed run gets varies, so only its error is compared
+        for engine in ENGINES:
+            result = execute(engine, tree, **arguments)
+            actual = (result[0], [message for _, _, message in result[1]])
+            if actual != ("ok", [error]) or output not in (None, result[2]):
+                failed.append((name, code, f"{engine}: {result}"))
+                break
+    tree = parse(SLOW_STEP_PROGRAM)
+    error = f"[EXECUTION_LIMIT] Program ran longer than {SLOW_STEP_LIMIT} seconds on line 7"
+    for engine in ENGINES:
+        start = time.perf_counter()
+        result = execute(engine, tree, time_limit=SLOW_STEP_LIMIT)
+        elapsed = time.perf_counter() - start
+        if result[:2] != ("ok", [("EXECUTION_LIMIT", None, error)]) or elapsed > 5 * SLOW_STEP_LIMIT:
+            failed.append(("Slow Steps", SLOW_STEP_PROGRAM, f"{engine}: {elapsed:.2f} s, {result}"))
+            break
+    # Cancelling from another thread, as /run_stream does when its client
+    # disconnects, stops the endless simmer of a run that has no limits
+    tree = parse(BUDGET_PROGRAM)
+    for engine in ENGINES:
+        analyzer = SemanticAnalyzer(engine=engine)
+        result = []
+        worker = threading.Thread(target=lambda: result.extend(map(str, analyzer.analyze(tree))), daemon=True)
+        worker.start()
+        time.sleep(0.05)
+        analyzer.budget.cancel()
+        worker.join(2)
+        if worker.is_alive() or result != ["[CANCELLED] Program was cancelled on line 14"]:
+            failed.append(("Cancel", BUDGET_PROGRAM, f"{engine}: alive {worker.is_alive()}, {result}"))
+            break
+    return failed
+
+
+# (name, input provider factory, output sink max_chars, errors, text written to the FileSink);
+# INPUT_PROGRAM runs with a fresh provider and a FileSink on every engine
+IO_TESTS = [
+    ("List Input", lambda: ListInput(["4", "~5"]), None, [],
+     "input: 4\na 4\ninput: ~5\nb ~5\n"),
+    ("List Input Exhausted", lambda: ListInput(["4"]), None,
+     ["[INPUT_EXHAUSTED] No input left for [b] on line 6"], "input: 4\na 4\n"),
+    ("Stream Input", lambda: StreamInput(io.StringIO("4\r\n~5\n")), None, [],
+     "input: 4\na 4\ninput: ~5\nb ~5\n"),
+    ("Stream Input Exhausted", lambda: StreamInput(io.StringIO("4")), None,
+     ["[INPUT_EXHAUSTED] No input left for [b] on line 6"], "input: 4\na 4\n"),
+    ("File Sink Cap", lambda: ListInput(["4", "5"]), 13,
+     ["[OUTPUT_LIMIT] Program output exceeded 13 characters"], "input: 4\na 4\n"),
+]
+
+
+def check_io():
+    """Runs each of IO_TESTS, then run.py on stdin and stdout streams; returns the failures."""
+    failed = []
+    tree = parse(INPUT_PROGRAM)
+    for name, provider, max_chars, errors, text in IO_TESTS:
+        for engine in ENGINES:
+            stream = io.StringIO()
+            analyzer = SemanticAnalyzer(engine=engine, input_provider=provider(), output=FileSink(stream, max_chars))
+            actual = [str(error) for error in analyzer.analyze(tree)]
+            if actual != errors or stream.getvalue() != text:
+                failed.append((name, INPUT_PROGRAM, f"{engine}: {actual}, {stream.getvalue()!r}"))
+                break
+    # The command line reads make input from a stream and serves to another
+    stdout = io.StringIO()
+    errors = run.run(INPUT_PROGRAM, stdin=io.StringIO("7\n"), stdout=stdout)
+    if errors != ["[INPUT_EXHAUSTED] No input left for [b] on line 6"] or stdout.getvalue() != "input: 7\na 7\n":
+        failed.append(("Command Line", INPUT_PROGRAM, f"{errors}, {stdout.getvalue()!r}"))
+    errors = run.run("dinein\nchef pinch dish() {\n    pinch x = 4 @;\n    spit 0;\n}\ntakeout")
+    if errors != ["Line 3: Unexpected Character '@'."]:
+        failed.append(("Command Line Lexical Error", "", f"{errors}"))
+    return failed
+
+
+# Recursion far deeper than Python's own limit, which only "vm" runs: wrap()
+# ends with a tail call, count() is a recursive call statement and echo(),
+# parity() and word() recurse inside serve, a recipe index and len()
+DEEP_PROGRAM = """dinein
+recipe pinch turn[2] = {1, 0};
+full pinch down(pinch n) {
+    pinch r = 0;
+    taste (n > 0) {
+        r = down(n - 1) + 1;
+    }
+    spit r;
+}
+full pinch wrap(pinch n) {
+    spit down(n);
+}
+hungry count(pinch n) {
+    taste (n > 0) {
+        count(n - 1);
+    }
+}
+full pinch echo(pinch n) {
+    taste (n > 0) {
+        serve(echo(n - 1));
+    }
+    spit n;
+}
+full pinch parity(pinch n) {
+    pinch r = 0;
+    taste (n > 0) {
+        r = turn[parity(n - 1) ];
+    }
+    spit r;
+}
+full pasta word(pinch n) {
+    pasta w = "";
+    taste (n > 0) {
+        w = "a";
+        taste (len(word(n - 1) ) == 1) {
+            w = "ab";
+        }
+    }
+    spit w;
+}
+chef pinch dish() {
+    serve(wrap(%(depth)d));
+    count(%(depth)d);
+    serve(echo(%(depth)d));
+    serve(turn[parity(%(depth)d) ] );
+    serve(word(%(depth)d));
+    serve("done");
+    spit 0;
+}
+takeout"""
+DEEP_OUTPUT = "".join(f"{n}\n" for n in range(1, 5001))
+
+# Endless tail recursion: it runs until the step budget stops it, whatever the depth limit
+TAIL_PROGRAM = """dinein
+full pinch forever(pinch n) {
+    spit forever(n + 1);
+}
+chef pinch dish() {
+    serve("start");
+    serve(forever(1));
+    spit 0;
+}
+takeout"""
+
+# (name, program, SemanticAnalyzer arguments, errors "vm" reports, output of the run)
+VM_TESTS = [
+    ("Deep Recursion", DEEP_PROGRAM % {"depth": 5000}, {}, [],
+     "5000\n" + DEEP_OUTPUT + "1\nab\ndone\n\n===Program executed successfully==="),
+    ("Call Depth", DEEP_PROGRAM % {"depth": 5000}, {"max_depth": 100},
+     ["[RECURSION_LIMIT] Calls nested deeper than 100 on line 6"], "===Program executed successfully==="),
+    ("Tail Calls", TAIL_PROGRAM, {"max_steps": 2000, "max_depth": 10},
+     ["[EXECUTION_LIMIT] Program exceeded its budget of 2000 steps"], "start\n\n===Program executed successfully==="),
+]
+
+
+def check_vm():
+    """Runs each of VM_TESTS with "vm"; returns the (name, code, difference) of failures."""
+    failed = []
+    for name, code, arguments, errors, output in VM_TESTS:
+        result = execute("vm", parse(code), **arguments)
+        if result[0] != "ok" or [message for _, _, message in result[1]] != errors or result[2] != output:
+            failed.append((name, code, f"vm: {result}"))
+    # The other engines run out of Python's stack, which stops the program the same way
+    code = DEEP_PROGRAM % {"depth": 5000}
+    for engine in ENGINES:
+        if engine == "vm":
+            continue
+        result = execute(engine, parse(code), max_depth=50_000)
+        error = f'[RECURSION_LIMIT] Calls nested deeper than the "{engine}" engine allows; "vm" allows 50000'
+        if result != ("ok", [("RECURSION_LIMIT", None, error)], "===Program executed successfully===", 0):
+            failed.append(("Python Stack", code, f"{engine}: {result}"))
+    return failed
+
+
+class ProgramGenerator:
+    """
+    Builds random programs that follow the grammar and always terminate:
+    loops count a variable of their own down to zero and functions only call
+    functions declared before them. Most operands match the types around them;
+    a few do not, so the error paths are exercised too.
+    """
+
+    TYPES = ("pinch", "skim", "pasta", "bool")
+    NUMERIC = ("pinch", "skim")
+    EXPRESSION_OPS = ("+", "-", "*", "/", "%", "==", "!=", "<", ">", "<=", ">=", "&&", "??")
+    # Never declared: assignments create them in whatever scope they run in
+    SCRATCH = ("s0", "s1")
+
+    def __init__(self, rng, chaos=0.06):
+        self.rng = rng
+        self.chaos = chaos
+
+    def wild(self):
+        return self.rng.random() < self.chaos
+
+    def literal(self, kind=None, signed=True):
+        rng = self.rng
+        kind = kind or rng.choice(self.TYPES)
+        if kind == "pinch":
+            return rng.choice(["0", "1", "2", "3", "7", "10"] + (["~1", "~4"] if signed else []))
+        if kind == "skim":
+            return rng.choice(["0.5", "1.5", "2.0"] + (["~0.5"] if signed else []))
+        if kind == "pasta":
+            return rng.choice(['"a"', '"bc"', '"x-y"', '"True"', '""'])
+        return rng.choice(["yum", "bleh"])
+
+    def name(self, kinds=None):
+        """A variable of one of kinds, or occasionally any name at all."""
+        rng = self.rng
+        every = [name for names in self.variables.values() for name in names]
+        if self.wild():
+            return rng.choice(["nope", "len", *self.SCRATCH] + every)
+        pool = [name for kind in (kinds or self.TYPES) for name in self.variables[kind]]
+        return rng.choice(pool or every or ["nope"])
+
+    def number(self, depth):
+        """A numeric operand: literal, variable, array element, len() or call."""
+        rng = self.rng
+        if self.wild():
+            return rng.choice([self.literal(rng.choice(self.TYPES[:3])), self.name(), f"len({self.name()})"])
+        roll = rng.random()
+        if roll < 0.4:
+            # Negative literals inside expressions evaluate to None, so keep them to wild picks
+            return self.literal(rng.choice(self.NUMERIC), signed=False)
+        arrays = self.arrays["pinch"] + self.arrays["skim"]
+        if roll < 0.8 or depth <= 0:
+            pool = self.variables["pinch"] + self.variables["skim"]
+            return rng.choice(pool) if pool else self.literal("pinch")
+        if roll < 0.88 and arrays:
+            name = rng.choice(arrays)
+            return f"{name}[{rng.randrange(self.sizes[name] + (1 if self.wild() else 0))}]"
+        if roll < 0.93 and (self.arrays["pasta"] or self.variables["pasta"]):
+            return f"len({rng.choice(self.arrays['pasta'] + self.variables['pasta'] + arrays)})"
+        functions = [function for function in self.functions if function[2] in self.NUMERIC]
+        if functions:
+            return self.call(rng.choice(functions), depth)
+        return self.literal("pinch")
+
+    def call(self, function, depth):
+        name, params, _ = function
+        args = [self.arith(depth - 1, kind) for kind in params]
+        if self.wild():
+            args = args[:-1] if args and self.rng.random() < 0.5 else args + ["1"]
+        return f"{name}({', '.join(args)})"
+
+    def arith(self, depth, kind="pinch"):
+        rng = self.rng
+        if kind == "pasta" and not self.wild():
+            parts = [rng.choice([self.literal("pasta")] + self.variables["pasta"]) for _ in range(rng.randint(1, 2))]
+            return " + ".join(parts)
+        parts = [self.factor(depth)]
+        for _ in range(rng.choice([0, 0, 1, 1, 2])):
+            op = rng.choice(["+", "-", "*", "+", "-"] + (["/", "%"] if self.wild() or kind == "skim" else []))
+            parts += [op, self.factor(depth)]
+        return " ".join(parts)
+
+    def factor(self, depth):
+        if depth > 0 and self.rng.random() < 0.15:
+            return f"({self.arith(depth - 1)})"
+        return self.number(depth)
+
+    def primary(self, depth):
+        rng = self.rng
+        roll = rng.random()
+        if roll < 0.1:
+            return rng.choice(["yum", "bleh"])
+        if roll < 0.15:
+            return self.name(("bool",))
+        if roll < 0.17 and depth > 0:
+            return f"{rng.choice(['!', '!!'])}({self.condition(depth - 1)})"
+        return self.arith(depth)
+
+    def comparison(self, depth):
+        rng = self.rng
+        if rng.random() < 0.3:
+            return self.primary(depth)
+        parts = [self.arith(depth)]
+        for _ in range(rng.choice([1, 1, 1, 2]) if not self.wild() else 2):
+            parts += [rng.choice(["<", ">", "<=", ">="]), self.arith(depth)]
+        return " ".join(parts)
+
+    def equality(self, depth):
+        rng = self.rng
+        if rng.random() < 0.2:
+            kind = rng.choice(self.TYPES)
+            return f"{self.name((kind,))} {rng.choice(['==', '!='])} {self.literal(kind)}"
+        return self.comparison(depth)
+
+    def condition(self, depth=2):
+        rng = self.rng
+        parts = [self.equality(depth)]
+        for _ in range(rng.choice([0, 0, 1, 2])):
+            parts += [rng.choice(["&&", "??"]), self.equality(depth)]
+        return " ".join(parts)
+
+    def expression(self, kind, depth=2):
+        rng = self.rng
+        if self.wild():
+            parts = [self.operand(depth)]
+            for _ in range(rng.choice([1, 2])):
+                parts += [rng.choice(self.EXPRESSION_OPS), self.operand(depth)]
+            return " ".join(parts)
+        if kind == "bool":
+            return rng.choice(["yum", "bleh"] + self.variables["bool"])
+        if kind == "pasta":
+            return " + ".join(rng.choice([self.literal("pasta")] + self.variables["pasta"]) for _ in range(rng.randint(1, 2)))
+        parts = [rng.choice([self.literal(kind, signed=False)] + self.variables[kind] + self.variables["pinch"])]
+        for _ in range(rng.choice([0, 1, 2])):
+            parts += [rng.choice(["+", "-", "*"]), rng.choice([self.literal("pinch", signed=False)] + self.variables["pinch"])]
+        return " ".join(parts)
+
+    def operand(self, depth):
+        roll = self.rng.random()
+        if depth > 0 and roll < 0.1:
+            return f"({self.expression(self.rng.choice(self.TYPES), depth - 1)})"
+        if depth > 0 and roll < 0.13:
+            return f"!({self.expression('bool', depth - 1)})"
+        return self.rng.choice([self.literal(), self.name(), self.number(depth)])
+
+    def serve(self):
+        rng = self.rng
+        parts = []
+        for _ in range(rng.randint(1, 3)):
+            roll = rng.random()
+            if roll < 0.4:
+                parts.append(self.literal(rng.choice(["pasta", "pasta", "bool"])))
+            elif roll < 0.85:
+                parts.append(self.name())
+            elif roll < 0.92 and self.arrays[rng.choice(self.TYPES[:3])]:
+                name = rng.choice([name for names in self.arrays.values() for name in names])
+                parts.append(f"{name}[{rng.randrange(self.sizes[name] + 1)}]")
+            elif self.functions:
+                parts.append(self.call(rng.choice(self.functions), 1))
+            else:
+                parts.append(self.name(("pasta",)))
+        return f"serve({' + '.join(parts)});"
+
+    def declarations(self, count, prefix):
+        rng = self.rng
+        lines = []
+        for index in range(count):
+            kind = rng.choice(self.TYPES[:3] if rng.random() < 0.2 else self.TYPES)
+            if rng.random() < 0.2 and kind != "bool":
+                name = f"{prefix}r{index}"
+                size = rng.randint(1, 4)
+                count = size if not self.wild() else rng.choice([0, size - 1, size + 1])
+                elements = [self.literal(kind if not self.wild() else None) for _ in range(count)]
+                lines.append(f"recipe {kind} {name}[{size}]{f' = {{{chr(44).join(elements)}}}' if elements else ''};")
+                if elements and count <= size:
+                    self.arrays[kind].append(name)
+                    self.sizes[name] = count
+            else:
+                names = [f"{prefix}v{index}_{n}" for n in range(rng.randint(1, 3))]
+                items = [name + (f" = {self.literal(kind if not self.wild() else None)}" if rng.random() < 0.9 else "") for name in names]
+                lines.append(f"{kind} {', '.join(items)};")
+                self.variables[kind].extend(names)
+        return lines
+
+    def statements(self, depth, count):
+        return [line for _ in range(count) for line in self.statement(depth)]
+
+    def statement(self, depth):
+        rng = self.rng
+        roll = rng.random()
+        if roll < 0.22:
+            return [self.serve()]
+        if roll < 0.26:
+            return [f"{rng.choice(self.SCRATCH)} = {self.arith(1)};"]
+        if roll < 0.45:
+            kind = rng.choice(self.TYPES)
+            target = self.name((kind,))
+            if kind == "bool":
+                return [f"{target} = {self.condition(1)};"]
+            if kind == "pasta":
+                return [f"{target} {rng.choice(['=', '+='])} {self.arith(1, 'pasta')};"]
+            return [f"{target} {rng.choice(['=', '=', '+=', '-=', '*=', '/=', '%='])} {self.arith(1, kind)};"]
+        if roll < 0.5:
+            return [rng.choice([f"{self.name(self.NUMERIC)}++;", f"--{self.name(self.NUMERIC)};"])]
+        if roll < 0.53 and self.arrays["pinch"]:
+            return [f"{rng.choice(self.arrays['pinch'])}[{self.arith(0)}] = {self.arith(1)};"]
+        if roll < 0.6 and self.functions:
+            function = rng.choice(self.functions)
+            return [self.call(function, 1) + ";"]
+        if roll < 0.62:
+            return [f"make({self.name()});"]
+        if depth <= 0:
+            return [self.serve()]
+        if roll < 0.74:
+            lines = [f"taste ({self.condition()}) {{"] + self.statements(depth - 1, rng.randint(0, 2))
+            for _ in range(rng.choice([0, 0, 1, 2])):
+                lines += [f"}} elif ({self.condition()}) {{"] + self.statements(depth - 1, rng.randint(0, 2))
+            if rng.random() < 0.5:
+                lines += ["} mix {"] + self.statements(depth - 1, rng.randint(0, 2))
+            return lines + ["}"]
+        if roll < 0.8:
+            kind = rng.choice(["pinch", "pinch", "pasta"])
+            lines = [f"flip ({self.name((kind,))}) {{"]
+            for _ in range(rng.randint(1, 3)):
+                lines += [f"case {self.literal(kind)}:"] + self.statements(depth - 1, rng.randint(0, 2)) + ["chop;"]
+            if rng.random() < 0.5:
+                lines += ["default:"] + self.statements(depth - 1, rng.randint(0, 2)) + ["chop;"]
+            return lines + ["}"]
+        counter = self.counters.pop(0) if self.counters else None
+        if counter is None or roll < 0.9:
+            loop = f"l{self.loop_index}"
+            self.loop_index += 1
+            step = f"{loop}--" if rng.random() < 0.97 else f"--{loop}"
+            return ([f"for (pinch {loop} = {rng.randint(0, 3)}; {loop} > 0; {step}) {{"]
+                    + self.statements(depth - 1, rng.randint(1, 3)) + ["}"])
+        body = self.statements(depth - 1, rng.randint(1, 3)) + [f"{counter}--;"]
+        if roll < 0.95:
+            return [f"{counter} = {rng.randint(0, 3)};", f"simmer ({counter} > 0) {{"] + body + ["}"]
+        return [f"{counter} = {rng.randint(1, 3)};", "keepmix {"] + body + [f"}} simmer ({counter} > 0);"]
+
+    def body(self, prefix, count):
+        """Local declarations and statements of a function or of dish()."""
+        self.counters = [f"{prefix}w{index}" for index in range(3)]
+        lines = [f"pinch {', '.join(self.counters)};"] + self.declarations(count, prefix)
+        return lines + self.statements(2, self.rng.randint(2, 6))
+
+    def program(self):
+        rng = self.rng
+        self.variables = {kind: [] for kind in self.TYPES}
+        self.arrays = {kind: [] for kind in self.TYPES}
+        self.sizes = {}
+        self.functions = []
+        self.loop_index = 0
+        # Only the first global declaration is ever declared
+        lines = ["dinein"] + self.declarations(rng.choice([0, 1, 1, 1, 2, 3]), "g")
+        for index in range(rng.randint(0, 3)):
+            name = f"f{index}"
+            params = [(rng.choice(self.TYPES[:3]), f"{name}p{n}") for n in range(rng.randint(0, 2))]
+            outer = ({kind: list(names) for kind, names in self.variables.items()},
+                     {kind: list(names) for kind, names in self.arrays.items()})
+            for kind, param in params:
+                self.variables[kind].append(param)
+            signature = ", ".join(f"{kind} {param}" for kind, param in params)
+            if rng.random() < 0.6:
+                return_type = rng.choice(self.TYPES)
+                lines.append(f"full {return_type} {name}({signature}) {{")
+                lines += self.body(name, rng.randint(0, 2))
+                lines += [f"spit {self.expression(return_type)};", "}"]
+            else:
+                return_type = None
+                lines.append(f"hungry {name}({signature}) {{")
+                lines += self.body(name, rng.randint(0, 2))
+                lines.append("}")
+            self.variables, self.arrays = outer
+            self.functions.append((name, [kind for kind, _ in params], return_type))
+        lines.append("chef pinch dish() {")
+        lines += self.body("m", rng.randint(1, 4))
+        lines += [f"spit {rng.choice(['0', '0', '0', '1', '2'])};", "}", "takeout"]
+        # The lexer only accepts some characters after each delimiter; spaces are always valid
+        return re.sub(r"([(\[])|(?<![+-])([)\]},])", lambda m: f"{m[1]} " if m[1] else f" {m[2]}", "\n".join(lines))
+
+
+def run_all_tests():
+    tests = list(FEATURE_PROGRAMS)
+
+    generator = ProgramGenerator(random.Random(20240618))
+    for index in range(600):
+        tests.append((f"Random Program {index}", generator.program()))
+
+    failed = []
+    compared = 0
+    for name, code in tests:
+        tree = parse(code)
+        if tree is None:
+            failed.append((name, code, "program does not parse"))
+            continue
+        compared += 1
+        difference = compare(tree)
+        if difference is None and name in EXPECTED_OUTPUTS:
+            output = execute("tree", tree)[2]
+            if output != EXPECTED_OUTPUTS[name]:
+                difference = f"expected: {EXPECTED_OUTPUTS[name]!r}\n    got: {output!r}"
+        if difference is not None:
+            failed.append((name, code, difference))
+    compared += len(LIMIT_TESTS) + 2
+    failed += check_limits()
+    compared += len(IO_TESTS) + 2
+    failed += check_io()
+    compared += len(VM_TESTS) + len(ENGINES) - 1
+    failed += check_vm()
+
+    print(f"{CYAN}===== Interpreter Differential Test: tree vs ast vs vm vs python ====={RESET}")
+    print(f"  Programs compared: {compared}")
+    if failed:
+        print(f"{RED}===== Failed Tests Summary ====={RESET}")
+        for name, code, difference in failed[:10]:
+            print(f"{RED}Test: {name}{RESET}")
+            print(f"  Code:\n{code}")
+            print(f"    {difference}")
+            print("-" * 40)
+        print(f"  Differential Test: {RED}FAIL{RESET} ({len(failed)} programs)")
+    else:
+        print(f"  Differential Test: {GREEN}PASS{RESET}")
+        print(f"{GREEN}All tests passed!{RESET}")
+    return not failed
+
+
+if __name__ == "__main__":
+    run_all_tests()
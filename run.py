@@ -0,0 +1,48 @@
+"""
+Runs a ChefScript file outside the web app: make reads one line of standard
+input per value and served lines go to standard output as they are produced.
+Errors go to standard error; the exit status is 1 when there are any.
+
+    python run.py program.chef [--engine vm] [--max-steps N] [--time-limit SECONDS]
+"""
+from LexicalAnalyzer import LexicalAnalyzer
+from SyntaxAnalyzer import LL1Parser, cfg, parse_table, follow_set
+from SemanticAnalyzer import FileSink, SemanticAnalyzer, StreamInput
+import argparse
+import sys
+
+
+def run(code, engine="vm", max_steps=None, time_limit=None, stdin=None, stdout=None):
+    """Runs code, reading make input from stdin and serving to stdout; returns its errors."""
+    lexer = LexicalAnalyzer()
+    tokens = lexer.tokenize(code)
+    # Like the web app, a program with lexical errors is not parsed
+    errors = list(lexer.errors)
+    if not errors:
+        parser = LL1Parser(cfg, parse_table, follow_set)
+        is_valid, errors = parser.parse(tokens)
+    if errors:
+        return errors
+    analyzer = SemanticAnalyzer(engine=engine, max_steps=max_steps, time_limit=time_limit,
+                                output=FileSink(stdout or sys.stdout), input_provider=StreamInput(stdin))
+    return [str(error) for error in analyzer.analyze(parser.parse_tree)]
+
+
+def main(argv=None):
+    arguments = argparse.ArgumentParser(description="Run a ChefScript program.")
+    arguments.add_argument("file", help="the program to run")
+    arguments.add_argument("--engine", default="vm", choices=("tree", "ast", "vm", "python"))
+    arguments.add_argument("--max-steps", type=int, default=None, help="loop iterations and calls allowed")
+    arguments.add_argument("--time-limit", type=float, default=None, help="seconds the program may run")
+    options = arguments.parse_args(argv)
+
+    with open(options.file, encoding="utf-8") as source:
+        code = source.read()
+    errors = run(code, options.engine, options.max_steps, options.time_limit)
+    for error in errors:
+        print(error, file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+import contextlib
+import glob
+import io
+import random
+
+from LexicalAnalyzer import LexicalAnalyzer, Token
+from SyntaxAnalyzer import LL1Parser, cfg, parse_table, follow_set
+
+# ANSI color codes for output formatting
+GREEN = "\033[92m"
+RED = "\033[91m"
+CYAN = "\033[96m"
+YELLOW = "\033[93m"
+RESET = "\033[0m"
+
+
+def render(root):
+    """
+    The nodes of a parse tree, depth first, as (depth, node_type, value,
+    line, kind) tuples.  The "dict" engine gives a λ production a λ child
+    that is only pruned once the parse succeeds, so λ leaves are left out.
+    """
+    rows = []
+    pending = [(root, 0)]
+    while pending:
+        node, depth = pending.pop()
+        if node.value == 'λ' and not node.children:
+            continue
+        rows.append((depth, node.node_type, node.value, node.line_number, node.kind))
+        pending.extend((child, depth + 1) for child in reversed(node.children))
+    return rows
+
+
+def parse(engine, tokens):
+    """Returns (is_valid, errors, tree rows) for the given engine, or the exception it raised."""
+    parser = LL1Parser(cfg, parse_table, follow_set, engine=engine)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            is_valid, errors = parser.parse([Token.from_tuple(token) for token in tokens])
+    except Exception as e:
+        return repr(e)
+    return is_valid, list(errors), render(parser.parse_tree)
+
+
+def compare(tokens):
+    """
+    Runs both engines on the same token stream.  Returns None when they
+    agree and a description of the first difference otherwise.
+    """
+    expected = parse("dict", tokens)
+    actual = parse("table", tokens)
+    if expected == actual:
+        return None
+    if isinstance(expected, str) or isinstance(actual, str):
+        return f"dict: {expected}\n    table: {actual}"
+    if expected[0] != actual[0]:
+        return f"valid: dict {expected[0]} != table {actual[0]}"
+    for label, want, got in (("errors", expected[1], actual[1]), ("tree", expected[2], actual[2])):
+        for index, (w, g) in enumerate(zip(want, got)):
+            if w != g:
+                return f"{label}[{index}]: dict {w!r} != table {g!r}"
+        if len(want) != len(got):
+            return f"{label}: dict produced {len(want)}, table produced {len(got)}"
+    return None
+
+
+def sample_programs():
+    """The .chef samples of the repository and the other sample programs, by name."""
+    paths = sorted(glob.glob("**/*.chef", recursive=True) + glob.glob(".idea/**/*.chef", recursive=True))
+    paths = list(dict.fromkeys(paths)) + ["test.pasta", "program"]
+    programs = []
+    for path in paths:
+        with open(path, encoding="utf-8") as source:
+            programs.append((path, source.read()))
+    return programs
+
+
+# Tokens the grammar has no column for, or only in another position
+STRAY_TOKENS = (("@", "@", 1), ("takeout", "takeout", 1), ("dinein", "dinein", 1), ("λ", "λ", 1),
+                ("/-", "/-", 1), ("-/", "-/", 1), ("//x", "comment", 1))
+
+
+def mutate(rng, tokens):
+    """A copy of tokens with a token dropped, repeated, swapped, replaced or the stream cut short."""
+    tokens = list(tokens)
+    if not tokens:
+        return [rng.choice(STRAY_TOKENS)]
+    for _ in range(rng.randint(1, 3)):
+        index = rng.randrange(len(tokens))
+        action = rng.randrange(5)
+        if action == 0 and len(tokens) > 1:
+            del tokens[index]
+        elif action == 1:
+            tokens.insert(index, tokens[index])
+        elif action == 2 and index + 1 < len(tokens):
+            tokens[index], tokens[index + 1] = tokens[index + 1], tokens[index]
+        elif action == 3:
+            lexeme, token_type, _ = rng.choice(tokens + list(STRAY_TOKENS))
+            tokens[index] = (lexeme, token_type, tokens[index][2])
+        else:
+            del tokens[rng.randrange(len(tokens)):]
+            if not tokens:
+                break
+    return tokens
+
+
+def run_all_tests():
+    streams = []
+    for name, code in sample_programs():
+        lexer = LexicalAnalyzer()
+        streams.append((name, [tuple(token) for token in lexer.tokenize(code)]))
+    streams.append(("Empty Stream", []))
+
+    rng = random.Random(20240620)
+    samples = list(streams)
+    for index in range(4000):
+        name, tokens = rng.choice(samples)
+        streams.append((f"Mutated {name} {index}", mutate(rng, tokens)))
+
+    failed = []
+    for name, tokens in streams:
+        difference = compare(tokens)
+        if difference is not None:
+            failed.append((name, tokens, difference))
+
+    print(f"{CYAN}===== Parser Differential Test: dict vs table ====={RESET}")
+    print(f"  Token streams compared: {len(streams)} ({len(samples)} samples)")
+    if failed:
+        print(f"{RED}===== Failed Tests Summary ====={RESET}")
+        for name, tokens, difference in failed[:20]:
+            print(f"{RED}Test: {name}{RESET}")
+            print(f"  Tokens: {' '.join(token[0] for token in tokens)[:200]!r}")
+            print(f"    {difference}")
+            print("-" * 40)
+        print(f"  Differential Test: {RED}FAIL{RESET} ({len(failed)} streams)")
+    else:
+        print(f"  Differential Test: {GREEN}PASS{RESET}")
+        print(f"{GREEN}All tests passed!{RESET}")
+    return not failed
+
+
+if __name__ == "__main__":
+    run_all_tests()